@@ -1,26 +1,35 @@
 """Serialization"""
 
 from .config import (
+    FrozenSerializerConfig,
     SerializerConfig,
     VALUE_DESERIALIZERS,
     VALUE_SERIALIZERS,
+    VALUE_SNIFFERS,
     ValueDeserializer,
     ValueSerializer,
     ValueDeserializers,
     ValueSerializers,
+    ValueSniffer,
+    ValueSniffers,
 )
-from .custom_annotations import DefaultValue, DefaultFactory
+from .custom_annotations import DefaultValue, DefaultFactory, Discriminator
 from .types import Annotation
 
 __all__ = [
+    'FrozenSerializerConfig',
     'SerializerConfig',
     'VALUE_DESERIALIZERS',
     'VALUE_SERIALIZERS',
+    'VALUE_SNIFFERS',
     'ValueDeserializer',
     'ValueSerializer',
     'ValueDeserializers',
     'ValueSerializers',
+    'ValueSniffer',
+    'ValueSniffers',
     'DefaultValue',
     'DefaultFactory',
+    'Discriminator',
     'Annotation',
 ]
@@ -0,0 +1,51 @@
+"""Benchmarks
+
+The benchmarks time typed and untyped serialization and deserialization for
+each format over a set of representative schemas. They can also measure the
+peak memory used, and the latency of requests on an event loop. They use only
+the standard library, and can be run from the command line.
+
+```bash
+python -m jetblack_serialization.bench --format json --output results.json
+```
+"""
+
+from .cases import Case, FORMATS, get_cases
+from .latency import LATENCY_SIZES, Latency, measure_latency, percentile
+from .memory import MEMORY_SIZES, MemoryUsage, measure_case
+from .runner import (
+    Comparison,
+    Timing,
+    compare,
+    load_results,
+    make_results,
+    save_results,
+    time_case,
+)
+from .schemas import SCHEMAS, Schema
+
+__all__ = [
+    'Case',
+    'FORMATS',
+    'get_cases',
+
+    'LATENCY_SIZES',
+    'Latency',
+    'measure_latency',
+    'percentile',
+
+    'MEMORY_SIZES',
+    'MemoryUsage',
+    'measure_case',
+
+    'Comparison',
+    'Timing',
+    'compare',
+    'load_results',
+    'make_results',
+    'save_results',
+    'time_case',
+
+    'SCHEMAS',
+    'Schema',
+]
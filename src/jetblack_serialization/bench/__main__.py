@@ -0,0 +1,346 @@
+"""Run the benchmarks from the command line.
+
+```bash
+python -m jetblack_serialization.bench --output results.json
+python -m jetblack_serialization.bench --baseline results.json
+python -m jetblack_serialization.bench --memory --size 100 --size 10000
+python -m jetblack_serialization.bench --latency --format json --offload
+```
+"""
+
+from argparse import ArgumentParser, Namespace
+from concurrent.futures import ThreadPoolExecutor
+import sys
+from typing import Any, Sequence
+
+from .cases import FORMATS, Case, get_cases
+from .latency import LATENCY_SIZES, Latency, measure_latency
+from .memory import MEMORY_SIZES, MemoryUsage, measure_case
+from .runner import (
+    Comparison,
+    Timing,
+    compare,
+    load_results,
+    make_results,
+    save_results,
+    time_case
+)
+
+
+def _parse_args(argv: Sequence[str] | None) -> Namespace:
+    parser = ArgumentParser(
+        prog='python -m jetblack_serialization.bench',
+        description='Benchmark serialization and deserialization.'
+    )
+    parser.add_argument(
+        '-f', '--format',
+        dest='formats',
+        action='append',
+        choices=FORMATS,
+        help='a format to benchmark (default: all)'
+    )
+    parser.add_argument(
+        '-k', '--filter',
+        dest='patterns',
+        action='append',
+        metavar='PATTERN',
+        help='a shell style pattern for the case names, e.g. "json.typed.*"'
+    )
+    parser.add_argument(
+        '-n', '--size',
+        dest='sizes',
+        action='append',
+        type=int,
+        help=(
+            'the number of elements in each payload, which can be repeated '
+            '(default: the size of each schema, '
+            f'{", ".join(map(str, MEMORY_SIZES))} with --memory, or '
+            f'{" and ".join(map(str, LATENCY_SIZES))} with --latency)'
+        )
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        '-m', '--memory',
+        action='store_true',
+        help='measure the peak memory rather than the time'
+    )
+    mode.add_argument(
+        '-l', '--latency',
+        action='store_true',
+        help=(
+            'measure the latency of a mix of the smallest and largest sizes '
+            'on an event loop'
+        )
+    )
+    parser.add_argument(
+        '--requests',
+        type=int,
+        default=1000,
+        help='the number of requests with --latency (default: %(default)s)'
+    )
+    parser.add_argument(
+        '--load',
+        type=float,
+        default=0.5,
+        help=(
+            'the fraction of the time the event loop is busy with --latency '
+            '(default: %(default)s)'
+        )
+    )
+    parser.add_argument(
+        '--large-ratio',
+        type=float,
+        default=0.01,
+        help=(
+            'the fraction of large requests with --latency '
+            '(default: %(default)s)'
+        )
+    )
+    parser.add_argument(
+        '--offload',
+        action='store_true',
+        help='run the requests in a thread pool with --latency'
+    )
+    parser.add_argument(
+        '-r', '--repeat',
+        type=int,
+        default=5,
+        help='the number of repeats (default: %(default)s)'
+    )
+    parser.add_argument(
+        '-t', '--min-time',
+        type=float,
+        default=0.1,
+        help='the minimum seconds for a repeat (default: %(default)s)'
+    )
+    parser.add_argument(
+        '-s', '--seed',
+        type=int,
+        default=0,
+        help='the seed for the payloads (default: %(default)s)'
+    )
+    parser.add_argument(
+        '-o', '--output',
+        metavar='PATH',
+        help='write the results to a JSON file'
+    )
+    parser.add_argument(
+        '-b', '--baseline',
+        metavar='PATH',
+        help='compare the results with a saved run'
+    )
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.1,
+        help=(
+            'the fractional increase which is a regression '
+            '(default: %(default)s)'
+        )
+    )
+    return parser.parse_args(argv)
+
+
+def _get_cases(
+        args: Namespace,
+        sizes: Sequence[int | None]
+) -> list[Case]:
+    skipped: list[str] = []
+    cases = [
+        case
+        for size in sizes
+        for case in get_cases(
+            args.formats or FORMATS,
+            args.patterns,
+            seed=args.seed,
+            size=size,
+            skipped=skipped
+        )
+    ]
+    for format_ in sorted(set(skipped), key=skipped.index):
+        print(f'Skipping {format_}: the dependencies are not installed')
+    return cases
+
+
+def _workload_name(case: Case) -> str:
+    # The name without the operation or the size: format.mode.schema
+    return case.name.rsplit('.', 1)[0]
+
+
+def _format_change(comparison: Comparison | None) -> str:
+    if comparison is None:
+        return ''
+    text = f'{comparison.change:+.1%}'
+    return f'{text} REGRESSION' if comparison.is_regression else text
+
+
+def _compare_one(
+        results: dict[str, Any],
+        baseline: dict[str, Any] | None,
+        threshold: float,
+        metric: str
+) -> Comparison | None:
+    if baseline is None:
+        return None
+    return next(iter(compare(results, baseline, threshold, metric)), None)
+
+
+def _run_timings(
+        args: Namespace,
+        baseline: dict[str, Any] | None
+) -> dict[str, Any]:
+    cases = _get_cases(args, args.sizes or [None])
+    width = max((len(case.name) for case in cases), default=0)
+    print(f'{"case":<{width}} {"µs/op":>12} {"ops/s":>12}  change')
+
+    timings: list[Timing] = []
+    for case in cases:
+        timing = time_case(case, args.repeat, args.min_time)
+        timings.append(timing)
+        comparison = _compare_one(
+            make_results([timing]),
+            baseline,
+            args.threshold,
+            'us_per_op'
+        )
+        print(
+            f'{timing.name:<{width}} {timing.us_per_op:>12,.2f} '
+            f'{timing.ops_per_sec:>12,.1f}  {_format_change(comparison)}',
+            flush=True
+        )
+
+    return make_results(timings)
+
+
+def _run_memory(
+        args: Namespace,
+        baseline: dict[str, Any] | None
+) -> dict[str, Any]:
+    cases = _get_cases(args, args.sizes or MEMORY_SIZES)
+    width = max((len(case.name) for case in cases), default=0)
+    print(
+        f'{"case":<{width}} {"size":>10} {"peak":>12} {"peak/byte":>10} '
+        f'{"retained":>12} {"ret.blocks":>10}  change'
+    )
+
+    usages: list[MemoryUsage] = []
+    for case in cases:
+        usage = measure_case(case)
+        usages.append(usage)
+        comparison = _compare_one(
+            make_results(usages=[usage]),
+            baseline,
+            args.threshold,
+            'peak_per_byte'
+        )
+        print(
+            f'{usage.name:<{width}} {usage.size:>10,} {usage.peak:>12,} '
+            f'{usage.peak_per_byte:>10,.2f} {usage.retained:>12,} '
+            f'{usage.retained_blocks:>10,}  {_format_change(comparison)}',
+            flush=True
+        )
+
+    return make_results(usages=usages)
+
+
+def _run_latency(
+        args: Namespace,
+        baseline: dict[str, Any] | None
+) -> dict[str, Any]:
+    sizes = args.sizes or LATENCY_SIZES
+    small, large = min(sizes), max(sizes)
+    workloads: dict[str, tuple[list[Case], list[Case]]] = {}
+    for case in _get_cases(args, [small]):
+        workloads.setdefault(_workload_name(case), ([], []))[0].append(case)
+    for case in _get_cases(args, [large]):
+        workloads.setdefault(_workload_name(case), ([], []))[1].append(case)
+
+    suffix = f'[{small}/{large}]'
+    width = max((len(name + suffix) for name in workloads), default=0)
+    print(
+        f'{"workload":<{width}} {"p50 µs":>10} {"p99 µs":>10} '
+        f'{"p99.9 µs":>10} {"lag p99 µs":>11} {"lag p99.9 µs":>13}  change'
+    )
+
+    latencies: list[Latency] = []
+    executor = ThreadPoolExecutor() if args.offload else None
+    try:
+        for name, (small_cases, large_cases) in workloads.items():
+            latency = measure_latency(
+                name + suffix,
+                small_cases,
+                large_cases,
+                args.requests,
+                args.load,
+                args.large_ratio,
+                args.seed,
+                executor
+            )
+            latencies.append(latency)
+            comparison = _compare_one(
+                make_results(latencies=[latency]),
+                baseline,
+                args.threshold,
+                'p99_us'
+            )
+            print(
+                f'{latency.name:<{width}} {latency.latency_us(0.5):>10,.0f} '
+                f'{latency.latency_us(0.99):>10,.0f} '
+                f'{latency.latency_us(0.999):>10,.0f} '
+                f'{latency.lag_us(0.99):>11,.0f} '
+                f'{latency.lag_us(0.999):>13,.0f}  '
+                f'{_format_change(comparison)}',
+                flush=True
+            )
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return make_results(latencies=latencies)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the benchmarks.
+
+    Args:
+        argv (Sequence[str] | None, optional): The command line arguments.
+            Defaults to None, which uses `sys.argv`.
+
+    Returns:
+        int: The exit code, which is 1 if a case has regressed.
+    """
+    args = _parse_args(argv)
+    baseline = load_results(args.baseline) if args.baseline else None
+
+    if args.memory:
+        results = _run_memory(args, baseline)
+        metric = 'peak_per_byte'
+    elif args.latency:
+        results = _run_latency(args, baseline)
+        metric = 'p99_us'
+    else:
+        results = _run_timings(args, baseline)
+        metric = 'us_per_op'
+
+    if args.output:
+        save_results(results, args.output)
+
+    if baseline is None:
+        return 0
+
+    regressions = [
+        comparison
+        for comparison in compare(results, baseline, args.threshold, metric)
+        if comparison.is_regression
+    ]
+    if regressions:
+        print(
+            f'{len(regressions)} of {len(results["benchmarks"])} cases '
+            f'regressed by more than {args.threshold:.0%}'
+        )
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
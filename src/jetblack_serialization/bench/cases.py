@@ -0,0 +1,185 @@
+"""Benchmark cases
+
+A case is a single operation, such as deserializing the flat schema from
+JSON with type information. The payload and document are built before the
+case is run, so only the operation is timed.
+"""
+
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from importlib import import_module
+from random import Random
+from typing import Any, Callable, Iterable, Iterator, Literal, Sequence
+
+from ..config import SerializerConfig, DEFAULT_CONFIG
+from ..types import Annotation
+
+from .schemas import SCHEMAS, Schema
+
+type Operation = Literal['serialize', 'deserialize']
+
+FORMATS = ('json', 'yaml', 'xml')
+"""The formats which can be benchmarked"""
+
+
+@dataclass(frozen=True)
+class Case:
+    """A benchmark case"""
+
+    name: str
+    """The name of the case: format.mode.schema.operation, followed by the
+    size of the payload in brackets when it is not the default"""
+
+    format: str
+    """The format: json, yaml or xml"""
+
+    operation: Operation
+    """The operation: serialize or deserialize"""
+
+    run: Callable[[], Any]
+    """Run the operation once"""
+
+    size: int
+    """The length of the document in characters"""
+
+
+def _get_annotation(format_: str, schema: Schema) -> Annotation | None:
+    if format_ != 'xml':
+        return schema.annotation
+    # pylint: disable=import-outside-toplevel
+    from .xml_schemas import XML_ANNOTATIONS
+    return XML_ANNOTATIONS.get(schema.name)
+
+
+def _get_modes(
+        format_: str,
+        module: Any,
+        schema: Schema,
+        config: SerializerConfig
+) -> Iterator[tuple[str, Callable[[Any], str], Callable[[str], Any]]]:
+    annotation = _get_annotation(format_, schema)
+    if annotation is not None:
+        yield (
+            'typed',
+            lambda obj: module.serialize_typed(obj, annotation, config),
+            lambda text: module.deserialize_typed(text, annotation, config)
+        )
+    yield (
+        'untyped',
+        lambda obj: module.serialize_untyped(obj, config),
+        lambda text: module.deserialize_untyped(text, config)
+    )
+
+
+def _make_cases(
+        name: str,
+        format_: str,
+        obj: Any,
+        serialize: Callable[[Any], str],
+        deserialize: Callable[[str], Any],
+        suffix: str
+) -> list[Case]:
+    text = serialize(obj)
+    return [
+        Case(
+            f'{name}.serialize{suffix}',
+            format_,
+            'serialize',
+            lambda: serialize(obj),
+            len(text)
+        ),
+        Case(
+            f'{name}.deserialize{suffix}',
+            format_,
+            'deserialize',
+            lambda: deserialize(text),
+            len(text)
+        ),
+    ]
+
+
+def get_cases(
+        formats: Iterable[str] = FORMATS,
+        patterns: Iterable[str] | None = None,
+        config: SerializerConfig | None = None,
+        seed: int = 0,
+        size: int | None = None,
+        skipped: list[str] | None = None,
+        schemas: Sequence[Schema] = SCHEMAS
+) -> list[Case]:
+    """Build the benchmark cases.
+
+    Formats whose optional dependencies are not installed are skipped.
+
+    Args:
+        formats (Iterable[str], optional): The formats. Defaults to
+            `FORMATS`.
+        patterns (Iterable[str] | None, optional): Shell style patterns for
+            the names of the cases, for example "json.typed.*". Defaults to
+            None, which selects every case.
+        config (SerializerConfig | None, optional): The serializer
+            configuration. Defaults to None.
+        seed (int, optional): The seed for the payloads. Defaults to 0.
+        size (int | None, optional): The number of elements in each list, or
+            nodes in each tree. Defaults to None, which uses the size of each
+            schema.
+        skipped (list[str] | None, optional): If given the formats which
+            were skipped are appended. Defaults to None.
+        schemas (Sequence[Schema], optional): The schemas. Typed XML cases
+            are only made for the schemas with XML annotations. Defaults to
+            `SCHEMAS`.
+
+    Returns:
+        list[Case]: The cases.
+    """
+    config = config or DEFAULT_CONFIG
+    patterns = list(patterns or ['*'])
+    suffix = '' if size is None else f'[{size}]'
+
+    cases: list[Case] = []
+    for format_ in formats:
+        try:
+            module = import_module(f'..{format_}', __package__)
+            if format_ == 'xml':
+                import_module('.xml_schemas', __package__)
+        except ImportError:
+            if skipped is not None:
+                skipped.append(format_)
+            continue
+
+        for schema in schemas:
+            obj: Any = None
+            for mode, serialize, deserialize in _get_modes(
+                format_,
+                module,
+                schema,
+                config
+            ):
+                name = f'{format_}.{mode}.{schema.name}'
+                # The payload and documents are only built for the selected
+                # cases.
+                if not any(
+                    fnmatchcase(f'{name}.{operation}{suffix}', pattern)
+                    for operation in ('serialize', 'deserialize')
+                    for pattern in patterns
+                ):
+                    continue
+                if obj is None:
+                    obj = schema.build(Random(seed), size or schema.size)
+                cases.extend(
+                    case
+                    for case in _make_cases(
+                        name,
+                        format_,
+                        obj,
+                        serialize,
+                        deserialize,
+                        suffix
+                    )
+                    if any(
+                        fnmatchcase(case.name, pattern)
+                        for pattern in patterns
+                    )
+                )
+
+    return cases
@@ -0,0 +1,190 @@
+"""Latency benchmarks
+
+A server is simulated on an event loop. Requests arrive at random intervals,
+and each request runs a small case, or occasionally a large one, in its own
+task. The latency of a request is measured from when it was due to arrive, so
+requests delayed by a stalled event loop are counted as late rather than
+being left out.
+
+A monitor task sleeps for a short interval and records how late it wakes,
+which is the lag of the event loop.
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from dataclasses import dataclass
+import math
+from random import Random
+from time import perf_counter
+from typing import Sequence
+
+from .cases import Case
+
+LATENCY_SIZES = (10, 10000)
+"""The default sizes of the small and large payloads"""
+
+LAG_INTERVAL = 0.001
+"""The interval in seconds at which the event loop lag is sampled"""
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """The nearest rank percentile of sorted values.
+
+    Args:
+        values (Sequence[float]): The sorted values.
+        fraction (float): The percentile as a fraction, e.g. 0.99.
+
+    Returns:
+        float: The percentile, or zero if there are no values.
+    """
+    if not values:
+        return 0.0
+    rank = max(math.ceil(fraction * len(values)), 1)
+    return values[rank - 1]
+
+
+@dataclass(frozen=True)
+class Latency:
+    """The latencies of requests on an event loop"""
+
+    name: str
+    """The name of the workload"""
+
+    requests: int
+    """The number of requests"""
+
+    latencies: Sequence[float]
+    """The sorted latencies of the requests in seconds"""
+
+    lags: Sequence[float]
+    """The sorted lags of the event loop in seconds"""
+
+    def latency_us(self, fraction: float) -> float:
+        """The percentile of the request latency in microseconds.
+
+        Args:
+            fraction (float): The percentile as a fraction, e.g. 0.99.
+
+        Returns:
+            float: The latency in microseconds.
+        """
+        return percentile(self.latencies, fraction) * 1_000_000
+
+    def lag_us(self, fraction: float) -> float:
+        """The percentile of the event loop lag in microseconds.
+
+        Args:
+            fraction (float): The percentile as a fraction, e.g. 0.99.
+
+        Returns:
+            float: The lag in microseconds.
+        """
+        return percentile(self.lags, fraction) * 1_000_000
+
+
+def _service_time(cases: Sequence[Case]) -> float:
+    # Each case is run once, which also compiles its annotation.
+    start = perf_counter()
+    for case in cases:
+        case.run()
+    return (perf_counter() - start) / len(cases)
+
+
+async def _run_workload(
+        small_cases: Sequence[Case],
+        large_cases: Sequence[Case],
+        requests: int,
+        interval: float,
+        large_ratio: float,
+        rng: Random,
+        executor: Executor | None
+) -> tuple[list[float], list[float]]:
+    loop = asyncio.get_running_loop()
+    latencies: list[float] = []
+    lags: list[float] = []
+    is_done = asyncio.Event()
+
+    async def monitor() -> None:
+        while not is_done.is_set():
+            start = perf_counter()
+            await asyncio.sleep(LAG_INTERVAL)
+            lags.append(max(perf_counter() - start - LAG_INTERVAL, 0.0))
+
+    async def handle(case: Case, arrival: float) -> None:
+        if executor is None:
+            case.run()
+        else:
+            await loop.run_in_executor(executor, case.run)
+        latencies.append(perf_counter() - arrival)
+
+    monitor_task = asyncio.create_task(monitor())
+    tasks: list[asyncio.Task[None]] = []
+    arrival = perf_counter()
+    for _ in range(requests):
+        arrival += rng.expovariate(1 / interval)
+        if (delay := arrival - perf_counter()) > 0:
+            await asyncio.sleep(delay)
+        cases = large_cases if rng.random() < large_ratio else small_cases
+        tasks.append(asyncio.create_task(handle(rng.choice(cases), arrival)))
+
+    await asyncio.gather(*tasks)
+    is_done.set()
+    await monitor_task
+    return latencies, lags
+
+
+def measure_latency(
+        name: str,
+        small_cases: Sequence[Case],
+        large_cases: Sequence[Case],
+        requests: int = 1000,
+        load: float = 0.5,
+        large_ratio: float = 0.01,
+        seed: int = 0,
+        executor: Executor | None = None
+) -> Latency:
+    """Measure the latency of a mixed workload on an event loop.
+
+    The requests arrive at a rate which would keep the event loop busy for
+    the given fraction of the time if they ran one after another.
+
+    Args:
+        name (str): The name of the workload.
+        small_cases (Sequence[Case]): The cases for the small requests.
+        large_cases (Sequence[Case]): The cases for the large requests.
+        requests (int, optional): The number of requests. Defaults to 1000.
+        load (float, optional): The fraction of the time the event loop is
+            busy. Defaults to 0.5.
+        large_ratio (float, optional): The fraction of requests which are
+            large. Defaults to 0.01.
+        seed (int, optional): The seed for the arrivals. Defaults to 0.
+        executor (Executor | None, optional): If given the cases are run in
+            the executor rather than on the event loop. Defaults to None.
+
+    Raises:
+        ValueError: If there are no cases, or the load is not positive.
+
+    Returns:
+        Latency: The latencies.
+    """
+    if not small_cases or not large_cases:
+        raise ValueError('There must be small and large cases')
+    if load <= 0:
+        raise ValueError('The load must be positive')
+
+    service_time = (
+        (1 - large_ratio) * _service_time(small_cases) +
+        large_ratio * _service_time(large_cases)
+    )
+    latencies, lags = asyncio.run(
+        _run_workload(
+            small_cases,
+            large_cases,
+            requests,
+            service_time / load,
+            large_ratio,
+            Random(seed),
+            executor
+        )
+    )
+    return Latency(name, requests, sorted(latencies), sorted(lags))
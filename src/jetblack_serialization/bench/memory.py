@@ -0,0 +1,85 @@
+"""Memory benchmarks
+
+Each case is run once to compile its annotation, then run again while
+`tracemalloc` traces the allocations. The peak is the largest amount of
+memory the operation held at once, which for deserialization includes the
+document, the decoded values and the converted copy.
+
+`tracemalloc` only traces the blocks which are live, so the number of blocks
+allocated and then freed by the operation cannot be counted. The retained
+blocks are those allocated by the operation and still held when it returns,
+which are mostly the result.
+"""
+
+from dataclasses import dataclass
+import gc
+import tracemalloc
+
+from .cases import Case
+
+MEMORY_SIZES = (10, 100, 1000)
+"""The default sizes of the payloads for the memory benchmarks"""
+
+
+@dataclass(frozen=True)
+class MemoryUsage:
+    """The memory used by a benchmark case"""
+
+    name: str
+    """The name of the case"""
+
+    peak: int
+    """The peak bytes allocated while the operation ran"""
+
+    retained: int
+    """The bytes allocated by the operation and held by its result"""
+
+    retained_blocks: int
+    """The number of memory blocks allocated by the operation and held by its
+    result"""
+
+    size: int
+    """The length of the document in characters"""
+
+    @property
+    def peak_per_byte(self) -> float:
+        """The peak bytes allocated per character of the document"""
+        return self.peak / max(self.size, 1)
+
+
+def measure_case(case: Case) -> MemoryUsage:
+    """Measure the memory used by a benchmark case.
+
+    Args:
+        case (Case): The case.
+
+    Raises:
+        RuntimeError: If `tracemalloc` is already tracing.
+
+    Returns:
+        MemoryUsage: The memory usage.
+    """
+    if tracemalloc.is_tracing():
+        raise RuntimeError('tracemalloc is already tracing')
+
+    # The first run compiles the annotation and fills the caches.
+    case.run()
+    gc.collect()
+
+    tracemalloc.start()
+    try:
+        start, _peak = tracemalloc.get_traced_memory()
+        result = case.run()
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    del result
+
+    return MemoryUsage(
+        case.name,
+        peak - start,
+        current - start,
+        sum(stat.count for stat in snapshot.statistics('filename')),
+        case.size
+    )
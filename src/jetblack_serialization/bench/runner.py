@@ -0,0 +1,248 @@
+"""Benchmark timing and results
+
+Each case is timed with `timeit` using `time.perf_counter_ns`. The number of
+runs in a repeat is calibrated so a repeat takes at least the minimum time,
+and the fastest repeat is reported, as the slower repeats measure noise from
+the rest of the machine.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import json
+import os
+import platform
+from time import perf_counter_ns
+from timeit import Timer
+from typing import Any, Iterable
+
+from .cases import Case
+from .latency import Latency
+from .memory import MemoryUsage
+
+RESULTS_VERSION = 1
+"""The version of the results file format"""
+
+
+@dataclass(frozen=True)
+class Timing:
+    """The timing of a benchmark case"""
+
+    name: str
+    """The name of the case"""
+
+    ns_per_op: float
+    """The nanoseconds per operation of the fastest repeat"""
+
+    number: int
+    """The number of operations in each repeat"""
+
+    repeat: int
+    """The number of repeats"""
+
+    size: int
+    """The length of the document in characters"""
+
+    @property
+    def us_per_op(self) -> float:
+        """The microseconds per operation"""
+        return self.ns_per_op / 1_000
+
+    @property
+    def ops_per_sec(self) -> float:
+        """The operations per second"""
+        return 1_000_000_000 / self.ns_per_op
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """The comparison of a measurement with its baseline"""
+
+    name: str
+    """The name of the case"""
+
+    metric: str
+    """The name of the measurement, for example us_per_op"""
+
+    baseline: float
+    """The measurement of the baseline"""
+
+    current: float
+    """The measurement of the current run"""
+
+    threshold: float
+    """The fractional increase above which the case has regressed"""
+
+    @property
+    def change(self) -> float:
+        """The fractional change in the measurement, positive when worse"""
+        return self.current / self.baseline - 1
+
+    @property
+    def is_regression(self) -> bool:
+        """True if the measurement is worse than the baseline by more than
+        the threshold"""
+        return self.change > self.threshold
+
+
+def time_case(
+        case: Case,
+        repeat: int = 5,
+        min_time: float = 0.1
+) -> Timing:
+    """Time a benchmark case.
+
+    Args:
+        case (Case): The case.
+        repeat (int, optional): The number of repeats. Defaults to 5.
+        min_time (float, optional): The minimum time of a repeat in seconds.
+            Defaults to 0.1.
+
+    Returns:
+        Timing: The timing.
+    """
+    # The first run compiles the annotation and fills the caches, which
+    # could otherwise be reported when a single run takes the minimum time.
+    case.run()
+
+    timer = Timer(case.run, timer=perf_counter_ns)
+    min_time_ns = min_time * 1_000_000_000
+
+    number = 1
+    while (elapsed := timer.timeit(number)) < min_time_ns:
+        # Estimate the number needed from the last run, growing by at most
+        # ten times in case the first runs were slowed.
+        estimate = int(number * min_time_ns / max(elapsed, 1)) + 1
+        number = min(max(estimate, number * 2), number * 10)
+
+    timings = [elapsed, *timer.repeat(repeat - 1, number)]
+    return Timing(
+        case.name,
+        min(timings) / number,
+        number,
+        repeat,
+        case.size
+    )
+
+
+def make_results(
+        timings: Iterable[Timing] = (),
+        usages: Iterable[MemoryUsage] = (),
+        latencies: Iterable[Latency] = ()
+) -> dict[str, Any]:
+    """Make the results of a run, which can be saved as JSON.
+
+    Args:
+        timings (Iterable[Timing], optional): The timings. Defaults to ().
+        usages (Iterable[MemoryUsage], optional): The memory usages.
+            Defaults to ().
+        latencies (Iterable[Latency], optional): The latencies. Defaults to
+            ().
+
+    Returns:
+        dict[str, Any]: The results.
+    """
+    benchmarks: dict[str, dict[str, Any]] = {}
+    for timing in timings:
+        benchmarks.setdefault(timing.name, {}).update({
+            'us_per_op': timing.us_per_op,
+            'ops_per_sec': timing.ops_per_sec,
+            'number': timing.number,
+            'repeat': timing.repeat,
+            'size': timing.size,
+        })
+    for usage in usages:
+        benchmarks.setdefault(usage.name, {}).update({
+            'peak': usage.peak,
+            'peak_per_byte': usage.peak_per_byte,
+            'retained': usage.retained,
+            'retained_blocks': usage.retained_blocks,
+            'size': usage.size,
+        })
+    for latency in latencies:
+        benchmarks.setdefault(latency.name, {}).update({
+            'requests': latency.requests,
+            'p50_us': latency.latency_us(0.5),
+            'p99_us': latency.latency_us(0.99),
+            'p999_us': latency.latency_us(0.999),
+            'lag_p50_us': latency.lag_us(0.5),
+            'lag_p99_us': latency.lag_us(0.99),
+            'lag_p999_us': latency.lag_us(0.999),
+        })
+
+    return {
+        'version': RESULTS_VERSION,
+        'created': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'benchmarks': benchmarks
+    }
+
+
+def save_results(results: dict[str, Any], path: str | os.PathLike[str]) -> None:
+    """Save the results of a run as JSON.
+
+    Args:
+        results (dict[str, Any]): The results.
+        path (str | os.PathLike[str]): The path of the file.
+    """
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(results, file, indent=2)
+
+
+def load_results(path: str | os.PathLike[str]) -> dict[str, Any]:
+    """Load the results of a run.
+
+    Args:
+        path (str | os.PathLike[str]): The path of the file.
+
+    Raises:
+        ValueError: If the file is not a results file.
+
+    Returns:
+        dict[str, Any]: The results.
+    """
+    with open(path, 'r', encoding='utf-8') as file:
+        results = json.load(file)
+    if (
+        not isinstance(results, dict) or
+        results.get('version') != RESULTS_VERSION or
+        not isinstance(results.get('benchmarks'), dict)
+    ):
+        raise ValueError(f'Not a benchmark results file: {path}')
+    return results
+
+
+def compare(
+        results: dict[str, Any],
+        baseline: dict[str, Any],
+        threshold: float = 0.1,
+        metric: str = 'us_per_op'
+) -> list[Comparison]:
+    """Compare the results of a run with a baseline.
+
+    Cases which do not have the measurement in both runs are ignored.
+
+    Args:
+        results (dict[str, Any]): The results of the run.
+        baseline (dict[str, Any]): The results of the baseline.
+        threshold (float, optional): The fractional increase above which a
+            case has regressed. Defaults to 0.1.
+        metric (str, optional): The measurement to compare, where lower is
+            better. Defaults to "us_per_op".
+
+    Returns:
+        list[Comparison]: The comparisons, in the order of the results.
+    """
+    baseline_benchmarks = baseline['benchmarks']
+    return [
+        Comparison(
+            name,
+            metric,
+            baseline_benchmarks[name][metric],
+            benchmark[metric],
+            threshold
+        )
+        for name, benchmark in results['benchmarks'].items()
+        if metric in benchmark and metric in baseline_benchmarks.get(name, {})
+    ]
@@ -0,0 +1,194 @@
+"""Benchmark schemas
+
+Each schema has a builder for its payload and an annotation for JSON and
+YAML. The XML annotations are in `xml_schemas`, as they need lxml. The
+payloads are built from a seeded random generator, so every run serializes
+the same values.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from random import Random
+from typing import (
+    Any,
+    Callable,
+    Literal,
+    TypedDict
+)
+
+from ..types import Annotation
+
+
+class Record(TypedDict):
+    record_id: int
+    name: str
+    score: float
+    active: bool
+
+
+class Node(TypedDict):
+    name: str
+    weight: int
+    children: list[Node]
+
+
+WIDE_FIELD_COUNT = 50
+
+Wide = TypedDict(  # type: ignore
+    'Wide',
+    {
+        f'field_{i:02}': int if i % 2 == 0 else str
+        for i in range(WIDE_FIELD_COUNT)
+    }
+)
+
+
+class Trade(TypedDict):
+    kind: Literal['trade']
+    ticker: str
+    price: float
+    quantity: int
+
+
+class Quote(TypedDict):
+    kind: Literal['quote']
+    ticker: str
+    bid: float
+    ask: float
+
+
+class Valuation(TypedDict):
+    timestamp: datetime
+    settles: datetime
+    amount: Decimal
+    fee: Decimal
+    tenor: timedelta
+
+
+@dataclass(frozen=True)
+class Schema:
+    """A benchmark schema"""
+
+    name: str
+    """The name of the schema"""
+
+    build: Callable[[Random, int], Any]
+    """Build a payload of a given size"""
+
+    annotation: Annotation
+    """The annotation for JSON and YAML"""
+
+    size: int
+    """The default size of the payload: the number of elements in a list, or
+    the number of nodes in a tree"""
+
+
+def _build_records(rng: Random, size: int) -> list[Record]:
+    return [
+        {
+            'record_id': i,
+            'name': f'record-{rng.randrange(1_000_000)}',
+            'score': round(rng.uniform(0, 100), 3),
+            'active': rng.random() < 0.5,
+        }
+        for i in range(size)
+    ]
+
+
+def _build_node(rng: Random, size: int) -> Node:
+    # The remaining nodes are split between two children, so the tree is
+    # balanced.
+    size -= 1
+    return {
+        'name': f'node-{size}',
+        'weight': rng.randrange(100),
+        'children': [
+            _build_node(rng, child_size)
+            for child_size in ((size + 1) // 2, size // 2)
+            if child_size > 0
+        ]
+    }
+
+
+def _build_wide(rng: Random, size: int) -> list[Any]:
+    return [
+        {
+            f'field_{i:02}': rng.randrange(1000) if i % 2 == 0 else f'v{i}'
+            for i in range(WIDE_FIELD_COUNT)
+        }
+        for _ in range(size)
+    ]
+
+
+def _build_events(rng: Random, size: int) -> list[Trade | Quote]:
+    events: list[Trade | Quote] = []
+    for _ in range(size):
+        ticker = rng.choice(('AAPL', 'MSFT', 'GOOG', 'AMZN'))
+        price = round(rng.uniform(50, 500), 2)
+        if rng.random() < 0.5:
+            events.append({
+                'kind': 'trade',
+                'ticker': ticker,
+                'price': price,
+                'quantity': rng.randrange(1, 1000),
+            })
+        else:
+            events.append({
+                'kind': 'quote',
+                'ticker': ticker,
+                'bid': price,
+                'ask': round(price + 0.05, 2),
+            })
+    return events
+
+
+def _build_valuations(rng: Random, size: int) -> list[Valuation]:
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            'timestamp': start + timedelta(seconds=rng.randrange(10_000_000)),
+            'settles': start + timedelta(days=rng.randrange(1, 365)),
+            'amount': Decimal(rng.randrange(1, 10_000_000)) / 100,
+            'fee': Decimal(rng.randrange(1, 10_000)) / 10_000,
+            'tenor': timedelta(days=rng.randrange(1, 3650)),
+        }
+        for _ in range(size)
+    ]
+
+
+SCHEMAS: tuple[Schema, ...] = (
+    Schema(
+        'flat',
+        _build_records,
+        list[Record],
+        100
+    ),
+    Schema(
+        'deep',
+        _build_node,
+        Node,
+        511
+    ),
+    Schema(
+        'wide',
+        _build_wide,
+        list[Wide],
+        20
+    ),
+    Schema(
+        'union',
+        _build_events,
+        list[Trade | Quote],
+        100
+    ),
+    Schema(
+        'values',
+        _build_valuations,
+        list[Valuation],
+        100
+    ),
+)
+"""The benchmark schemas"""
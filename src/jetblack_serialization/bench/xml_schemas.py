@@ -0,0 +1,54 @@
+"""XML benchmark schemas
+
+The payloads are the same as for JSON and YAML, but the annotations name the
+elements and attributes.
+"""
+
+from __future__ import annotations
+
+from typing import Annotated, Literal, TypedDict
+
+from ..types import Annotation
+from ..xml import XMLAttribute, XMLEntity
+
+from .schemas import Record, Valuation, Wide
+
+
+class XMLNode(TypedDict):
+    name: str
+    weight: int
+    children: Annotated[
+        list[Annotated[XMLNode, XMLEntity('Node')]],
+        XMLEntity('Children')
+    ]
+
+
+class XMLTrade(TypedDict):
+    kind: Annotated[Literal['trade'], XMLAttribute('kind')]
+    ticker: str
+    price: float
+    quantity: int
+
+
+class XMLQuote(TypedDict):
+    kind: Annotated[Literal['quote'], XMLAttribute('kind')]
+    ticker: str
+    bid: float
+    ask: float
+
+
+def _xml_list(annotation: Annotation, tag: str, item_tag: str) -> Annotation:
+    return Annotated[
+        list[Annotated[annotation, XMLEntity(item_tag)]],  # type: ignore
+        XMLEntity(tag)
+    ]
+
+
+XML_ANNOTATIONS: dict[str, Annotation] = {
+    'flat': _xml_list(Record, 'Records', 'Record'),
+    'deep': Annotated[XMLNode, XMLEntity('Node')],
+    'wide': _xml_list(Wide, 'Wides', 'Wide'),
+    'union': _xml_list(XMLTrade | XMLQuote, 'Events', 'Event'),
+    'values': _xml_list(Valuation, 'Valuations', 'Valuation'),
+}
+"""The XML annotations by schema name"""
@@ -0,0 +1,135 @@
+"""Caches keyed by serializer configuration and annotation"""
+
+from collections import OrderedDict
+from threading import RLock
+from typing import Any, Callable
+
+from .config import FrozenSerializerConfig, SerializerConfig
+from .types import Annotation
+
+_MISSING: Any = object()
+
+DEFAULT_MAX_CONFIGS = 128
+"""The default number of configs for which a cache holds values"""
+
+
+class ConfigValueCache[T]:
+    """A cache of values built from a serializer config.
+
+    Equal configs share a value. The values for the most recently used
+    configs are kept, and those for the least recently used are discarded
+    when there are more than `max_configs`. The values typically refer to
+    their config, so the configs are held until they are discarded.
+
+    The cache is thread safe. Values are built while holding a lock, so each
+    value is built once even when first requested by many threads. Reading
+    the value for the config which was used last takes no lock.
+    """
+
+    def __init__(
+            self,
+            factory: Callable[[SerializerConfig], T],
+            max_configs: int = DEFAULT_MAX_CONFIGS
+    ) -> None:
+        self._factory = factory
+        self._max_configs = max_configs
+        self._values: OrderedDict[FrozenSerializerConfig, T] = OrderedDict()
+        # The config used last and its value, replaced as a single tuple so
+        # it can be read without the lock.
+        self._last: tuple[FrozenSerializerConfig | None, Any] = (None, None)
+        self._lock = RLock()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get(self, config: SerializerConfig) -> T:
+        """Get the value for the config, building it if necessary.
+
+        Args:
+            config (SerializerConfig): The serializer configuration.
+
+        Returns:
+            T: The cached value.
+        """
+        config = config.freeze()
+        last_config, value = self._last
+        if last_config is config:
+            return value
+
+        with self._lock:
+            value = self._values.get(config, _MISSING)
+            if value is _MISSING:
+                value = self._values[config] = self._factory(config)
+                while len(self._values) > self._max_configs:
+                    self._values.popitem(last=False)
+            else:
+                self._values.move_to_end(config)
+            self._last = (config, value)
+            return value
+
+    def clear(self) -> None:
+        """Clear the cache"""
+        with self._lock:
+            self._values.clear()
+            self._last = (None, None)
+
+
+class ConfigCache[T]:
+    """A cache of values built from an annotation and a serializer config.
+
+    The entries for each config are held in a `ConfigValueCache`, so equal
+    configs share their entries and only the most recently used configs are
+    kept. Annotations which cannot be hashed are built on every call.
+
+    The cache is thread safe, and each value is built once.
+    """
+
+    def __init__(
+            self,
+            factory: Callable[[Annotation, SerializerConfig], T],
+            max_configs: int = DEFAULT_MAX_CONFIGS
+    ) -> None:
+        self._factory = factory
+        self._caches: ConfigValueCache[dict[Annotation, T]] = ConfigValueCache(
+            lambda _config: {},
+            max_configs
+        )
+        # Reentrant, as building a value may get others from the cache.
+        self._lock = RLock()
+
+    def get(self, annotation: Annotation, config: SerializerConfig) -> T:
+        """Get the value for the annotation and config, building it if
+        necessary.
+
+        Args:
+            annotation (Annotation): The type annotation.
+            config (SerializerConfig): The serializer configuration.
+
+        Returns:
+            T: The cached value.
+        """
+        # The values are built with the frozen config, as they are shared by
+        # equal configs.
+        config = config.freeze()
+        cache = self._caches.get(config)
+
+        try:
+            value = cache.get(annotation, _MISSING)
+        except TypeError:
+            # The annotation is not hashable.
+            return self._factory(annotation, config)
+
+        if value is _MISSING:
+            with self._lock:
+                # Another thread may have built the value.
+                value = cache.get(annotation, _MISSING)
+                if value is _MISSING:
+                    value = cache[annotation] = self._factory(
+                        annotation,
+                        config
+                    )
+        return value
+
+    def clear(self) -> None:
+        """Clear the cache"""
+        self._caches.clear()
@@ -0,0 +1,16 @@
+"""Ahead of time generation of JSON serialization code
+
+The generated module contains a serialize and a deserialize function for
+each typed dictionary, with the tags, key transforms and value converters
+written out, so no type introspection is performed at runtime.
+
+```bash
+python -m jetblack_serialization.codegen mypkg.schemas -o mypkg/_codecs.py
+```
+"""
+
+from .generator import generate_source
+
+__all__ = [
+    'generate_source',
+]
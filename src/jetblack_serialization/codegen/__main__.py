@@ -0,0 +1,38 @@
+"""Command line interface for the code generator"""
+
+import argparse
+import sys
+
+from .generator import generate_source
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog='python -m jetblack_serialization.codegen',
+        description='Generate JSON serialization code for typed dictionaries.'
+    )
+    parser.add_argument(
+        'modules',
+        nargs='+',
+        help='The modules containing the typed dictionaries.'
+    )
+    parser.add_argument(
+        '-c', '--config',
+        help='The serializer configuration as "module:name".'
+    )
+    parser.add_argument(
+        '-o', '--output',
+        help='The file to write. Defaults to standard output.'
+    )
+    args = parser.parse_args(argv)
+
+    source = generate_source(args.modules, args.config)
+    if args.output is None:
+        sys.stdout.write(source)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as file_ptr:
+            file_ptr.write(source)
+
+
+if __name__ == '__main__':
+    main()
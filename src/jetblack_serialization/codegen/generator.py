@@ -0,0 +1,953 @@
+"""Generate Python source for typed JSON serialization"""
+
+from decimal import Decimal
+from enum import Enum
+from importlib import import_module
+from inspect import isclass
+import math
+import re
+from types import ModuleType, NoneType
+from typing import Any, Union, get_args, is_typeddict
+
+from ..config import SerializerConfig
+from ..custom_annotations import (
+    get_default_annotation,
+    get_default_factory_annotation,
+    get_discriminator_annotation,
+    is_any_default_annotation,
+    is_any_default_factory_annotation,
+    is_any_discriminator_annotation,
+)
+from ..json.annotations import (
+    JSONAnnotation,
+    JSONObject,
+    JSONProperty,
+    JSONValue,
+)
+from ..json import typed_deserializer, typed_serializer
+from ..json.discriminators import (
+    find_discriminated_union,
+    get_discriminated_json_annotation,
+)
+from ..types import Annotation
+from ..typing_ex import (
+    get_unannotated,
+    is_annotated,
+    is_any,
+    is_dict,
+    is_list,
+    is_literal,
+    is_optional,
+    is_union,
+    resolve_type,
+    typeddict_keys,
+)
+from ..utils import has_value_serializer, is_enum_by_value, is_value_type
+
+_BUILTIN_VALUE_TYPES = (str, int, bool, float)
+_REPR_TYPES = (NoneType, str, int, bool, float)
+# The exceptions raised by a union member which cannot convert a value.
+_TRIAL_ERRORS = '(ArithmeticError, AttributeError, KeyError, TypeError, ValueError)'
+
+
+class _Unsupported(Exception):
+    """Raised when an annotation cannot be written as source"""
+
+
+def _snake_case(name: str) -> str:
+    name = re.sub(r'([A-Z]+)([A-Z][a-z])', r'\1_\2', name)
+    name = re.sub(r'([a-z0-9])([A-Z])', r'\1_\2', name)
+    return name.lower()
+
+
+def _is_serializable_keys(json_annotation: JSONAnnotation) -> bool:
+    return (
+        True
+        if not isinstance(json_annotation, (JSONObject, JSONProperty))
+        else json_annotation.is_serializable_keys
+    )
+
+
+def _get_item_annotation(
+        annotation: Annotation
+) -> tuple[Annotation, JSONAnnotation]:
+    annotation = resolve_type(annotation)
+    if is_annotated(annotation):
+        return get_discriminated_json_annotation(annotation)
+    return annotation, JSONValue()
+
+
+def _get_discriminator(
+        annotation: Annotation
+) -> tuple[Annotation, str | None]:
+    # The type without its annotations, and the key of any discriminator.
+    annotation = resolve_type(annotation)
+    if not is_annotated(annotation):
+        return annotation, None
+    discriminator_key = None
+    if is_any_discriminator_annotation(annotation):
+        _, discriminator = get_discriminator_annotation(annotation)
+        discriminator_key = discriminator.key
+    return resolve_type(get_unannotated(annotation)), discriminator_key
+
+
+def _indent(lines: list[str]) -> list[str]:
+    return ['    ' + line for line in lines]
+
+
+class _ModuleWriter:
+    """Collects the source of a generated module"""
+
+    def __init__(
+            self,
+            config: SerializerConfig,
+            config_module: str,
+            config_name: str
+    ) -> None:
+        self.config = config
+        self.config_module = config_module
+        self.config_name = config_name
+        self.imports: dict[str, str] = {}
+        self.bindings: list[str] = []
+        self.bound: dict[Any, str] = {}
+        self.functions: list[str] = []
+        self.names: set[str] = set()
+        self.functions_by_key: dict[Any, str] = {}
+        self.typed_dicts: dict[type, tuple[str, str]] = {}
+        self.pending: list[type] = []
+
+    def unique_name(self, name: str) -> str:
+        candidate, index = name, 1
+        while candidate in self.names:
+            index += 1
+            candidate = f'{name}_{index}'
+        self.names.add(candidate)
+        return candidate
+
+    def module_alias(self, module_name: str, alias: str | None = None) -> str:
+        module_alias = self.imports.get(module_name)
+        if module_alias is None:
+            module_alias = self.imports[module_name] = self.unique_name(
+                alias or '_' + module_name.replace('.', '_')
+            )
+        return module_alias
+
+    def reference(self, obj: Any) -> str:
+        if obj in _BUILTIN_VALUE_TYPES:
+            return obj.__name__
+        qualname: str = getattr(obj, '__qualname__', '')
+        module_name: str | None = getattr(obj, '__module__', None)
+        if module_name is None or not qualname or '<' in qualname:
+            raise _Unsupported(f'Unable to reference {obj!r}')
+        return f'{self.module_alias(module_name)}.{qualname}'
+
+    def bind(self, key: Any, name: str, source: str) -> str:
+        bound_name = self.bound.get(key)
+        if bound_name is None:
+            bound_name = self.bound[key] = self.unique_name(name)
+            self.bindings.append(f'{bound_name} = {source}')
+        return bound_name
+
+    def runtime(self, name: str) -> str:
+        module = self.module_alias(
+            'jetblack_serialization.codegen.runtime',
+            '_runtime'
+        )
+        return f'{module}.{name}'
+
+    def typed_dict_names(self, typed_dict: type) -> tuple[str, str]:
+        names = self.typed_dicts.get(typed_dict)
+        if names is None:
+            stem = _snake_case(typed_dict.__name__)
+            names = self.typed_dicts[typed_dict] = (
+                self.unique_name(f'serialize_{stem}'),
+                self.unique_name(f'deserialize_{stem}'),
+            )
+            self.pending.append(typed_dict)
+        return names
+
+    def empty(self) -> str:
+        return self.bind('empty', '_EMPTY', self.runtime('EMPTY'))
+
+    def value_source(self, value: Any) -> str:
+        if type(value) in _REPR_TYPES and (
+            type(value) is not float or math.isfinite(value)
+        ):
+            return repr(value)
+        elif isinstance(value, Enum):
+            return f'{self.reference(type(value))}.{value.name}'
+        elif type(value) is list:
+            return f'[{", ".join(map(self.value_source, value))}]'
+        elif type(value) is tuple:
+            items = ', '.join(map(self.value_source, value))
+            return f'({items},)' if len(value) == 1 else f'({items})'
+        elif type(value) is dict:
+            items = ', '.join(
+                f'{self.value_source(k)}: {self.value_source(v)}'
+                for k, v in value.items()
+            )
+            return f'{{{items}}}'
+        raise _Unsupported(f'Unable to write {value!r} as source')
+
+    def type_source(self, type_annotation: type) -> str:
+        if type_annotation is NoneType:
+            return 'type(None)'
+        return self.reference(type_annotation)
+
+    def literal_values(self, type_annotation: Annotation) -> str:
+        return self.bind(
+            ('literal', type_annotation),
+            '_literal_values',
+            self.value_source(get_args(type_annotation))
+        )
+
+    def write_literal(
+            self,
+            name: str,
+            table: dict[tuple[type, Any], Any],
+            trials: list[str],
+            literal_values: str
+    ) -> None:
+        # The value is found with one lookup, keyed by type as
+        # True == 1 == 1.0. Otherwise each literal type is tried unless
+        # literals are strict.
+        entries = ', '.join(
+            f'({self.type_source(key_type)}, {self.value_source(key)}): '
+            f'{self.value_source(value)}'
+            for (key_type, key), value in table.items()
+        )
+        table_name = self.bind(
+            ('literal_table', name),
+            f'{name}_table',
+            f'{{{entries}}}'
+        )
+        empty = self.empty()
+        lines = [
+            f'def {name}(value: Any) -> Any:',
+            f'    result = {table_name}.get((type(value), value), {empty})',
+            f'    if result is not {empty}:',
+            '        return result',
+        ]
+        if not self.config.strict_literals:
+            for expr in trials:
+                if expr == 'value':
+                    lines += [
+                        f'    if value in {literal_values}:',
+                        '        return value',
+                    ]
+                    continue
+                lines += [
+                    '    try:',
+                    f'        result = {expr}',
+                    f'        if result in {literal_values}:',
+                    '            return result',
+                    f'    except {_TRIAL_ERRORS}:',
+                    '        pass',
+                ]
+        lines.append(
+            "    raise ValueError(f'Value {value} not in Literal"
+            f"{{{literal_values}}}')"
+        )
+        self.functions.append('\n'.join(lines))
+
+    def literal_trials(
+            self,
+            type_annotation: Annotation,
+            json_annotation: JSONAnnotation,
+            write_expr: Any
+    ) -> list[str]:
+        trials: list[str] = []
+        for literal_type in dict.fromkeys(
+            type(value) for value in get_args(type_annotation)
+        ):
+            try:
+                trials.append(
+                    write_expr(literal_type, json_annotation, 'value', 0)
+                )
+            except _Unsupported:
+                # The member cannot convert any value.
+                pass
+        return trials
+
+    def serialize_literal(
+            self,
+            type_annotation: Annotation,
+            json_annotation: JSONAnnotation,
+            var: str
+    ) -> str:
+        key = ('serialize_literal', type_annotation)
+        name = self.functions_by_key.get(key)
+        if name is None:
+            name = self.functions_by_key[key] = self.unique_name(
+                '_serialize_literal'
+            )
+            # pylint: disable=protected-access
+            table: dict[tuple[type, Any], Any] = {}
+            for value in get_args(type_annotation):
+                serialize = typed_serializer._compile_json_value(
+                    type(value),
+                    json_annotation,
+                    self.config,
+                    {}
+                )
+                try:
+                    table[(type(value), value)] = serialize(value)
+                except Exception:  # pylint: disable=broad-exception-caught
+                    pass
+            self.write_literal(
+                name,
+                table,
+                self.literal_trials(
+                    type_annotation,
+                    json_annotation,
+                    self.serialize_expr
+                ),
+                self.literal_values(type_annotation)
+            )
+        return f'{name}({var})'
+
+    def deserialize_literal(
+            self,
+            type_annotation: Annotation,
+            json_annotation: JSONAnnotation,
+            var: str
+    ) -> str:
+        key = ('deserialize_literal', type_annotation)
+        name = self.functions_by_key.get(key)
+        if name is None:
+            name = self.functions_by_key[key] = self.unique_name(
+                '_deserialize_literal'
+            )
+            # Enums are found from their JSON value and themselves.
+            table: dict[tuple[type, Any], Any] = {}
+            for value in get_args(type_annotation):
+                table.setdefault((type(value), value), value)
+                if isinstance(value, Enum):
+                    json_value = (
+                        value.value
+                        if is_enum_by_value(type(value), self.config) else
+                        value.name
+                    )
+                    table.setdefault((type(json_value), json_value), value)
+            self.write_literal(
+                name,
+                table,
+                self.literal_trials(
+                    type_annotation,
+                    json_annotation,
+                    self.deserialize_expr
+                ),
+                self.literal_values(type_annotation)
+            )
+        return f'{name}({var})'
+
+    def serialize_expr(
+            self,
+            type_annotation: Annotation,
+            json_annotation: JSONAnnotation,
+            var: str,
+            depth: int
+    ) -> str:
+        config = self.config
+        type_annotation, discriminator_key = _get_discriminator(
+            type_annotation
+        )
+
+        if (
+            is_value_type(type_annotation) or
+            has_value_serializer(type_annotation, config)
+        ):
+            if type_annotation in _BUILTIN_VALUE_TYPES:
+                return var
+            elif type_annotation is Decimal:
+                return f'float({var})'
+            elif isclass(type_annotation) and issubclass(type_annotation, Enum):
+                if is_enum_by_value(type_annotation, config):
+                    return f'{var}.value'
+                return f'{var}.name'
+            else:
+                serializer = self.bind(
+                    ('serialize', type_annotation),
+                    f'_serialize_{_snake_case(type_annotation.__name__)}',
+                    f'_CONFIG.get_value_serializer({self.reference(type_annotation)})'
+                )
+                return f'{serializer}({var})'
+        elif is_optional(type_annotation):
+            union_types = [
+                t for t in get_args(type_annotation) if t is not NoneType
+            ]
+            if len(union_types) == 1:
+                expr = self.serialize_expr(
+                    union_types[0],
+                    json_annotation,
+                    var,
+                    depth
+                )
+            else:
+                expr = self.serialize_union(
+                    Union[tuple(union_types)],  # type: ignore
+                    json_annotation,
+                    var,
+                    discriminator_key
+                )
+            return f'(None if {var} is None else {expr})'
+        elif is_list(type_annotation):
+            item_annotation, item_json_annotation = _get_item_annotation(
+                get_args(type_annotation)[0]
+            )
+            item = f'item{depth}'
+            expr = self.serialize_expr(
+                item_annotation,
+                item_json_annotation,
+                item,
+                depth + 1
+            )
+            return f'[{expr} for {item} in {var}]'
+        elif is_typeddict(type_annotation):
+            serializer, _ = self.typed_dict_names(type_annotation)
+            return f'{serializer}({var})'
+        elif is_union(type_annotation):
+            return self.serialize_union(
+                type_annotation,
+                json_annotation,
+                var,
+                discriminator_key
+            )
+        elif is_dict(type_annotation):
+            key_args, value_args = get_args(type_annotation)
+            key, value = f'key{depth}', f'value{depth}'
+            key_expr = self.serialize_expr(
+                *_get_item_annotation(key_args),
+                key,
+                depth + 1
+            )
+            value_expr = self.serialize_expr(
+                *_get_item_annotation(value_args),
+                value,
+                depth + 1
+            )
+            if (
+                self.config.has_key_serializer and
+                _is_serializable_keys(json_annotation)
+            ):
+                serialize_key = self.bind(
+                    'serialize_key',
+                    '_serialize_key',
+                    '_CONFIG.serialize_key'
+                )
+                key_expr = (
+                    f'({serialize_key}({key_expr}) '
+                    f'if isinstance({key}, str) else {key_expr})'
+                )
+            return (
+                f'{{{key_expr}: {value_expr} '
+                f'for {key}, {value} in {var}.items()}}'
+            )
+        elif is_literal(type_annotation):
+            return self.serialize_literal(type_annotation, json_annotation, var)
+        elif is_any(type_annotation):
+            module = self.module_alias(
+                'jetblack_serialization.json.untyped_serializer'
+            )
+            return f'{module}.from_untyped_object({var}, _CONFIG)'
+
+        raise _Unsupported(f'Unable to generate {type_annotation!r}')
+
+    def union_function(self, key: Any, prefix: str) -> tuple[str, bool]:
+        # The name of the function for a union, and whether it must be
+        # written.
+        name = self.functions_by_key.get(key)
+        if name is not None:
+            return name, False
+        name = self.functions_by_key[key] = self.unique_name(prefix)
+        return name, True
+
+    def serialize_union(
+            self,
+            type_annotation: Annotation,
+            json_annotation: JSONAnnotation,
+            var: str,
+            discriminator_key: str | None = None
+    ) -> str:
+        if json_annotation.type_selector is not None:
+            raise _Unsupported('Type selectors are resolved at runtime')
+        name, is_new = self.union_function(
+            (
+                'serialize',
+                type_annotation,
+                discriminator_key,
+                _is_serializable_keys(json_annotation)
+            ),
+            '_serialize_union'
+        )
+        if not is_new:
+            return f'{name}({var})'
+
+        lines = [f'def {name}(value: Any) -> Any:']
+        discriminated_union = find_discriminated_union(
+            type_annotation,
+            discriminator_key,
+            self.config
+        )
+        if discriminated_union is not None:
+            python_key = discriminated_union.python_key
+            lines += [
+                '    if isinstance(value, dict):',
+                f'        discriminator = value.get({python_key!r})',
+            ]
+            for value, member in discriminated_union.members.items():
+                expr = self.serialize_expr(member, json_annotation, 'value', 0)
+                lines += [
+                    f'        if discriminator == {value!r}:',
+                    f'            return {expr}',
+                ]
+            if discriminator_key is not None:
+                # Only the discriminator selects a member.
+                message = f'Unable to serialize union with "{python_key}" of '
+                lines.append(f"    raise TypeError(f{message!r}'{{value!r}}')")
+                self.functions.append('\n'.join(lines))
+                return f'{name}({var})'
+
+        for element_type in get_args(type_annotation):
+            expr = self.serialize_expr(element_type, json_annotation, 'value', 0)
+            if expr == 'value':
+                # The member accepts every value.
+                lines.append('    return value')
+                break
+            lines += [
+                '    try:',
+                f'        return {expr}',
+                f'    except {_TRIAL_ERRORS}:',
+                '        pass',
+            ]
+        else:
+            lines.append('    raise TypeError("Unable to serialize union")')
+        self.functions.append('\n'.join(lines))
+        return f'{name}({var})'
+
+    def deserialize_expr(
+            self,
+            type_annotation: Annotation,
+            json_annotation: JSONAnnotation,
+            var: str,
+            depth: int
+    ) -> str:
+        config = self.config
+        type_annotation, discriminator_key = _get_discriminator(
+            type_annotation
+        )
+
+        if is_value_type(type_annotation, config.value_deserializers.keys()):
+            deserializer = self.bind(
+                ('deserialize', type_annotation),
+                f'_deserialize_{_snake_case(type_annotation.__name__)}',
+                f'{self.runtime("value_deserializer")}('
+                f'{self.reference(type_annotation)}, _CONFIG)'
+            )
+            if type_annotation in _BUILTIN_VALUE_TYPES:
+                return (
+                    f'({var} if type({var}) is {type_annotation.__name__} '
+                    f'else {deserializer}({var}))'
+                )
+            return f'{deserializer}({var})'
+        elif is_optional(type_annotation):
+            union_types = [
+                t for t in get_args(type_annotation) if t is not NoneType
+            ]
+            if len(union_types) == 1:
+                expr = self.deserialize_expr(
+                    union_types[0],
+                    json_annotation,
+                    var,
+                    depth
+                )
+            else:
+                expr = self.deserialize_union(
+                    Union[tuple(union_types)],  # type: ignore
+                    json_annotation,
+                    var,
+                    discriminator_key
+                )
+            return f'(None if {var} is None else {expr})'
+        elif is_list(type_annotation):
+            item_annotation, item_json_annotation = _get_item_annotation(
+                get_args(type_annotation)[0]
+            )
+            item = f'item{depth}'
+            expr = self.deserialize_expr(
+                item_annotation,
+                item_json_annotation,
+                item,
+                depth + 1
+            )
+            return f'[{expr} for {item} in {var}]'
+        elif is_typeddict(type_annotation):
+            _, deserializer = self.typed_dict_names(type_annotation)
+            return f'{deserializer}({var})'
+        elif is_union(type_annotation):
+            return self.deserialize_union(
+                type_annotation,
+                json_annotation,
+                var,
+                discriminator_key
+            )
+        elif is_dict(type_annotation):
+            key_args, value_args = get_args(type_annotation)
+            key, value = f'key{depth}', f'value{depth}'
+            key_expr = self.deserialize_expr(
+                *_get_item_annotation(key_args),
+                key,
+                depth + 1
+            )
+            value_expr = self.deserialize_expr(
+                *_get_item_annotation(value_args),
+                value,
+                depth + 1
+            )
+            if (
+                self.config.has_key_deserializer and
+                _is_serializable_keys(json_annotation)
+            ):
+                deserialize_key = self.bind(
+                    'deserialize_key',
+                    '_deserialize_key',
+                    '_CONFIG.deserialize_key'
+                )
+                key_expr = (
+                    f'({deserialize_key}({key_expr}) '
+                    f'if isinstance({key}, str) else {key_expr})'
+                )
+            return (
+                f'{{{key_expr}: {value_expr} '
+                f'for {key}, {value} in {var}.items()}}'
+            )
+        elif is_literal(type_annotation):
+            return self.deserialize_literal(
+                type_annotation,
+                json_annotation,
+                var
+            )
+        elif is_any(type_annotation):
+            module = self.module_alias(
+                'jetblack_serialization.json.untyped_deserializer'
+            )
+            return f'{module}.from_untyped_object({var}, _CONFIG)'
+
+        raise _Unsupported(f'Unable to generate {type_annotation!r}')
+
+    def deserialize_union(
+            self,
+            type_annotation: Annotation,
+            json_annotation: JSONAnnotation,
+            var: str,
+            discriminator_key: str | None = None
+    ) -> str:
+        if json_annotation.type_selector is not None:
+            raise _Unsupported('Type selectors are resolved at runtime')
+        name, is_new = self.union_function(
+            (
+                'deserialize',
+                type_annotation,
+                discriminator_key,
+                _is_serializable_keys(json_annotation)
+            ),
+            '_deserialize_union'
+        )
+        if not is_new:
+            return f'{name}({var})'
+
+        lines = [f'def {name}(value: Any) -> Any:']
+        discriminated_union = find_discriminated_union(
+            type_annotation,
+            discriminator_key,
+            self.config
+        )
+        if discriminated_union is not None:
+            tag = discriminated_union.tag
+            lines += [
+                '    if isinstance(value, dict):',
+                f'        discriminator = value.get({tag!r})',
+            ]
+            for value, member in discriminated_union.members.items():
+                expr = self.deserialize_expr(
+                    member,
+                    json_annotation,
+                    'value',
+                    0
+                )
+                lines += [
+                    f'        if discriminator == {value!r}:',
+                    f'            return {expr}',
+                ]
+            if discriminator_key is not None:
+                # Only the discriminator selects a member.
+                message = f'Unable to deserialize union with "{tag}" of '
+                lines.append(f"    raise TypeError(f{message!r}'{{value!r}}')")
+                self.functions.append('\n'.join(lines))
+                return f'{name}({var})'
+
+        is_exhaustive = False
+        for element_type in get_args(type_annotation):
+            expr = self.deserialize_expr(
+                element_type,
+                json_annotation,
+                'value',
+                0
+            )
+            trial = (
+                ['return value']
+                if expr == 'value' else
+                [
+                    'try:',
+                    f'    return {expr}',
+                    f'except {_TRIAL_ERRORS}:',
+                    '    pass',
+                ]
+            )
+            json_types = typed_deserializer.get_json_types(
+                element_type,
+                self.config
+            )
+            excluded_types = [
+                json_type
+                for json_type in typed_deserializer.JSON_TYPES
+                if json_types is not None and json_type not in json_types
+            ]
+            if excluded_types:
+                # Values of these types cannot be deserialized by the member.
+                names = ', '.join(
+                    'type(None)' if json_type is NoneType else json_type.__name__
+                    for json_type in excluded_types
+                )
+                lines.append(f'    if type(value) not in ({names},):')
+                trial = _indent(trial)
+            lines += _indent(trial)
+            if trial == ['return value']:
+                # The member accepts every value.
+                is_exhaustive = True
+                break
+        if not is_exhaustive:
+            lines.append('    raise TypeError("Unable to deserialize union")')
+        self.functions.append('\n'.join(lines))
+        return f'{name}({var})'
+
+    def default_expr(
+            self,
+            typed_dict: type,
+            key: str,
+            annotation: Annotation
+    ) -> str | None:
+        try:
+            if is_any_default_annotation(annotation):
+                _, default = get_default_annotation(annotation)
+                return self.value_source(default.value)
+            elif is_any_default_factory_annotation(annotation):
+                _, default_factory = get_default_factory_annotation(annotation)
+                return f'{self.reference(default_factory.factory)}()'
+            else:
+                return None
+        except _Unsupported:
+            # The default is bound when the module is imported.
+            pass
+
+        default_factory = self.bind(
+            ('default', typed_dict, key),
+            f'_default_{_snake_case(typed_dict.__name__)}_{key}',
+            f'{self.runtime("field_default")}('
+            f'{self.reference(typed_dict)}, {key!r})'
+        )
+        return f'{default_factory}()'
+
+    def write_serializer(self, typed_dict: type, name: str) -> None:
+        lines = [
+            f'def {name}(obj: dict[str, Any]) -> dict[str, Any]:',
+            '    json_obj: dict[str, Any] = {}',
+        ]
+        empty = self.empty()
+        for key, info in typeddict_keys(typed_dict).items():
+            # pylint: disable=protected-access
+            item_annotation, json_property = typed_serializer._get_annotated_key(
+                key,
+                info.annotation,
+                self.config
+            )
+            try:
+                expr = self.serialize_expr(
+                    item_annotation,
+                    json_property,
+                    'value',
+                    0
+                )
+            except _Unsupported:
+                serializer = self.bind(
+                    ('serialize', typed_dict, key),
+                    f'_serialize_{_snake_case(typed_dict.__name__)}_{key}',
+                    f'{self.runtime("field_serializer")}('
+                    f'{self.reference(typed_dict)}, {key!r}, _CONFIG)'
+                )
+                expr = f'{serializer}(value)'
+
+            lines += [
+                f'    value = obj.get({key!r}, {empty})',
+                f'    if value is not {empty}:',
+                f'        json_obj[{json_property.tag!r}] = {expr}',
+            ]
+            if info.is_required:
+                message = f'Missing required property {key}'
+                lines += [
+                    '    else:',
+                    f'        raise KeyError({message!r})',
+                ]
+        lines.append('    return json_obj')
+        self.functions.append('\n'.join(lines))
+
+    def write_deserializer(self, typed_dict: type, name: str) -> None:
+        lines = [
+            f'def {name}(json_obj: dict[str, Any]) -> dict[str, Any]:',
+            '    obj: dict[str, Any] = {}',
+        ]
+        for key, info in typeddict_keys(typed_dict).items():
+            # pylint: disable=protected-access
+            item_annotation, json_property = typed_deserializer._get_key_annotation(
+                key,
+                info.annotation,
+                self.config
+            )
+            tag = json_property.tag
+            try:
+                expr = self.deserialize_expr(
+                    item_annotation,
+                    json_property,
+                    'value',
+                    0
+                )
+            except _Unsupported:
+                deserializer = self.bind(
+                    ('deserialize', typed_dict, key),
+                    f'_deserialize_{_snake_case(typed_dict.__name__)}_{key}',
+                    f'{self.runtime("field_deserializer")}('
+                    f'{self.reference(typed_dict)}, {key!r}, _CONFIG)'
+                )
+                expr = f'{deserializer}(value)'
+
+            lines += [
+                f'    if {tag!r} in json_obj:',
+                f'        value = json_obj[{tag!r}]',
+                f'        obj[{key!r}] = {expr}',
+            ]
+            default = self.default_expr(typed_dict, key, info.annotation)
+            if default is not None:
+                lines += [
+                    '    else:',
+                    f'        value = {default}',
+                    f'        obj[{key!r}] = {expr}',
+                ]
+            elif is_optional(get_unannotated(item_annotation)):
+                lines += [
+                    '    else:',
+                    f'        obj[{key!r}] = None',
+                ]
+            elif info.is_required:
+                message = f'Required key "{tag}" is missing'
+                lines += [
+                    '    else:',
+                    f'        raise KeyError({message!r})',
+                ]
+        lines.append('    return obj')
+        self.functions.append('\n'.join(lines))
+
+    def write(self, modules: list[ModuleType]) -> str:
+        for module in modules:
+            for value in vars(module).values():
+                if is_typeddict(value) and value.__module__ == module.__name__:
+                    self.typed_dict_names(value)
+
+        while self.pending:
+            typed_dict = self.pending.pop(0)
+            serializer, deserializer = self.typed_dicts[typed_dict]
+            self.write_serializer(typed_dict, serializer)
+            self.write_deserializer(typed_dict, deserializer)
+
+        typed_dicts = [
+            (self.reference(typed_dict), serializer, deserializer)
+            for typed_dict, (serializer, deserializer)
+            in self.typed_dicts.items()
+        ]
+        lookups = [
+            'SERIALIZERS = {',
+            *(
+                f'    {reference}: {serializer},'
+                for reference, serializer, _ in typed_dicts
+            ),
+            '}',
+            '',
+            'DESERIALIZERS = {',
+            *(
+                f'    {reference}: {deserializer},'
+                for reference, _, deserializer in typed_dicts
+            ),
+            '}',
+        ]
+
+        sources = ', '.join(module.__name__ for module in modules)
+        return '\n'.join(
+            [
+                f'"""Serialization generated from {sources}.',
+                '',
+                'Generated by jetblack_serialization.codegen. Do not edit.',
+                '"""',
+                '',
+                '# pylint: disable=line-too-long,unused-import',
+                '',
+                'from typing import Any',
+                '',
+                *(
+                    f'import {module_name} as {alias}'
+                    for module_name, alias in sorted(self.imports.items())
+                ),
+                '',
+                f'from {self.config_module} import {self.config_name}',
+                '',
+                f'_CONFIG = {self.config_name}.freeze()',
+                '',
+                *self.bindings,
+                '',
+                '',
+                '\n\n\n'.join(self.functions),
+                '',
+                '',
+                *lookups,
+                '',
+            ]
+        )
+
+
+def generate_source(
+        module_names: list[str],
+        config_reference: str | None = None
+) -> str:
+    """Generate the source of a module which serializes and deserializes the
+    typed dictionaries of the given modules to and from JSON values.
+
+    For each typed dictionary `Foo` the module has the functions
+    `serialize_foo` and `deserialize_foo`. The dictionaries `SERIALIZERS`
+    and `DESERIALIZERS` map each typed dictionary to its function.
+
+    Args:
+        module_names (list[str]): The names of the modules containing the
+            typed dictionaries.
+        config_reference (str | None, optional): The serializer configuration
+            as `"module:name"`. Defaults to the default configuration.
+
+    Returns:
+        str: The source of the module.
+    """
+    config_module, config_name = (
+        config_reference or 'jetblack_serialization.config:DEFAULT_CONFIG'
+    ).split(':')
+    config = getattr(import_module(config_module), config_name)
+    if not isinstance(config, SerializerConfig):
+        raise TypeError(f'Expected {config_reference} to be a SerializerConfig')
+
+    writer = _ModuleWriter(config.freeze(), config_module, config_name)
+    return writer.write([import_module(name) for name in module_names])
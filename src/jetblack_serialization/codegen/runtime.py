@@ -0,0 +1,114 @@
+"""Support for generated serialization modules
+
+Generated modules use these functions at import time to bind converters
+which cannot be written as source, for example custom value deserializers
+or fields with type selectors.
+"""
+
+from inspect import Signature
+from typing import Any, Callable
+
+from ..config import SerializerConfig
+from ..json import typed_deserializer, typed_serializer
+from ..typing_ex import typeddict_keys
+
+EMPTY: Any = Signature.empty
+"""The marker for a missing value"""
+
+
+def value_deserializer(
+        type_annotation: type,
+        config: SerializerConfig
+) -> Callable[[Any], Any]:
+    """Create a deserializer for a value type.
+
+    Args:
+        type_annotation (type): The value type.
+        config (SerializerConfig): The serializer configuration.
+
+    Returns:
+        Callable[[Any], Any]: The deserializer.
+    """
+    return typed_deserializer._compile_value(  # pylint: disable=protected-access
+        type_annotation,
+        config
+    )
+
+
+def field_serializer(
+        typed_dict: type,
+        key: str,
+        config: SerializerConfig
+) -> Callable[[Any], Any]:
+    """Compile a serializer for a field of a typed dictionary.
+
+    Args:
+        typed_dict (type): The typed dictionary.
+        key (str): The field name.
+        config (SerializerConfig): The serializer configuration.
+
+    Returns:
+        Callable[[Any], Any]: The serializer.
+    """
+    info = typeddict_keys(typed_dict)[key]
+    # pylint: disable=protected-access
+    type_annotation, json_property = typed_serializer._get_annotated_key(
+        key,
+        info.annotation,
+        config
+    )
+    return typed_serializer._compile_json_value(
+        type_annotation,
+        json_property,
+        config,
+        {}
+    )
+
+
+def field_deserializer(
+        typed_dict: type,
+        key: str,
+        config: SerializerConfig
+) -> Callable[[Any], Any]:
+    """Compile a deserializer for a field of a typed dictionary.
+
+    Args:
+        typed_dict (type): The typed dictionary.
+        key (str): The field name.
+        config (SerializerConfig): The serializer configuration.
+
+    Returns:
+        Callable[[Any], Any]: The deserializer.
+    """
+    info = typeddict_keys(typed_dict)[key]
+    # pylint: disable=protected-access
+    type_annotation, json_property = typed_deserializer._get_key_annotation(
+        key,
+        info.annotation,
+        config
+    )
+    return typed_deserializer._compile_any(
+        type_annotation,
+        json_property,
+        config,
+        {}
+    )
+
+
+def field_default(typed_dict: type, key: str) -> Callable[[], Any]:
+    """Create a function returning the default for a field of a typed
+    dictionary.
+
+    Args:
+        typed_dict (type): The typed dictionary.
+        key (str): The field name.
+
+    Returns:
+        Callable[[], Any]: A function returning the default value.
+    """
+    annotation = typeddict_keys(typed_dict)[key].annotation
+    # pylint: disable=protected-access
+    default_factory = typed_deserializer._get_default_factory(annotation)
+    if default_factory is None:
+        raise ValueError(f'The field "{key}" has no default')
+    return default_factory
@@ -2,8 +2,13 @@
 
 from datetime import date, datetime, time, timedelta
 from decimal import Decimal
-from typing import Any, Callable, Sequence
-from zoneinfo import ZoneInfo
+from functools import cache, lru_cache
+import re
+from threading import Lock
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, Sequence
+from weakref import WeakValueDictionary
+from zoneinfo import ZoneInfo, available_timezones
 
 from jetblack_iso8601 import (
     iso8601_to_datetime,
@@ -17,6 +22,17 @@ def _same_name(name: str) -> str:
     return name
 
 
+def _cached_key_transform(
+        transform: Callable[[str], str] | None,
+        maxsize: int | None
+) -> Callable[[str], str]:
+    if transform is None or transform is _same_name:
+        return _same_name
+    if maxsize == 0:
+        return transform
+    return lru_cache(maxsize=maxsize)(transform)
+
+
 def _to_datetime(text: str) -> datetime:
     value = iso8601_to_datetime(text)
     if value is None:
@@ -31,10 +47,34 @@ def _to_timedelta(text: str) -> timedelta:
     return value
 
 
+# The sniffers accept every string the matching deserializer can parse, but
+# may accept others.
+_is_datetime_like = re.compile(r'\d{4}-\d\d-\d\d').match
+_is_timedelta_like = re.compile(r'-?P[\dT]').match
+_is_decimal_like = re.compile(
+    r'\s*[+-]?(\d|\.\d|inf|nan|snan)',
+    re.IGNORECASE
+).match
+_is_date_like = re.compile(r'\d{4}').match
+_is_time_like = re.compile(r'T?\d\d').match
+_is_zone_key_like = re.compile(r'[A-Za-z][A-Za-z0-9_+\-/]*').fullmatch
+_zone_keys = cache(available_timezones)
+
+
+def _is_zone_key(text: str) -> bool:
+    if _is_zone_key_like(text) is None:
+        return False
+    if text.startswith(('posix/', 'right/')):
+        text = text[6:]
+    return text in _zone_keys()
+
+
 type ValueSerializer = Callable[[Any], Any]
 type ValueDeserializer = Callable[[str], Any]
+type ValueSniffer = Callable[[str], Any]
 type ValueSerializers = Sequence[tuple[type, ValueSerializer]]
 type ValueDeserializers = Sequence[tuple[type, ValueDeserializer]]
+type ValueSniffers = Sequence[tuple[type, ValueSniffer]]
 
 VALUE_SERIALIZERS: ValueSerializers = (
     (datetime, datetime_to_iso8601),
@@ -52,10 +92,106 @@ VALUE_DESERIALIZERS: ValueDeserializers = (
     (time, time.fromisoformat),
     (ZoneInfo, ZoneInfo)
 )
+VALUE_SNIFFERS: ValueSniffers = (
+    (datetime, _is_datetime_like),
+    (timedelta, _is_timedelta_like),
+    (Decimal, _is_decimal_like),
+    (date, _is_date_like),
+    (time, _is_time_like),
+    (ZoneInfo, _is_zone_key),
+)
+
+
+def _default_sniffers(
+        value_deserializers: dict[type, ValueDeserializer]
+) -> dict[type, ValueSniffer]:
+    default_deserializers = dict(VALUE_DESERIALIZERS)
+    return {
+        cls: sniffer
+        for cls, sniffer in VALUE_SNIFFERS
+        if value_deserializers.get(cls) is default_deserializers[cls]
+    }
+
+
+_MISSING: Any = object()
+
+
+def _resolve_converter[T](
+        converters: Mapping[type, T],
+        cls: Any
+) -> T | None:
+    for base in cls.__mro__ if isinstance(cls, type) else (cls,):
+        converter = converters.get(base)
+        if converter is not None:
+            return converter
+    return None
+
+
+class _ValueMap(dict):
+    """The value converters of a mutable config, which tells the config when
+    they change"""
+
+    def __init__(self, config: 'SerializerConfig', items: Any) -> None:
+        super().__init__(items)
+        self._config = config
+
+    def _changed(self) -> None:
+        self._config._changed()  # pylint: disable=protected-access
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key: Any) -> None:
+        super().__delitem__(key)
+        self._changed()
+
+    def __ior__(self, other: Any) -> '_ValueMap':
+        super().__ior__(other)
+        self._changed()
+        return self
+
+    def clear(self) -> None:
+        super().clear()
+        self._changed()
+
+    def pop(self, *args: Any) -> Any:
+        value = super().pop(*args)
+        self._changed()
+        return value
+
+    def popitem(self) -> tuple[Any, Any]:
+        item = super().popitem()
+        self._changed()
+        return item
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        value = super().setdefault(key, default)
+        self._changed()
+        return value
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        super().update(*args, **kwargs)
+        self._changed()
+
+
+_VALUE_MAPS = ('value_serializers', 'value_deserializers', 'value_sniffers')
+
+
+def _or_none(value: Any, default: Any) -> Any:
+    if isinstance(value, dict):
+        return None if value == dict(default) else dict(value)
+    return None if value is default else value
 
 
 class SerializerConfig:
-    """Configuration for serialization"""
+    """Configuration for serialization.
+
+    The attributes of a config, and its value converters, may be changed.
+    The serializers use the `FrozenSerializerConfig` returned by `freeze`,
+    which is made again after a change, so equal configs share the compiled
+    serializers and deserializers.
+    """
 
     def __init__(
         self,
@@ -63,15 +199,422 @@ class SerializerConfig:
         key_deserializer: Callable[[str], str] | None = None,
         value_serializers: ValueSerializers | None = None,
         value_deserializers: ValueDeserializers | None = None,
+        strict_literals: bool = False,
+        enum_by_value: bool = False,
+        value_sniffers: ValueSniffers | None = None,
+        key_cache_size: int | None = 1024,
     ) -> None:
+        """Configuration for serialization.
+
+        Args:
+            key_serializer (Callable[[str], str] | None, optional): A function
+                to transform the keys when serializing. Defaults to None.
+            key_deserializer (Callable[[str], str] | None, optional): A
+                function to transform the keys when deserializing. Defaults to
+                None.
+            value_serializers (ValueSerializers | None, optional): The
+                serializers for value types. Defaults to None.
+            value_deserializers (ValueDeserializers | None, optional): The
+                deserializers for value types. Defaults to None.
+            strict_literals (bool, optional): If True a literal only accepts
+                its own values, and values needing a conversion, like the
+                string "1" for `Literal[1]`, are rejected. Defaults to False.
+            enum_by_value (bool, optional): If True enums with int or str
+                values, like IntEnum and StrEnum, are serialized by value
+                rather than by name. Defaults to False.
+            value_sniffers (ValueSniffers | None, optional): Cheap checks used
+                by untyped deserialization to skip value deserializers which
+                cannot parse a string. A sniffer returns a true value for
+                every string its deserializer can parse. Deserializers
+                without a sniffer are always tried. Defaults to None, which
+                uses the default sniffers for the default deserializers.
+            key_cache_size (int | None, optional): The number of transformed
+                keys remembered by each of the key serializer and
+                deserializer, with the least recently used discarded first.
+                None is unbounded and 0 disables the cache. Defaults to 1024.
+        """
         self.serialize_key = key_serializer or _same_name
         self.deserialize_key = key_deserializer or _same_name
-        self.value_serializers = dict(
-            value_serializers or VALUE_SERIALIZERS
+        self.value_serializers = value_serializers or VALUE_SERIALIZERS
+        self.value_deserializers = value_deserializers or VALUE_DESERIALIZERS
+        # None uses the default sniffers for the value deserializers.
+        self.value_sniffers = value_sniffers
+        self.strict_literals = strict_literals
+        self.enum_by_value = enum_by_value
+        self.key_cache_size = key_cache_size
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in _VALUE_MAPS and value is not None:
+            value = _ValueMap(self, value)
+        object.__setattr__(self, name, value)
+        if name == 'serialize_key':
+            object.__setattr__(
+                self,
+                'has_key_serializer',
+                value is not _same_name
+            )
+        elif name == 'deserialize_key':
+            object.__setattr__(
+                self,
+                'has_key_deserializer',
+                value is not _same_name
+            )
+        self._changed()
+
+    def _changed(self) -> None:
+        object.__setattr__(self, '_frozen', None)
+
+    def _get_args(self) -> dict[str, Any]:
+        # The defaults are passed as None, so the arguments can be pickled.
+        return {
+            'key_serializer': _or_none(self.serialize_key, _same_name),
+            'key_deserializer': _or_none(self.deserialize_key, _same_name),
+            'value_serializers': _or_none(
+                self.value_serializers,
+                VALUE_SERIALIZERS
+            ),
+            'value_deserializers': _or_none(
+                self.value_deserializers,
+                VALUE_DESERIALIZERS
+            ),
+            'strict_literals': self.strict_literals,
+            'enum_by_value': self.enum_by_value,
+            'value_sniffers': (
+                None
+                if self.value_sniffers is None else
+                dict(self.value_sniffers)
+            ),
+            'key_cache_size': self.key_cache_size,
+        }
+
+    def freeze(self) -> 'FrozenSerializerConfig':
+        """Get the immutable config with the current settings.
+
+        Returns:
+            FrozenSerializerConfig: The shared frozen config.
+        """
+        frozen = self._frozen
+        if frozen is None:
+            frozen = FrozenSerializerConfig(**self._get_args()).intern()
+            object.__setattr__(self, '_frozen', frozen)
+        return frozen
+
+    def intern(self) -> 'FrozenSerializerConfig':
+        """Get the shared frozen config with the current settings.
+
+        Returns:
+            FrozenSerializerConfig: The shared frozen config.
+        """
+        return self.freeze()
+
+    def get_value_serializer(self, cls: Any) -> ValueSerializer | None:
+        """Get the value serializer for a type, or the first of its base
+        classes with a serializer.
+
+        Args:
+            cls (Any): The type.
+
+        Returns:
+            ValueSerializer | None: The serializer, or None if the type has
+                no serializer.
+        """
+        return self.freeze().get_value_serializer(cls)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (_make_config, (type(self), self._get_args()))
+
+    def _derive(self, **changes: Any) -> 'FrozenSerializerConfig':
+        return self.freeze()._derive(**changes)  # pylint: disable=protected-access
+
+    def with_key_serializer(
+            self,
+            key_serializer: Callable[[str], str] | None
+    ) -> 'SerializerConfig':
+        """Get a config with a different key serializer.
+
+        Args:
+            key_serializer (Callable[[str], str] | None): The key serializer.
+
+        Returns:
+            SerializerConfig: The derived config.
+        """
+        return self._derive(key_serializer=key_serializer)
+
+    def with_key_deserializer(
+            self,
+            key_deserializer: Callable[[str], str] | None
+    ) -> 'SerializerConfig':
+        """Get a config with a different key deserializer.
+
+        Args:
+            key_deserializer (Callable[[str], str] | None): The key
+                deserializer.
+
+        Returns:
+            SerializerConfig: The derived config.
+        """
+        return self._derive(key_deserializer=key_deserializer)
+
+    def with_value_serializers(
+            self,
+            value_serializers: ValueSerializers | None
+    ) -> 'SerializerConfig':
+        """Get a config with different value serializers.
+
+        Args:
+            value_serializers (ValueSerializers | None): The value
+                serializers.
+
+        Returns:
+            SerializerConfig: The derived config.
+        """
+        return self._derive(value_serializers=value_serializers)
+
+    def with_value_deserializers(
+            self,
+            value_deserializers: ValueDeserializers | None
+    ) -> 'SerializerConfig':
+        """Get a config with different value deserializers.
+
+        Args:
+            value_deserializers (ValueDeserializers | None): The value
+                deserializers.
+
+        Returns:
+            SerializerConfig: The derived config.
+        """
+        return self._derive(value_deserializers=value_deserializers)
+
+    def with_value_sniffers(
+            self,
+            value_sniffers: ValueSniffers | None
+    ) -> 'SerializerConfig':
+        """Get a config with different value sniffers.
+
+        Args:
+            value_sniffers (ValueSniffers | None): The value sniffers.
+
+        Returns:
+            SerializerConfig: The derived config.
+        """
+        return self._derive(value_sniffers=value_sniffers)
+
+    def with_strict_literals(self, strict_literals: bool) -> 'SerializerConfig':
+        """Get a config with different literal checking.
+
+        Args:
+            strict_literals (bool): If True literals only accept their own
+                values.
+
+        Returns:
+            SerializerConfig: The derived config.
+        """
+        return self._derive(strict_literals=strict_literals)
+
+    def with_enum_by_value(self, enum_by_value: bool) -> 'SerializerConfig':
+        """Get a config with different enum serialization.
+
+        Args:
+            enum_by_value (bool): If True enums are serialized by value.
+
+        Returns:
+            SerializerConfig: The derived config.
+        """
+        return self._derive(enum_by_value=enum_by_value)
+
+    def with_key_cache_size(
+            self,
+            key_cache_size: int | None
+    ) -> 'SerializerConfig':
+        """Get a config with a different key cache size.
+
+        Args:
+            key_cache_size (int | None): The key cache size.
+
+        Returns:
+            SerializerConfig: The derived config.
+        """
+        return self._derive(key_cache_size=key_cache_size)
+
+
+class FrozenSerializerConfig(SerializerConfig):
+    """An immutable configuration for serialization.
+
+    Configs built from the same arguments are equal and have the same hash,
+    so they can be used as cache keys. A modified copy is made with the
+    `with_...` methods, and `intern` returns a single shared instance for
+    equal configs.
+    """
+
+    # pylint: disable=super-init-not-called
+    def __init__(
+        self,
+        key_serializer: Callable[[str], str] | None = None,
+        key_deserializer: Callable[[str], str] | None = None,
+        value_serializers: ValueSerializers | None = None,
+        value_deserializers: ValueDeserializers | None = None,
+        strict_literals: bool = False,
+        enum_by_value: bool = False,
+        value_sniffers: ValueSniffers | None = None,
+        key_cache_size: int | None = 1024,
+    ) -> None:
+        """An immutable configuration for serialization. The arguments are
+        those of `SerializerConfig`.
+        """
+        value_serializers_map = dict(
+            value_serializers
+            if value_serializers is not None else
+            VALUE_SERIALIZERS
+        )
+        value_deserializers_map = dict(
+            value_deserializers
+            if value_deserializers is not None else
+            VALUE_DESERIALIZERS
+        )
+        value_sniffers_map = dict(
+            value_sniffers
+            if value_sniffers is not None else
+            _default_sniffers(value_deserializers_map)
+        )
+        key = (
+            key_serializer or _same_name,
+            key_deserializer or _same_name,
+            tuple(value_serializers_map.items()),
+            tuple(value_deserializers_map.items()),
+            strict_literals,
+            enum_by_value,
+            tuple(value_sniffers_map.items()),
+            key_cache_size,
+        )
+        try:
+            key_hash = hash(key)
+        except TypeError:
+            # Configs with unhashable members are only equal to themselves.
+            key_hash = object.__hash__(self)
+
+        attributes: dict[str, Any] = {
+            '_args': {
+                'key_serializer': key_serializer,
+                'key_deserializer': key_deserializer,
+                'value_serializers': value_serializers,
+                'value_deserializers': value_deserializers,
+                'strict_literals': strict_literals,
+                'enum_by_value': enum_by_value,
+                'value_sniffers': value_sniffers,
+                'key_cache_size': key_cache_size,
+            },
+            '_key': key,
+            '_hash': key_hash,
+            'serialize_key': _cached_key_transform(
+                key_serializer,
+                key_cache_size
+            ),
+            'deserialize_key': _cached_key_transform(
+                key_deserializer,
+                key_cache_size
+            ),
+            'value_serializers': MappingProxyType(value_serializers_map),
+            'value_deserializers': MappingProxyType(value_deserializers_map),
+            'value_sniffers': MappingProxyType(value_sniffers_map),
+            'strict_literals': strict_literals,
+            'enum_by_value': enum_by_value,
+            'key_cache_size': key_cache_size,
+            '_resolved_serializers': {},
+            '_resolve_lock': Lock(),
+        }
+        attributes['has_key_serializer'] = (
+            attributes['serialize_key'] is not _same_name
+        )
+        attributes['has_key_deserializer'] = (
+            attributes['deserialize_key'] is not _same_name
         )
-        self.value_deserializers = dict(
-            value_deserializers or VALUE_DESERIALIZERS
+        for name, value in attributes.items():
+            object.__setattr__(self, name, value)
+
+    def freeze(self) -> 'FrozenSerializerConfig':
+        """Get the immutable config, which is this config.
+
+        Returns:
+            FrozenSerializerConfig: This config.
+        """
+        return self
+
+    def get_value_serializer(self, cls: Any) -> ValueSerializer | None:
+        """Get the value serializer for a type, or the first of its base
+        classes with a serializer. The result for each type is cached.
+
+        Args:
+            cls (Any): The type.
+
+        Returns:
+            ValueSerializer | None: The serializer, or None if the type has
+                no serializer.
+        """
+        serializer = self._resolved_serializers.get(cls, _MISSING)
+        if serializer is _MISSING:
+            with self._resolve_lock:
+                serializer = self._resolved_serializers.get(cls, _MISSING)
+                if serializer is _MISSING:
+                    serializer = self._resolved_serializers[cls] = (
+                        _resolve_converter(self.value_serializers, cls)
+                    )
+        return serializer
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(
+            f'FrozenSerializerConfig is immutable: cannot set "{name}"'
         )
 
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(
+            f'FrozenSerializerConfig is immutable: cannot delete "{name}"'
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, FrozenSerializerConfig):
+            return NotImplemented
+        if self._hash != other._hash:
+            return False
+        return self._key == other._key
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (_make_config, (type(self), self._args))
+
+    def intern(self) -> 'FrozenSerializerConfig':
+        """Get the shared instance of configs equal to this one.
+
+        Returns:
+            FrozenSerializerConfig: The first live config which is equal to
+                this one, or this config.
+        """
+        try:
+            with _INTERN_LOCK:
+                return _INTERNED.setdefault(self._key, self)
+        except TypeError:
+            return self
+
+    def _derive(self, **changes: Any) -> 'FrozenSerializerConfig':
+        return FrozenSerializerConfig(**(self._args | changes)).intern()
+
+
+def _make_config(
+        cls: type[SerializerConfig],
+        args: dict[str, Any]
+) -> SerializerConfig:
+    return cls(**args)
+
+
+# The shared configs by their arguments.
+_INTERN_LOCK = Lock()
+_INTERNED: WeakValueDictionary[
+    tuple,
+    FrozenSerializerConfig
+] = WeakValueDictionary()
+
 
 DEFAULT_CONFIG = SerializerConfig()
@@ -2,7 +2,7 @@
 
 from abc import ABCMeta
 from inspect import Signature
-from typing import Any, Callable
+from typing import Annotated, Any, Callable
 
 from .types import Annotation
 from .typing_ex import is_annotated, get_annotated_type, get_metadata
@@ -24,6 +24,22 @@ class DefaultFactory[T]:
         self.factory = factory
 
 
+class Discriminator:
+    """The key of a literal field which selects the member of a union of
+    typed dictionaries.
+
+    ```python
+    Event = Annotated[Trade | Quote, Discriminator('kind')]
+    ```
+    """
+
+    def __init__(self, key: str) -> None:
+        self.key = key
+
+    def __repr__(self) -> str:
+        return f'Discriminator({self.key!r})'
+
+
 def is_any_annotation_of_type(annotation: Annotation, tp: type[Any]) -> bool:
     if not is_annotated(annotation):
         return False
@@ -103,6 +119,37 @@ def get_default_factory_annotation(
     return get_annotation_of_type(annotation, DefaultFactory)
 
 
+def is_any_discriminator_annotation(annotation: Annotation) -> bool:
+    return is_any_annotation_of_type(annotation, Discriminator)
+
+
+def get_discriminator_annotation(
+        annotation: Annotation
+) -> tuple[Annotation, Discriminator]:
+    return get_annotation_of_type(annotation, Discriminator)
+
+
+def with_discriminator(
+        type_annotation: Annotation,
+        annotation: Annotation
+) -> Annotation:
+    """Add the discriminator from an annotation to a type annotation which was
+    taken from it.
+
+    Args:
+        type_annotation (Annotation): The type annotation.
+        annotation (Annotation): The annotation the type was taken from.
+
+    Returns:
+        Annotation: The type annotation, annotated with the discriminator if
+            there was one.
+    """
+    if not is_any_discriminator_annotation(annotation):
+        return type_annotation
+    _, discriminator = get_discriminator_annotation(annotation)
+    return Annotated[type_annotation, discriminator]
+
+
 def get_typed_dict_key_default(td) -> Any:
     if is_any_default_annotation(td):
         _, default = get_default_annotation(td)
@@ -1,16 +1,26 @@
 """JSON Serialization"""
 
 from .annotations import JSONValue, JSONObject, JSONProperty, TypeSelector
+from .codec import Codec
 from .serialization import (
     serialize,
-    deserialize
+    serialize_bytes,
+    serialize_many,
+    deserialize,
+    deserialize_many
+)
+from .streaming import serialize_iter, deserialize_iter
+from .typed_serializer import (
+    compile_serializer,
+    serialize_typed,
+    serialize_typed_bytes
 )
-from .typed_serializer import serialize_typed
 from .typed_deserializer import (
+    compile_deserializer,
     from_json_value,
     deserialize_typed
 )
-from .untyped_serializer import serialize_untyped
+from .untyped_serializer import serialize_untyped, serialize_untyped_bytes
 from .untyped_deserializer import deserialize_untyped
 
 __all__ = [
@@ -19,11 +29,22 @@ __all__ = [
     'JSONProperty',
     'TypeSelector',
 
+    'Codec',
+    'compile_serializer',
+    'compile_deserializer',
+
     'serialize',
+    'serialize_bytes',
+    'serialize_iter',
+    'serialize_many',
     'deserialize',
+    'deserialize_iter',
+    'deserialize_many',
     'from_json_value',
     'serialize_typed',
+    'serialize_typed_bytes',
     'deserialize_typed',
     'serialize_untyped',
+    'serialize_untyped_bytes',
     'deserialize_untyped',
 ]
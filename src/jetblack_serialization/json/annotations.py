@@ -26,6 +26,16 @@ class JSONAnnotation(SerializationAnnotation):
     ) -> None:
         self.type_selector = type_selector
 
+    def __eq__(self, other: object) -> bool:
+        # Annotations with the same arguments compile to the same converters,
+        # so they can share a cache entry.
+        if not isinstance(other, JSONAnnotation):
+            return NotImplemented
+        return type(self) is type(other) and vars(self) == vars(other)
+
+    def __hash__(self) -> int:
+        return hash((type(self), tuple(vars(self).items())))
+
 
 class JSONValue(JSONAnnotation):
     """A JSON property"""
@@ -0,0 +1,150 @@
+"""A JSON codec for a type annotation"""
+
+from typing import Any
+
+from ..config import SerializerConfig, DEFAULT_CONFIG
+from ..types import Annotation
+
+from .encoding import (
+    JSONBytesEncoder,
+    JSONEncoder,
+    JSONDecoder,
+    DECODE_JSON,
+    make_json_bytes_encoder,
+    make_json_encoder,
+)
+from .typed_deserializer import Deserializer, get_deserializer
+from .typed_serializer import Serializer, get_serializer
+
+
+class Codec:
+    """A JSON codec for a type annotation.
+
+    The annotation is compiled once into a tree of converters, which are
+    reused for every value encoded or decoded.
+
+    ```python
+    from typing import TypedDict
+
+    from jetblack_serialization.json import Codec
+
+    class Book(TypedDict):
+        book_id: int
+        title: str
+
+    codec = Codec(Book)
+    text = codec.encode({'book_id': 42, 'title': 'Little Red Book'})
+    book = codec.decode(text)
+    ```
+    """
+
+    def __init__(
+            self,
+            annotation: Annotation,
+            config: SerializerConfig | None = None,
+            encode: JSONEncoder | None = None,
+            decode: JSONDecoder | None = None,
+            encode_bytes: JSONBytesEncoder | None = None,
+            compact: bool = False,
+            ensure_ascii: bool = True
+    ) -> None:
+        """Create a JSON codec.
+
+        Args:
+            annotation (Annotation): The type annotation.
+            config (SerializerConfig | None, optional): The serializer
+                configuration. Defaults to None.
+            encode (JSONEncoder | None, optional): The JSON encoder. Defaults
+                to None.
+            decode (JSONDecoder | None, optional): The JSON decoder. Defaults
+                to None.
+            encode_bytes (JSONBytesEncoder | None, optional): The JSON encoder
+                returning UTF-8 bytes. Defaults to None.
+            compact (bool, optional): If True the default encoders write no
+                whitespace after the separators. Defaults to False.
+            ensure_ascii (bool, optional): If False the default encoders write
+                non-ASCII characters as they are rather than escaped. Defaults
+                to True.
+        """
+        self.annotation = annotation
+        self.config = (config or DEFAULT_CONFIG).freeze()
+        self.encoder = encode or make_json_encoder(compact, ensure_ascii)
+        self.bytes_encoder = encode_bytes or make_json_bytes_encoder(
+            compact,
+            ensure_ascii
+        )
+        self.decoder = decode or DECODE_JSON
+        self._serializer: Serializer | None = None
+        self._deserializer: Deserializer | None = None
+
+    @property
+    def serializer(self) -> Serializer:
+        """The compiled function converting a Python object to a JSON value"""
+        if self._serializer is None:
+            self._serializer = get_serializer(self.annotation, self.config)
+        return self._serializer
+
+    @property
+    def deserializer(self) -> Deserializer:
+        """The compiled function converting a JSON value to a Python object"""
+        if self._deserializer is None:
+            self._deserializer = get_deserializer(self.annotation, self.config)
+        return self._deserializer
+
+    def to_json_value(self, obj: Any) -> Any:
+        """Convert a Python object to a JSON value.
+
+        Args:
+            obj (Any): The Python object.
+
+        Returns:
+            Any: The JSON value.
+        """
+        return self.serializer(obj)
+
+    def from_json_value(self, json_value: Any) -> Any:
+        """Convert a JSON value to a Python object.
+
+        Args:
+            json_value (Any): The JSON value.
+
+        Returns:
+            Any: The Python object.
+        """
+        return self.deserializer(json_value)
+
+    def encode(self, obj: Any) -> str:
+        """Serialize an object to JSON.
+
+        Args:
+            obj (Any): The object to serialize.
+
+        Returns:
+            str: The JSON string.
+        """
+        return self.encoder(self.serializer(obj))
+
+    def encode_bytes(self, obj: Any) -> bytes:
+        """Serialize an object to UTF-8 encoded JSON.
+
+        Args:
+            obj (Any): The object to serialize.
+
+        Returns:
+            bytes: The JSON bytes.
+        """
+        return self.bytes_encoder(self.serializer(obj))
+
+    def decode(self, text: str | bytes | bytearray) -> Any:
+        """Deserialize JSON to an object.
+
+        Args:
+            text (str | bytes | bytearray): The JSON string.
+
+        Returns:
+            Any: The deserialized object.
+        """
+        return self.deserializer(self.decoder(text))
+
+    def __repr__(self) -> str:
+        return f'Codec({self.annotation!r})'
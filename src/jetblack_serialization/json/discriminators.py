@@ -0,0 +1,164 @@
+"""Discriminated unions
+
+A union of typed dictionaries whose members share a literal field, such as
+`kind: Literal['trade']`, can select the member for a value with a single
+lookup on that field rather than trying each member in turn. The field is
+found by inspecting the members, or given explicitly with a `Discriminator`
+annotation.
+"""
+
+from dataclasses import dataclass
+from typing import Any, get_args, is_typeddict
+
+from ..config import SerializerConfig
+from ..custom_annotations import with_discriminator
+from ..types import Annotation
+from ..typing_ex import (
+    TypedDictFieldInfo,
+    get_unannotated,
+    is_literal,
+    resolve_type,
+    typeddict_keys,
+)
+
+from .annotations import (
+    JSONAnnotation,
+    JSONObject,
+    JSONProperty,
+    JSONValue,
+    is_json_annotation,
+    get_json_annotation,
+)
+
+# Only values which are the same in Python and JSON can be used, and bool is
+# excluded as it compares equal to 0 and 1.
+_DISCRIMINATOR_TYPES = (str, int)
+
+
+@dataclass
+class DiscriminatedUnion:
+    """The lookup table for a discriminated union"""
+
+    python_key: str
+    """The name of the discriminator field in Python"""
+    tag: str
+    """The name of the discriminator field in JSON"""
+    members: dict[Any, Annotation]
+    """The union member for each discriminator value"""
+
+
+def get_discriminated_json_annotation(
+        annotation: Annotation
+) -> tuple[Annotation, JSONAnnotation]:
+    """Get the type and JSON annotation of an annotated type, keeping any
+    discriminator with the type.
+
+    Args:
+        annotation (Annotation): The annotated type.
+
+    Returns:
+        tuple[Annotation, JSONAnnotation]: The type and the JSON annotation.
+    """
+    if not is_json_annotation(annotation):
+        return annotation, JSONValue()
+    type_annotation, json_annotation = get_json_annotation(annotation)
+    return with_discriminator(type_annotation, annotation), json_annotation
+
+
+def _get_tag(
+        python_key: str,
+        annotation: Annotation,
+        config: SerializerConfig
+) -> str:
+    if is_json_annotation(annotation):
+        _, json_annotation = get_json_annotation(annotation)
+        if isinstance(json_annotation, JSONProperty):
+            return json_annotation.tag
+        if (
+            isinstance(json_annotation, JSONObject) and
+            not json_annotation.is_serializable_keys
+        ):
+            return python_key
+    return config.serialize_key(python_key)
+
+
+def _make_discriminated_union(
+        python_key: str,
+        members: list[tuple[Annotation, dict[str, TypedDictFieldInfo]]],
+        config: SerializerConfig
+) -> DiscriminatedUnion | None:
+    tags: set[str] = set()
+    values: dict[Any, Annotation] = {}
+
+    for member, fields in members:
+        info = fields.get(python_key)
+        if info is None or not info.is_required:
+            return None
+        literal_annotation = get_unannotated(info.annotation)
+        if not is_literal(literal_annotation):
+            return None
+        for value in get_args(literal_annotation):
+            if type(value) not in _DISCRIMINATOR_TYPES or value in values:
+                return None
+            values[value] = member
+        tags.add(_get_tag(python_key, info.annotation, config))
+
+    if len(tags) != 1:
+        return None
+
+    return DiscriminatedUnion(python_key, tags.pop(), values)
+
+
+def find_discriminated_union(
+        union_annotation: Annotation,
+        python_key: str | None,
+        config: SerializerConfig
+) -> DiscriminatedUnion | None:
+    """Find the discriminator of a union of typed dictionaries.
+
+    Without a key the first field of the first member which is a required
+    literal in every member, with values which identify a single member, is
+    used.
+
+    Args:
+        union_annotation (Annotation): The union.
+        python_key (str | None): The name of the discriminator field, or None
+            to search for one.
+        config (SerializerConfig): The serializer configuration.
+
+    Raises:
+        TypeError: If a key was given but it does not discriminate the union.
+
+    Returns:
+        DiscriminatedUnion | None: The lookup table, or None if no
+            discriminator was found.
+    """
+    union_types = [resolve_type(t) for t in get_args(union_annotation)]
+    if not union_types or not all(is_typeddict(t) for t in union_types):
+        if python_key is not None:
+            raise TypeError(
+                f'Expected a union of typed dictionaries to discriminate on "{python_key}"'
+            )
+        return None
+
+    members = [(t, typeddict_keys(t)) for t in union_types]
+
+    if python_key is not None:
+        discriminated_union = _make_discriminated_union(
+            python_key,
+            members,
+            config
+        )
+        if discriminated_union is None:
+            raise TypeError(
+                f'Expected "{python_key}" to be a required literal field with distinct values'
+            )
+        return discriminated_union
+
+    _, first_fields = members[0]
+    for key in first_fields:
+        discriminated_union = _make_discriminated_union(key, members, config)
+        if discriminated_union is not None:
+            return discriminated_union
+
+    return None
@@ -2,12 +2,72 @@ import json
 from typing import Any, Callable
 
 type JSONEncoder = Callable[[Any], str]
+type JSONBytesEncoder = Callable[[Any], bytes]
 type JSONDecoder = Callable[[str | bytes | bytearray], Any]
 
+_COMPACT_SEPARATORS = (',', ':')
+
 
 def ENCODE_JSON(obj: Any) -> str:
     return json.dumps(obj)
 
 
+def ENCODE_JSON_BYTES(obj: Any) -> bytes:
+    return json.dumps(obj).encode('ascii')
+
+
 def DECODE_JSON(text: str | bytes | bytearray) -> Any:
     return json.loads(text)
+
+
+def make_json_encoder(
+        compact: bool = False,
+        ensure_ascii: bool = True
+) -> JSONEncoder:
+    """Make a JSON encoder returning a string.
+
+    Args:
+        compact (bool, optional): If True no whitespace is written after the
+            separators. Defaults to False.
+        ensure_ascii (bool, optional): If False non-ASCII characters are
+            written as they are rather than escaped. Defaults to True.
+
+    Returns:
+        JSONEncoder: The encoder.
+    """
+    if not compact and ensure_ascii:
+        return ENCODE_JSON
+
+    encoder = json.JSONEncoder(
+        ensure_ascii=ensure_ascii,
+        separators=_COMPACT_SEPARATORS if compact else None
+    )
+    return encoder.encode
+
+
+def make_json_bytes_encoder(
+        compact: bool = False,
+        ensure_ascii: bool = True
+) -> JSONBytesEncoder:
+    """Make a JSON encoder returning UTF-8 bytes.
+
+    Args:
+        compact (bool, optional): If True no whitespace is written after the
+            separators. Defaults to False.
+        ensure_ascii (bool, optional): If False non-ASCII characters are
+            written as they are rather than escaped. Defaults to True.
+
+    Returns:
+        JSONBytesEncoder: The encoder.
+    """
+    if not compact and ensure_ascii:
+        return ENCODE_JSON_BYTES
+
+    encode = make_json_encoder(compact, ensure_ascii)
+    # ASCII output needs no multi-byte encoding.
+    encoding = 'ascii' if ensure_ascii else 'utf-8'
+
+    def encode_bytes(obj: Any) -> bytes:
+        return encode(obj).encode(encoding)
+
+    return encode_bytes
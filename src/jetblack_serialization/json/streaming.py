@@ -0,0 +1,272 @@
+"""Streaming JSON serialization
+
+A list is serialized a batch of elements at a time, and deserialized an
+element at a time, so the converted values and the text of the whole list
+are never held at once.
+"""
+
+from codecs import getincrementaldecoder
+from itertools import batched
+from json import JSONDecodeError, JSONDecoder as _JSONDecoder
+import re
+from typing import IO, Any, Callable, Iterable, Iterator, get_args
+
+from ..config import SerializerConfig, DEFAULT_CONFIG
+from ..types import Annotation
+from ..typing_ex import is_list, resolve_type
+from ..utils import is_typed
+
+from .annotations import is_json_annotation, get_json_annotation
+from .encoding import JSONEncoder, ENCODE_JSON
+from .serialization import serialize
+from .typed_deserializer import get_deserializer
+from .typed_serializer import get_serializer
+from .untyped_deserializer import (
+    from_untyped_object as from_untyped_json_value
+)
+from .untyped_serializer import from_untyped_object
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_DELIMITERS = ',] \t\n\r'
+
+
+def _get_item_annotation(annotation: Annotation) -> Annotation | None:
+    type_annotation = resolve_type(annotation)
+    if is_json_annotation(type_annotation):
+        type_annotation, _json_annotation = get_json_annotation(
+            type_annotation
+        )
+    if not is_list(type_annotation):
+        return None
+
+    item_annotation, *_rest = get_args(type_annotation) or (Any,)
+    return item_annotation
+
+
+def _compile_item_serializer(
+        annotation: Annotation,
+        config: SerializerConfig
+) -> Callable[[Any], Any] | None:
+    if not is_typed(annotation):
+        return lambda item: from_untyped_object(item, config)
+
+    item_annotation = _get_item_annotation(annotation)
+    if item_annotation is None:
+        return None
+    return get_serializer(item_annotation, config)
+
+
+def _compile_item_deserializer(
+        annotation: Annotation,
+        config: SerializerConfig
+) -> Callable[[Any], Any]:
+    if not is_typed(annotation):
+        return lambda item: from_untyped_json_value(item, config)
+
+    item_annotation = _get_item_annotation(annotation)
+    if item_annotation is None:
+        raise TypeError(f'Expected a list annotation, found {annotation}')
+    return get_deserializer(item_annotation, config)
+
+
+def _read_text(fp: IO[Any], block_size: int) -> Iterator[str]:
+    decoder = None
+    while block := fp.read(block_size):
+        if isinstance(block, (bytes, bytearray)):
+            if decoder is None:
+                decoder = getincrementaldecoder('utf-8-sig')()
+            block = decoder.decode(block)
+        if block:
+            yield block
+    if decoder is not None and (block := decoder.decode(b'', final=True)):
+        yield block
+
+
+def serialize_iter(
+        obj: Iterable[Any],
+        annotation: Annotation,
+        config: SerializerConfig | None = None,
+        encode: JSONEncoder | None = None,
+        chunk_size: int = 1000,
+        separator: str = ', '
+) -> Iterator[str]:
+    """Serialize a list to JSON in chunks.
+
+    Each chunk holds up to `chunk_size` elements, which are converted and
+    encoded when the chunk is requested, so the elements can themselves be
+    produced lazily. The joined chunks are the same as the output of
+    `serialize`. Values which are not lists are returned in a single chunk.
+
+    ```python
+    with open('books.json', 'w', encoding='utf-8') as file:
+        file.writelines(serialize_iter(books, list[Book], config))
+    ```
+
+    Args:
+        obj (Iterable[Any]): The list, or an iterable of its elements.
+        annotation (Annotation): The type annotation of the list.
+        config (SerializerConfig | None, optional): The serializer
+            configuration. Defaults to None.
+        encode (JSONEncoder | None, optional): The JSON encoder used for each
+            element. Defaults to None.
+        chunk_size (int, optional): The number of elements in each chunk.
+            Defaults to 1000.
+        separator (str, optional): The separator between elements, which
+            should match the encoder. Defaults to ', '.
+
+    Raises:
+        ValueError: If the chunk size is less than one.
+
+    Yields:
+        str: The chunks of JSON text.
+    """
+    if chunk_size < 1:
+        raise ValueError('The chunk size must be at least one')
+
+    # The frozen config is captured, so a change to the config does not
+    # change the conversion part way through the stream.
+    config = (config or DEFAULT_CONFIG).freeze()
+    encode = encode or ENCODE_JSON
+
+    serialize_item = _compile_item_serializer(annotation, config)
+    if serialize_item is None or (
+        not is_typed(annotation) and
+        not isinstance(obj, list) and
+        _get_item_annotation(annotation) is None
+    ):
+        yield serialize(obj, annotation, config, encode)
+        return
+
+    prefix = '['
+    for items in batched(obj, chunk_size):
+        yield prefix + separator.join(
+            encode(serialize_item(item))
+            for item in items
+        )
+        prefix = separator
+    yield ']' if prefix == separator else '[]'
+
+
+def _deserialize_array(
+        fp: IO[Any],
+        deserialize_item: Callable[[Any], Any],
+        block_size: int
+) -> Iterator[Any]:
+    raw_decode = _JSONDecoder().raw_decode
+    blocks = _read_text(fp, block_size)
+
+    buffer = ''
+    pos = 0
+    is_eof = False
+
+    def read(size: int) -> None:
+        nonlocal buffer, pos, is_eof
+        # The text before the position has been consumed.
+        parts = [buffer[pos:]]
+        pos, remaining = 0, size
+        while remaining > 0:
+            block = next(blocks, None)
+            if block is None:
+                is_eof = True
+                break
+            parts.append(block)
+            remaining -= len(block)
+        buffer = ''.join(parts)
+
+    def skip_whitespace() -> bool:
+        nonlocal pos
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()  # type: ignore
+            if pos < len(buffer):
+                return True
+            if is_eof:
+                return False
+            read(block_size)
+
+    def expect(chars: str) -> str:
+        nonlocal pos
+        if not skip_whitespace():
+            raise JSONDecodeError('Unterminated array', buffer, pos)
+        char = buffer[pos]
+        if char not in chars:
+            expected = ' or '.join(f'"{c}"' for c in chars)
+            raise JSONDecodeError(f'Expecting {expected}', buffer, pos)
+        pos += 1
+        return char
+
+    def decode_item() -> Any:
+        nonlocal pos
+        while True:
+            try:
+                value, end = raw_decode(buffer, pos)
+            except JSONDecodeError:
+                if is_eof:
+                    raise
+                # The unread text is at least doubled, so a large element is
+                # only parsed a few times.
+                read(max(block_size, len(buffer) - pos))
+                continue
+            # A number may continue in the next block, even after a prefix
+            # which is a number itself, like "1." or "1e", so the value is
+            # only complete when a delimiter follows it.
+            if is_eof or (end < len(buffer) and buffer[end] in _DELIMITERS):
+                pos = end
+                return value
+            read(max(block_size, len(buffer) - pos))
+
+    expect('[')
+    if not skip_whitespace():
+        raise JSONDecodeError('Unterminated array', buffer, pos)
+    if buffer[pos] == ']':
+        pos += 1
+    else:
+        while True:
+            yield deserialize_item(decode_item())
+            if expect(',]') == ']':
+                break
+            if not skip_whitespace():
+                raise JSONDecodeError('Unterminated array', buffer, pos)
+
+    if skip_whitespace():
+        raise JSONDecodeError('Extra data', buffer, pos)
+
+
+def deserialize_iter(
+        fp: IO[str] | IO[bytes],
+        annotation: Annotation,
+        config: SerializerConfig | None = None,
+        block_size: int = 65536
+) -> Iterator[Any]:
+    """Deserialize the elements of a JSON array from a file.
+
+    The file is read in blocks, and each element is decoded and converted as
+    soon as it has been read, so the memory used is bounded by the largest
+    element rather than the whole document.
+
+    ```python
+    with open('books.json', 'rb') as file:
+        for book in deserialize_iter(file, list[Book], config):
+            print(book['title'])
+    ```
+
+    Args:
+        fp (IO[str] | IO[bytes]): The file, opened in text or binary mode. A
+            binary file must be UTF-8 encoded.
+        annotation (Annotation): The type annotation of the list.
+        config (SerializerConfig | None, optional): The serializer
+            configuration. Defaults to None.
+        block_size (int, optional): The size of the blocks read from the
+            file. Defaults to 65536.
+
+    Raises:
+        TypeError: If the annotation is not a list.
+        JSONDecodeError: If the file is not a JSON array.
+
+    Returns:
+        Iterator[Any]: The deserialized elements.
+    """
+    deserialize_item = _compile_item_deserializer(
+        annotation,
+        (config or DEFAULT_CONFIG).freeze()
+    )
+    return _deserialize_array(fp, deserialize_item, block_size)
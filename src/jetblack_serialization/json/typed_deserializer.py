@@ -1,4 +1,9 @@
-"""Typed JSON deserialization"""
+"""Typed JSON deserialization
+
+The annotation is compiled once into a tree of converter functions which
+take a JSON value and return a Python value. The compiled converters are
+cached by annotation and configuration.
+"""
 
 from decimal import Decimal
 from enum import Enum
@@ -6,14 +11,24 @@ from inspect import Parameter, isclass
 from types import NoneType
 from typing import (
     Any,
+    Callable,
     Union,
     cast,
     is_typeddict,
     get_args
 )
 
+from ..cache import ConfigCache
 from ..config import SerializerConfig, DEFAULT_CONFIG
-from ..custom_annotations import get_typed_dict_key_default
+from ..custom_annotations import (
+    get_default_annotation,
+    get_default_factory_annotation,
+    get_discriminator_annotation,
+    is_any_default_annotation,
+    is_any_default_factory_annotation,
+    is_any_discriminator_annotation,
+    with_discriminator,
+)
 from ..typing_ex import (
     get_unannotated,
     is_annotated,
@@ -27,7 +42,7 @@ from ..typing_ex import (
     typeddict_keys,
 )
 from ..types import Annotation
-from ..utils import is_value_type
+from ..utils import is_enum_by_value, is_value_type
 
 from .annotations import (
     JSONAnnotation,
@@ -37,131 +52,405 @@ from .annotations import (
     is_json_annotation,
     get_json_annotation
 )
+from .discriminators import (
+    find_discriminated_union,
+    get_discriminated_json_annotation,
+)
 from .encoding import JSONDecoder, DECODE_JSON
 from .untyped_deserializer import from_untyped_object
 
+type Deserializer = Callable[[Any], Any]
+type _Compiled = dict[Annotation, Deserializer]
 
-def _to_value(
-        json_value: Any,
+# The types of the values produced by the JSON decoder.
+JSON_TYPES: tuple[type, ...] = (str, int, float, bool, list, dict, NoneType)
+
+
+def _deferred_error(error: Exception) -> Deserializer:
+    # Errors found while compiling are raised when the value is deserialized,
+    # so unused branches of an annotation behave as they did when interpreted.
+    def deserialize(_json_value: Any) -> Any:
+        raise error.with_traceback(None)
+    return deserialize
+
+
+def _to_bool(text: str) -> bool:
+    return text.lower() == 'true'
+
+
+def _compile_enum(
+        enum_type: type[Enum],
+        config: SerializerConfig
+) -> Deserializer:
+    names: dict[str, Enum] = dict(enum_type.__members__)
+    # When serialized by value, names are still accepted.
+    values: dict[Any, Enum] = (
+        {member.value: member for member in enum_type}
+        if is_enum_by_value(enum_type, config) else
+        {}
+    )
+
+    def deserialize(json_value: Any) -> Any:
+        if isinstance(json_value, enum_type):
+            return json_value
+
+        if values:
+            member = values.get(json_value)
+            if member is not None:
+                return member
+
+        if isinstance(json_value, str):
+            return names[json_value]
+
+        raise TypeError(f'Unhandled type {enum_type}')
+
+    return deserialize
+
+
+def _compile_value(
         type_annotation: type,
         config: SerializerConfig,
-) -> Any:
-    if isinstance(json_value, type_annotation):
-        return json_value
+) -> Deserializer:
+    from_text: Callable[[str], Any] | None
+    if type_annotation is str:
+        from_text = str
+    elif type_annotation is int:
+        from_text = int
+    elif type_annotation is bool:
+        from_text = _to_bool
+    elif type_annotation is float:
+        from_text = float
+    elif type_annotation is Decimal:
+        from_text = Decimal
+    elif isclass(type_annotation) and issubclass(type_annotation, Enum):
+        return _compile_enum(type_annotation, config)
+    else:
+        from_text = config.value_deserializers.get(type_annotation)
 
-    if isinstance(json_value, str):
-        if type_annotation is str:
+    is_decimal = type_annotation is Decimal
+
+    def deserialize(json_value: Any) -> Any:
+        if isinstance(json_value, type_annotation):
             return json_value
-        elif type_annotation is int:
-            return int(json_value)
-        elif type_annotation is bool:
-            return json_value.lower() == 'true'
-        elif type_annotation is float:
-            return float(json_value)
-        elif type_annotation is Decimal:
+
+        if isinstance(json_value, str):
+            if from_text is not None:
+                return from_text(json_value)
+        elif is_decimal and isinstance(json_value, (int, float)):
             return Decimal(json_value)
-        elif isclass(type_annotation) and issubclass(type_annotation, Enum):
-            return type_annotation[json_value]
-        else:
-            deserializer = config.value_deserializers.get(type_annotation)
-            if deserializer is not None:
-                return deserializer(json_value)
-    elif isinstance(json_value, (int, float)) and type_annotation is Decimal:
-        return Decimal(json_value)
 
-    raise TypeError(f'Unhandled type {type_annotation}')
+        raise TypeError(f'Unhandled type {type_annotation}')
+
+    return deserialize
+
+
+def _is_value_json_type(
+        json_type: type,
+        type_annotation: type,
+        config: SerializerConfig
+) -> bool:
+    # Follows the conversions made by the deserializer from _compile_value.
+    return (
+        issubclass(json_type, type_annotation) or
+        (
+            json_type is str and (
+                type_annotation in (str, int, bool, float, Decimal) or
+                (isclass(type_annotation) and issubclass(type_annotation, Enum)) or
+                type_annotation in config.value_deserializers
+            )
+        ) or
+        (type_annotation is Decimal and issubclass(json_type, (int, float))) or
+        (
+            isclass(type_annotation) and
+            issubclass(type_annotation, Enum) and
+            is_enum_by_value(type_annotation, config) and
+            issubclass(json_type, int if issubclass(type_annotation, int) else str)
+        )
+    )
 
 
-def _to_optional(
-        json_obj: Any,
+def get_json_types(
         type_annotation: Annotation,
-        json_annotation: JSONAnnotation,
         config: SerializerConfig
-) -> Any:
-    if json_obj is None:
-        return None
+) -> frozenset[type] | None:
+    """Get the types of the JSON values which can be deserialized to a type.
+
+    Args:
+        type_annotation (Annotation): The type annotation.
+        config (SerializerConfig): The serializer configuration.
 
+    Returns:
+        frozenset[type] | None: The JSON value types, or None if any value
+            might be deserialized.
+    """
+    type_annotation = resolve_type(type_annotation)
+
+    if is_value_type(type_annotation, config.value_deserializers.keys()):
+        return frozenset(
+            json_type
+            for json_type in JSON_TYPES
+            if _is_value_json_type(json_type, type_annotation, config)
+        )
+    elif is_list(type_annotation):
+        return frozenset((list,))
+    elif is_typeddict(type_annotation) or is_dict(type_annotation):
+        return frozenset((dict,))
+    elif is_literal(type_annotation):
+        return frozenset(
+            json_type
+            for json_type in JSON_TYPES
+            for literal_type in {type(v) for v in get_args(type_annotation)}
+            if _is_value_json_type(json_type, literal_type, config)
+        )
+    elif is_union(type_annotation):
+        json_types: set[type] = set()
+        for union_type in get_args(type_annotation):
+            if union_type is NoneType:
+                json_types.add(NoneType)
+                continue
+            union_json_types = get_json_types(union_type, config)
+            if union_json_types is None:
+                return None
+            json_types |= union_json_types
+        return frozenset(json_types)
+
+    return None
+
+
+def _compile_optional(
+        type_annotation: Annotation,
+        json_annotation: JSONAnnotation,
+        config: SerializerConfig,
+        compiled: _Compiled,
+        discriminator_key: str | None = None
+) -> Deserializer:
     union_types = [t for t in get_args(type_annotation) if t is not NoneType]
-    union = (
-        union_types[0]
-        if len(union_types) == 1 else
-        Union[tuple(union_types)]
-    )
+    if len(union_types) == 1:
+        deserialize_value = _compile_any(
+            union_types[0],
+            json_annotation,
+            config,
+            compiled
+        )
+    else:
+        deserialize_value = _compile_union(
+            Union[tuple(union_types)],  # type: ignore
+            json_annotation,
+            config,
+            compiled,
+            discriminator_key
+        )
+
+    def deserialize(json_obj: Any) -> Any:
+        if json_obj is None:
+            return None
+        return deserialize_value(json_obj)
 
-    return _to_any(json_obj, union, json_annotation, config)
+    return deserialize
 
 
-def _to_list(
-        json_list: list,
+def _compile_list(
         list_annotation: Annotation,
-        config: SerializerConfig
-) -> list[Any]:
+        config: SerializerConfig,
+        compiled: _Compiled
+) -> Deserializer:
     type_annotation, *_rest = get_args(list_annotation)
     type_annotation = resolve_type(type_annotation)
 
     if is_annotated(type_annotation):
-        type_annotation, json_annotation = get_json_annotation(type_annotation)
+        type_annotation, json_annotation = get_discriminated_json_annotation(
+            type_annotation
+        )
     else:
         json_annotation = JSONValue()
 
-    return [
-        _to_any(
-            item,
+    deserialize_item = _compile_any(
+        type_annotation,
+        json_annotation,
+        config,
+        compiled
+    )
+
+    def deserialize(json_list: list) -> list[Any]:
+        return [deserialize_item(item) for item in json_list]
+
+    return deserialize
+
+
+def _compile_selected(
+        type_annotation: Annotation,
+        json_annotation: JSONAnnotation,
+        config: SerializerConfig,
+        compiled: _Compiled
+) -> Deserializer:
+    type_selector = json_annotation.type_selector
+    assert type_selector is not None
+    selected: dict[Annotation, Deserializer] = {}
+
+    def deserialize(json_obj: Any) -> Any:
+        element_type = type_selector(
+            json_obj,
             type_annotation,
-            json_annotation,
+            False,
             config
         )
-        for item in json_list
+        deserialize_element = selected.get(element_type)
+        if deserialize_element is None:
+            deserialize_element = selected[element_type] = _compile_any(
+                element_type,
+                json_annotation,
+                config,
+                compiled
+            )
+        return deserialize_element(json_obj)
+
+    return deserialize
+
+
+def _compile_trial_union(
+        type_annotation: Annotation,
+        json_annotation: JSONAnnotation,
+        config: SerializerConfig,
+        compiled: _Compiled
+) -> Deserializer:
+    item_type_annotations = get_args(type_annotation)
+    item_deserializers = [
+        _compile_any(
+            item_type_annotation,
+            json_annotation,
+            config,
+            compiled
+        )
+        for item_type_annotation in item_type_annotations
+    ]
+
+    # For each type of JSON value only the members which can deserialize it
+    # are tried, in the order of the union.
+    item_json_types = [
+        get_json_types(item_type_annotation, config)
+        for item_type_annotation in item_type_annotations
     ]
+    candidates = {
+        json_type: tuple(
+            deserialize_item
+            for deserialize_item, json_types in zip(
+                item_deserializers,
+                item_json_types
+            )
+            if json_types is None or json_type in json_types
+        )
+        for json_type in JSON_TYPES
+    }
+
+    def deserialize(json_obj: Any) -> Any:
+        for deserialize_item in candidates.get(
+                type(json_obj),
+                item_deserializers
+        ):
+            try:
+                return deserialize_item(json_obj)
+            except:  # pylint: disable=bare-except
+                pass
 
+        raise TypeError("Unable to deserialize union")
 
-def _to_union(
-        json_obj: Any,
+    return deserialize
+
+
+def _compile_union(
         type_annotation: Annotation,
         json_annotation: JSONAnnotation,
-        config: SerializerConfig
-) -> Any:
+        config: SerializerConfig,
+        compiled: _Compiled,
+        discriminator_key: str | None = None
+) -> Deserializer:
     if json_annotation.type_selector is not None:
-        element_type = json_annotation.type_selector(
-            json_obj,
+        return _compile_selected(
             type_annotation,
-            False,
-            config
+            json_annotation,
+            config,
+            compiled
         )
-        return _to_any(
-            json_obj,
-            element_type,
+
+    discriminated_union = find_discriminated_union(
+        type_annotation,
+        discriminator_key,
+        config
+    )
+    if discriminated_union is None:
+        return _compile_trial_union(
+            type_annotation,
             json_annotation,
-            config
+            config,
+            compiled
         )
 
-    for item_type_annotation in get_args(type_annotation):
-        try:
-            return _to_any(
-                json_obj,
-                item_type_annotation,
-                json_annotation,
-                config
+    tag = discriminated_union.tag
+    member_deserializers = {
+        value: _compile_any(member, json_annotation, config, compiled)
+        for value, member in discriminated_union.members.items()
+    }
+    # When the discriminator was found by inspecting the members, values it
+    # does not select are tried against each member as before.
+    deserialize_other = (
+        _compile_trial_union(type_annotation, json_annotation, config, compiled)
+        if discriminator_key is None else
+        None
+    )
+
+    def deserialize(json_obj: Any) -> Any:
+        if isinstance(json_obj, dict):
+            deserialize_member = member_deserializers.get(json_obj.get(tag))
+            if deserialize_member is not None:
+                return deserialize_member(json_obj)
+
+        if deserialize_other is None:
+            raise TypeError(
+                f'Unable to deserialize union with "{tag}" of {json_obj!r}'
             )
-        except:  # pylint: disable=bare-except
-            pass
+        return deserialize_other(json_obj)
 
-    raise TypeError("Unable to deserialize union")
+    return deserialize
 
 
-def _to_dict(
-        json_obj: dict[str, Any],
-        dict_annotation: Annotation,
+def _compile_discriminated(
+        annotation: Annotation,
         json_annotation: JSONAnnotation,
-        config: SerializerConfig
-) -> dict[str, Any]:
-    python_dict: dict[str, Any] = {}
+        config: SerializerConfig,
+        compiled: _Compiled
+) -> Deserializer:
+    type_annotation, discriminator = get_discriminator_annotation(annotation)
+    if is_optional(type_annotation):
+        return _compile_optional(
+            type_annotation,
+            json_annotation,
+            config,
+            compiled,
+            discriminator.key
+        )
+    elif is_union(type_annotation):
+        return _compile_union(
+            type_annotation,
+            json_annotation,
+            config,
+            compiled,
+            discriminator.key
+        )
+    raise TypeError(f'Expected a union for {discriminator!r}')
+
 
-    is_serializable_keys = (
+def _compile_dict(
+        dict_annotation: Annotation,
+        json_annotation: JSONAnnotation,
+        config: SerializerConfig,
+        compiled: _Compiled
+) -> Deserializer:
+    is_serializable_keys = config.has_key_deserializer and (
         True
         if not isinstance(json_annotation, (JSONObject, JSONProperty))
         else json_annotation.is_serializable_keys
     )
+    deserialize_tag = config.deserialize_key
 
     key_type_annotation, value_type_annotation = get_args(dict_annotation)
 
@@ -176,25 +465,38 @@ def _to_dict(
         key_json_annotation = JSONValue()
 
     if is_annotated(value_type_annotation):
-        value_type_annotation, value_json_annotation = get_json_annotation(
-            value_type_annotation
+        value_type_annotation, value_json_annotation = (
+            get_discriminated_json_annotation(value_type_annotation)
         )
     else:
         value_json_annotation = JSONValue()
 
-    for tag, json_value in json_obj.items():
-        key = _to_any(tag, key_type_annotation, key_json_annotation, config)
-        if is_serializable_keys and isinstance(tag, str):
-            key = config.deserialize_key(key)
+    deserialize_key = _compile_any(
+        key_type_annotation,
+        key_json_annotation,
+        config,
+        compiled
+    )
+    deserialize_value = _compile_any(
+        value_type_annotation,
+        value_json_annotation,
+        config,
+        compiled
+    )
 
-        python_dict[key] = _to_any(
-            json_value,
-            value_type_annotation,
-            value_json_annotation,
-            config
-        )
+    def deserialize(json_obj: dict[str, Any]) -> dict[str, Any]:
+        python_dict: dict[str, Any] = {}
 
-    return python_dict
+        for tag, json_value in json_obj.items():
+            key = deserialize_key(tag)
+            if is_serializable_keys and isinstance(tag, str):
+                key = deserialize_tag(key)
+
+            python_dict[key] = deserialize_value(json_value)
+
+        return python_dict
+
+    return deserialize
 
 
 def _to_tag(python_key: str, config: SerializerConfig) -> str:
@@ -234,7 +536,7 @@ def _get_json_annotated_key(
     else:
         raise TypeError("Must be a property")
 
-    return type_annotation, json_property
+    return with_discriminator(type_annotation, annotation), json_property
 
 
 def _get_json_unannotated_key(
@@ -243,7 +545,10 @@ def _get_json_unannotated_key(
         config: SerializerConfig
 ) -> tuple[type[Any], JSONProperty]:
     json_property = JSONProperty(_to_tag(python_key, config))
-    type_annotation = get_unannotated(annotation)
+    type_annotation = with_discriminator(
+        get_unannotated(annotation),
+        annotation
+    )
     return type_annotation, json_property
 
 
@@ -258,151 +563,255 @@ def _get_key_annotation(
     return _get_json_unannotated_key(python_key, annotation, config)
 
 
-def _to_typed_dict(
-        json_obj: dict[str, Any],
+def _get_default_factory(
+        annotation: Annotation
+) -> Callable[[], Any] | None:
+    # A default value is returned as is, while a default factory is called for
+    # each object deserialized.
+    if is_any_default_annotation(annotation):
+        _, default = get_default_annotation(annotation)
+        value = default.value
+        return lambda: value
+    elif is_any_default_factory_annotation(annotation):
+        _, default_factory = get_default_factory_annotation(annotation)
+        return default_factory.factory
+    return None
+
+
+def _compile_typed_dict(
         dict_annotation: Annotation,
-        config: SerializerConfig
-) -> dict[str, Any]:
-    python_dict: dict[str, Any] = {}
+        config: SerializerConfig,
+        compiled: _Compiled
+) -> Deserializer:
+    # (python_key, tag, default_factory, is_optional, is_required, deserialize)
+    fields: list[
+        tuple[
+            str,
+            str,
+            Callable[[], Any] | None,
+            bool,
+            bool,
+            Deserializer
+        ]
+    ] = []
+
+    def deserialize(json_obj: dict[str, Any]) -> dict[str, Any]:
+        python_dict: dict[str, Any] = {}
+
+        for (
+            python_key,
+            tag,
+            default_factory,
+            is_optional_value,
+            is_required,
+            deserialize_value
+        ) in fields:
+            if tag in json_obj:
+                python_dict[python_key] = deserialize_value(json_obj[tag])
+            elif default_factory is not None:
+                python_dict[python_key] = deserialize_value(default_factory())
+            elif is_optional_value:
+                python_dict[python_key] = None
+            elif is_required:
+                raise KeyError(f'Required key "{tag}" is missing')
+
+        return python_dict
+
+    # Register the deserializer before compiling the fields to support
+    # recursive types.
+    compiled[dict_annotation] = deserialize
 
     typed_dict_keys = typeddict_keys(dict_annotation)
     assert typed_dict_keys is not None
     for python_key, info in typed_dict_keys.items():
-        default = get_typed_dict_key_default(info.annotation)
         item_annotation, json_property = _get_key_annotation(
             python_key,
             info.annotation,
             config
         )
-
-        if json_property.tag in json_obj:
-            python_dict[python_key] = _to_any(
-                json_obj[json_property.tag],
-                item_annotation,
-                json_property,
-                config
-            )
-        elif default is not Parameter.empty:
-            python_dict[python_key] = _to_any(
-                default,
-                item_annotation,
-                json_property,
-                config
-            )
-        elif is_optional(item_annotation):
-            python_dict[python_key] = None
-        elif info.is_required:
-            raise KeyError(
-                f'Required key "{json_property.tag}" is missing'
+        fields.append(
+            (
+                python_key,
+                json_property.tag,
+                _get_default_factory(info.annotation),
+                is_optional(get_unannotated(item_annotation)),
+                info.is_required,
+                _compile_any(
+                    item_annotation,
+                    json_property,
+                    config,
+                    compiled
+                )
             )
+        )
 
-    return python_dict
+    return deserialize
 
 
-def _to_literal(
-        json_value: Any,
+def _compile_literal(
         type_annotation: Annotation,
         json_annotation: JSONAnnotation,
-        config: SerializerConfig
-) -> Any:
+        config: SerializerConfig,
+        compiled: _Compiled
+) -> Deserializer:
     literal_values = get_args(type_annotation)
-    literal_types = {type(v) for v in literal_values}
-    for literal_type in literal_types:
-        try:
-            result = _to_any(
-                json_value,
-                literal_type,
-                json_annotation,
-                config
+    literal_deserializers = [
+        _compile_any(
+            literal_type,
+            json_annotation,
+            config,
+            compiled
+        )
+        for literal_type in {type(v) for v in literal_values}
+    ]
+    # The literal value for a JSON value is found with one lookup. The type is
+    # part of the key as True == 1 == 1.0. Enums are keyed by both their
+    # JSON value and themselves.
+    canonical_values: dict[tuple[type, Any], Any] = {}
+    for value in literal_values:
+        canonical_values.setdefault((type(value), value), value)
+        if isinstance(value, Enum):
+            json_value = (
+                value.value
+                if is_enum_by_value(type(value), config) else
+                value.name
             )
-            if result in literal_values:
-                return result
-        except:  # pylint: disable=bare-except
-            pass
+            canonical_values.setdefault((type(json_value), json_value), value)
+    strict_literals = config.strict_literals
 
-    raise ValueError(f'Value {json_value} not in Literal{literal_values}')
+    def deserialize(json_value: Any) -> Any:
+        value = canonical_values.get(
+            (type(json_value), json_value),
+            Parameter.empty
+        )
+        if value is not Parameter.empty:
+            return value
 
+        if strict_literals:
+            raise ValueError(
+                f'Value {json_value} not in Literal{literal_values}'
+            )
 
-def _to_any(
-        json_value: Any,
+        for deserialize_literal in literal_deserializers:
+            try:
+                result = deserialize_literal(json_value)
+                if result in literal_values:
+                    return result
+            except:  # pylint: disable=bare-except
+                pass
+
+        raise ValueError(f'Value {json_value} not in Literal{literal_values}')
+
+    return deserialize
+
+
+def _compile_untyped(config: SerializerConfig) -> Deserializer:
+    def deserialize(json_value: Any) -> Any:
+        return from_untyped_object(json_value, config)
+    return deserialize
+
+
+def _compile_type(
         type_annotation: Annotation,
         json_annotation: JSONAnnotation,
-        config: SerializerConfig
-) -> Any:
+        config: SerializerConfig,
+        compiled: _Compiled
+) -> Deserializer:
     type_annotation = resolve_type(type_annotation)
 
-    if is_value_type(type_annotation, config.value_deserializers.keys()):
-        return _to_value(
-            json_value,
+    if is_any_discriminator_annotation(type_annotation):
+        return _compile_discriminated(
             type_annotation,
-            config
+            json_annotation,
+            config,
+            compiled
         )
+    elif is_value_type(type_annotation, config.value_deserializers.keys()):
+        return _compile_value(type_annotation, config)
     elif is_optional(type_annotation):
-        return _to_optional(
-            json_value,
+        return _compile_optional(
             type_annotation,
             json_annotation,
-            config
+            config,
+            compiled
         )
     elif is_list(type_annotation):
-        return _to_list(
-            json_value,
-            type_annotation,
-            config
-        )
+        return _compile_list(type_annotation, config, compiled)
     elif is_typeddict(type_annotation):
-        return _to_typed_dict(
-            json_value,
-            type_annotation,
-            config
-        )
+        deserializer = compiled.get(type_annotation)
+        if deserializer is not None:
+            return deserializer
+        return _compile_typed_dict(type_annotation, config, compiled)
     elif is_union(type_annotation):
-        return _to_union(
-            json_value,
+        return _compile_union(
             type_annotation,
             json_annotation,
-            config
+            config,
+            compiled
         )
     elif is_dict(type_annotation):
-        return _to_dict(
-            json_value,
+        return _compile_dict(
             type_annotation,
             json_annotation,
-            config
+            config,
+            compiled
         )
     elif is_literal(type_annotation):
-        return _to_literal(
-            json_value,
+        return _compile_literal(
             type_annotation,
             json_annotation,
-            config
+            config,
+            compiled
         )
     elif is_any(type_annotation):
-        return from_untyped_object(json_value, config)
+        return _compile_untyped(config)
     else:
         raise TypeError
 
 
-def from_json_value(
-        json_value: Any,
-        annotation: Annotation,
+def _compile_any(
+        type_annotation: Annotation,
+        json_annotation: JSONAnnotation,
         config: SerializerConfig,
-) -> Any:
-    """Convert from a json value
+        compiled: _Compiled
+) -> Deserializer:
+    try:
+        return _compile_type(
+            type_annotation,
+            json_annotation,
+            config,
+            compiled
+        )
+    except Exception as error:  # pylint: disable=broad-exception-caught
+        return _deferred_error(error)
+
+
+def compile_deserializer(
+        annotation: Annotation,
+        config: SerializerConfig | None = None
+) -> Deserializer:
+    """Compile an annotation to a function which converts a JSON value to a
+    Python object.
+
+    The type introspection is performed once, when the annotation is
+    compiled.
 
     Args:
-        json_value (Any): The JSON value
-        annotation (Annotation): The type annotation
-        config (SerializerConfig): The serializer configuration
+        annotation (Annotation): The type annotation.
+        config (SerializerConfig | None, optional): The serializer
+            configuration. Defaults to None.
 
     Raises:
-        TypeError: If the value cannot be deserialized to the type
+        TypeError: If the root annotation is not a JSONValue.
 
     Returns:
-        Any: The deserialized value
+        Deserializer: A function taking a JSON value and returning a Python
+            object.
     """
     if is_json_annotation(annotation):
-        type_annotation, json_annotation = get_json_annotation(annotation)
+        type_annotation, json_annotation = get_discriminated_json_annotation(
+            annotation
+        )
         if not isinstance(json_annotation, JSONValue):
             raise TypeError(
                 "Expected the root value to have a JSONValue annotation"
@@ -410,14 +819,57 @@ def from_json_value(
     else:
         type_annotation, json_annotation = annotation, JSONValue()
 
-    return _to_any(
-        json_value,
+    return _compile_any(
         type_annotation,
         json_annotation,
-        config
+        (config or DEFAULT_CONFIG).freeze(),
+        {}
     )
 
 
+_DESERIALIZERS = ConfigCache(compile_deserializer)
+
+
+def get_deserializer(
+        annotation: Annotation,
+        config: SerializerConfig | None = None
+) -> Deserializer:
+    """Get the compiled deserializer for an annotation from the cache,
+    compiling it if necessary.
+
+    Args:
+        annotation (Annotation): The type annotation.
+        config (SerializerConfig | None, optional): The serializer
+            configuration. Defaults to None.
+
+    Returns:
+        Deserializer: A function taking a JSON value and returning a Python
+            object.
+    """
+    return _DESERIALIZERS.get(annotation, config or DEFAULT_CONFIG)
+
+
+def from_json_value(
+        json_value: Any,
+        annotation: Annotation,
+        config: SerializerConfig,
+) -> Any:
+    """Convert from a json value
+
+    Args:
+        json_value (Any): The JSON value
+        annotation (Annotation): The type annotation
+        config (SerializerConfig): The serializer configuration
+
+    Raises:
+        TypeError: If the value cannot be deserialized to the type
+
+    Returns:
+        Any: The deserialized value
+    """
+    return get_deserializer(annotation, config)(json_value)
+
+
 def deserialize_typed(
         text: Union[str, bytes, bytearray],
         annotation: Annotation,
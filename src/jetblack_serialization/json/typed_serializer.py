@@ -1,14 +1,27 @@
-"""Typed JSON serialization"""
+"""Typed JSON serialization
+
+The annotation is compiled once into a tree of converter functions which
+take a Python value and return a JSON value. The compiled converters are
+cached by annotation and configuration.
+"""
 
 from decimal import Decimal
 from enum import Enum
-from inspect import Parameter
+from inspect import Parameter, isclass
+from operator import attrgetter
 from types import NoneType
-from typing import Any, Type, Union, cast, get_args, is_typeddict
+from typing import Any, Callable, Type, Union, cast, get_args, is_typeddict
 
+from ..cache import ConfigCache
 from ..config import SerializerConfig, DEFAULT_CONFIG
+from ..custom_annotations import (
+    get_discriminator_annotation,
+    is_any_discriminator_annotation,
+    with_discriminator,
+)
 from ..types import Annotation
 from ..typing_ex import (
+    get_unannotated,
     is_annotated,
     is_any,
     is_dict,
@@ -19,7 +32,7 @@ from ..typing_ex import (
     resolve_type,
     typeddict_keys,
 )
-from ..utils import is_value_type
+from ..utils import has_value_serializer, is_enum_by_value, is_value_type
 
 from .annotations import (
     JSONAnnotation,
@@ -29,116 +42,257 @@ from .annotations import (
     is_json_annotation,
     get_json_annotation
 )
-from .encoding import JSONEncoder, ENCODE_JSON
+from .discriminators import (
+    find_discriminated_union,
+    get_discriminated_json_annotation,
+)
+from .encoding import (
+    JSONBytesEncoder,
+    JSONEncoder,
+    ENCODE_JSON,
+    ENCODE_JSON_BYTES,
+)
 from .untyped_serializer import from_untyped_object
 
+type Serializer = Callable[[Any], Any]
+type _Compiled = dict[Annotation, Serializer]
 
-def _from_value(
-        python_value: Any,
+
+def _identity(python_value: Any) -> Any:
+    return python_value
+
+
+def _deferred_error(error: Exception) -> Serializer:
+    # Errors found while compiling are raised when the value is serialized, so
+    # unused branches of an annotation behave as they did when interpreted.
+    def serialize(_python_value: Any) -> Any:
+        raise error.with_traceback(None)
+    return serialize
+
+
+def _compile_value(
         type_annotation: Type,
         config: SerializerConfig
-) -> Any:
-    if type_annotation is str:
-        return python_value
-    elif type_annotation is int:
-        return python_value
-    elif type_annotation is bool:
-        return python_value
-    elif type_annotation is float:
-        return python_value
+) -> Serializer:
+    if type_annotation in (str, int, bool, float):
+        return _identity
     elif type_annotation is Decimal:
-        return float(python_value)
-    elif isinstance(python_value, Enum):
-        return python_value.name
+        return float
+    elif isclass(type_annotation) and issubclass(type_annotation, Enum):
+        # The member attributes are read directly, as the name and value
+        # properties are much slower.
+        return attrgetter(
+            '_value_'
+            if is_enum_by_value(type_annotation, config) else
+            '_name_'
+        )
     else:
-        serializer = config.value_serializers.get(type_annotation)
+        serializer = config.get_value_serializer(type_annotation)
         if serializer is not None:
-            return serializer(python_value)
+            return serializer
 
     raise TypeError(f'Unhandled type {type_annotation}')
 
 
-def _from_optional(
-        python_value: Any,
+def _compile_optional(
         type_annotation: Annotation,
         json_annotation: JSONAnnotation,
-        config: SerializerConfig
-) -> Any:
-    if python_value is None:
-        return None
-
+        config: SerializerConfig,
+        compiled: _Compiled,
+        discriminator_key: str | None = None
+) -> Serializer:
     union_types = [t for t in get_args(type_annotation) if t is not NoneType]
     if len(union_types) == 1:
-        return from_json_value(
-            python_value,
+        serialize_value = _compile_json_value(
             union_types[0],
             json_annotation,
-            config
+            config,
+            compiled
+        )
+    else:
+        serialize_value = _compile_union(
+            Union[tuple(union_types)],  # type: ignore
+            json_annotation,
+            config,
+            compiled,
+            discriminator_key
         )
 
-    return _from_union(
-        python_value,
-        Union[tuple(union_types)],  # type: ignore
-        json_annotation,
-        config
-    )
+    def serialize(python_value: Any) -> Any:
+        if python_value is None:
+            return None
+        return serialize_value(python_value)
 
+    return serialize
 
-def _from_union(
-        python_value: Any,
+
+def _compile_selected(
         type_annotation: Annotation,
         json_annotation: JSONAnnotation,
-        config: SerializerConfig
-) -> Any:
-    if json_annotation.type_selector is not None:
-        element_type = json_annotation.type_selector(
+        config: SerializerConfig,
+        compiled: _Compiled
+) -> Serializer:
+    type_selector = json_annotation.type_selector
+    assert type_selector is not None
+    selected: dict[Annotation, Serializer] = {}
+
+    def serialize(python_value: Any) -> Any:
+        element_type = type_selector(
             python_value,
             type_annotation,
             True,
             config
         )
-        return from_json_value(
-            python_value,
+        serialize_element = selected.get(element_type)
+        if serialize_element is None:
+            serialize_element = selected[element_type] = _compile_json_value(
+                element_type,
+                json_annotation,
+                config,
+                compiled
+            )
+        return serialize_element(python_value)
+
+    return serialize
+
+
+def _compile_trial_union(
+        type_annotation: Annotation,
+        json_annotation: JSONAnnotation,
+        config: SerializerConfig,
+        compiled: _Compiled
+) -> Serializer:
+    element_serializers = [
+        _compile_json_value(
             element_type,
             json_annotation,
-            config
+            config,
+            compiled
         )
+        for element_type in get_args(type_annotation)
+    ]
 
-    for element_type in get_args(type_annotation):
-        try:
-            return from_json_value(
-                python_value,
-                element_type,
-                json_annotation,
-                config
+    def serialize(python_value: Any) -> Any:
+        for serialize_element in element_serializers:
+            try:
+                return serialize_element(python_value)
+            except:  # pylint: disable=bare-except
+                pass
+
+        raise TypeError("Unable to serialize union")
+
+    return serialize
+
+
+def _compile_union(
+        type_annotation: Annotation,
+        json_annotation: JSONAnnotation,
+        config: SerializerConfig,
+        compiled: _Compiled,
+        discriminator_key: str | None = None
+) -> Serializer:
+    if json_annotation.type_selector is not None:
+        return _compile_selected(
+            type_annotation,
+            json_annotation,
+            config,
+            compiled
+        )
+
+    discriminated_union = find_discriminated_union(
+        type_annotation,
+        discriminator_key,
+        config
+    )
+    if discriminated_union is None:
+        return _compile_trial_union(
+            type_annotation,
+            json_annotation,
+            config,
+            compiled
+        )
+
+    python_key = discriminated_union.python_key
+    member_serializers = {
+        value: _compile_json_value(member, json_annotation, config, compiled)
+        for value, member in discriminated_union.members.items()
+    }
+    # When the discriminator was found by inspecting the members, values it
+    # does not select are tried against each member as before.
+    serialize_other = (
+        _compile_trial_union(type_annotation, json_annotation, config, compiled)
+        if discriminator_key is None else
+        None
+    )
+
+    def serialize(python_value: Any) -> Any:
+        if isinstance(python_value, dict):
+            serialize_member = member_serializers.get(
+                python_value.get(python_key)
             )
-        except:  # pylint: disable=bare-except
-            pass
+            if serialize_member is not None:
+                return serialize_member(python_value)
+
+        if serialize_other is None:
+            raise TypeError(
+                f'Unable to serialize union with "{python_key}" of {python_value!r}'
+            )
+        return serialize_other(python_value)
 
-    raise TypeError("Unable to serialize union")
+    return serialize
 
 
-def _from_list(
-        python_list: list,
+def _compile_discriminated(
+        annotation: Annotation,
+        json_annotation: JSONAnnotation,
+        config: SerializerConfig,
+        compiled: _Compiled
+) -> Serializer:
+    type_annotation, discriminator = get_discriminator_annotation(annotation)
+    if is_optional(type_annotation):
+        return _compile_optional(
+            type_annotation,
+            json_annotation,
+            config,
+            compiled,
+            discriminator.key
+        )
+    elif is_union(type_annotation):
+        return _compile_union(
+            type_annotation,
+            json_annotation,
+            config,
+            compiled,
+            discriminator.key
+        )
+    raise TypeError(f'Expected a union for {discriminator!r}')
+
+
+def _compile_list(
         list_annotation: Annotation,
-        config: SerializerConfig
-) -> Any:
+        config: SerializerConfig,
+        compiled: _Compiled
+) -> Serializer:
     type_annotation, *_rest = get_args(list_annotation)
     type_annotation = resolve_type(type_annotation)
     if is_annotated(type_annotation):
-        type_annotation, json_annotation = get_json_annotation(type_annotation)
+        type_annotation, json_annotation = get_discriminated_json_annotation(
+            type_annotation
+        )
     else:
         json_annotation = JSONValue()
 
-    return [
-        from_json_value(
-            item,
-            type_annotation,
-            json_annotation,
-            config
-        )
-        for item in python_list
-    ]
+    serialize_item = _compile_json_value(
+        type_annotation,
+        json_annotation,
+        config,
+        compiled
+    )
+
+    def serialize(python_list: list) -> list:
+        return [serialize_item(item) for item in python_list]
+
+    return serialize
 
 
 def _to_tag(python_key: str, config: SerializerConfig) -> str:
@@ -177,7 +331,7 @@ def _get_json_annotated_key(
     else:
         raise TypeError("must be a property")
 
-    return type_annotation, json_annotation
+    return with_discriminator(type_annotation, annotation), json_annotation
 
 
 def _get_json_unannotated_key(
@@ -185,8 +339,12 @@ def _get_json_unannotated_key(
         annotation: Annotation,
         config: SerializerConfig
 ) -> tuple[Annotation, JSONProperty]:
-    tag = _to_tag(python_key, config)
-    return annotation, JSONProperty(tag)
+    json_property = JSONProperty(_to_tag(python_key, config))
+    type_annotation = with_discriminator(
+        get_unannotated(annotation),
+        annotation
+    )
+    return type_annotation, json_property
 
 
 def _get_annotated_key(
@@ -200,12 +358,29 @@ def _get_annotated_key(
     return _get_json_unannotated_key(python_key, annotation, config)
 
 
-def _from_typed_dict(
-        python_dict: dict,
+def _compile_typed_dict(
         dict_annotation: Annotation,
-        config: SerializerConfig
-) -> dict:
-    json_obj: dict[str, Any] = {}
+        config: SerializerConfig,
+        compiled: _Compiled
+) -> Serializer:
+    # (python_key, tag, default, is_required, serialize_value)
+    fields: list[tuple[str, str, Any, bool, Serializer]] = []
+
+    def serialize(python_dict: dict) -> dict:
+        json_obj: dict[str, Any] = {}
+
+        for python_key, tag, default, is_required, serialize_value in fields:
+            json_value = python_dict.get(python_key, default)
+            if json_value is not Parameter.empty:
+                json_obj[tag] = serialize_value(json_value)
+            elif is_required:
+                raise KeyError(f'Missing required property {python_key}')
+
+        return json_obj
+
+    # Register the serializer before compiling the fields to support recursive
+    # types.
+    compiled[dict_annotation] = serialize
 
     typed_dict_keys = typeddict_keys(dict_annotation)
     for python_key, info in typed_dict_keys.items():
@@ -215,34 +390,36 @@ def _from_typed_dict(
             info.annotation,
             config
         )
-
-        json_value = python_dict.get(python_key, default)
-        if json_value is not Parameter.empty:
-            json_obj[json_property.tag] = from_json_value(
-                json_value,
-                item_annotation,
-                json_property,
-                config
+        fields.append(
+            (
+                python_key,
+                json_property.tag,
+                default,
+                info.is_required,
+                _compile_json_value(
+                    item_annotation,
+                    json_property,
+                    config,
+                    compiled
+                )
             )
-        elif info.is_required:
-            raise KeyError(f'Missing required property {python_key}')
+        )
 
-    return json_obj
+    return serialize
 
 
-def _from_dict(
-        python_dict: dict,
+def _compile_dict(
         dict_annotation: Annotation,
         json_annotation: JSONAnnotation,
-        config: SerializerConfig
-) -> dict:
-    json_obj: dict[str, Any] = {}
-
-    is_serializable_keys = (
+        config: SerializerConfig,
+        compiled: _Compiled
+) -> Serializer:
+    is_serializable_keys = config.has_key_serializer and (
         True
         if not isinstance(json_annotation, (JSONObject, JSONProperty))
         else json_annotation.is_serializable_keys
     )
+    serialize_tag = config.serialize_key
 
     key_type_annotation, value_type_annotation = get_args(dict_annotation)
 
@@ -257,119 +434,276 @@ def _from_dict(
         key_json_annotation = JSONValue()
 
     if is_annotated(value_type_annotation):
-        value_type_annotation, value_json_annotation = get_json_annotation(
-            value_type_annotation
+        value_type_annotation, value_json_annotation = (
+            get_discriminated_json_annotation(value_type_annotation)
         )
     else:
         value_json_annotation = JSONValue()
 
-    for key, item in python_dict.items():
-        tag = from_json_value(
-            key,
-            key_type_annotation,
-            key_json_annotation,
-            config
-        )
-        if is_serializable_keys and isinstance(key, str):
-            tag = config.serialize_key(tag)
+    serialize_key = _compile_json_value(
+        key_type_annotation,
+        key_json_annotation,
+        config,
+        compiled
+    )
+    serialize_value = _compile_json_value(
+        value_type_annotation,
+        value_json_annotation,
+        config,
+        compiled
+    )
 
-        json_obj[tag] = from_json_value(
-            item,
-            value_type_annotation,
-            value_json_annotation,
-            config
-        )
+    def serialize(python_dict: dict) -> dict:
+        json_obj: dict[str, Any] = {}
 
-    return json_obj
+        for key, item in python_dict.items():
+            tag = serialize_key(key)
+            if is_serializable_keys and isinstance(key, str):
+                tag = serialize_tag(tag)
 
+            json_obj[tag] = serialize_value(item)
 
-def _from_literal(
-        python_value: Any,
+        return json_obj
+
+    return serialize
+
+
+def _compile_literal(
         type_annotation: Annotation,
         json_annotation: JSONAnnotation,
-        config: SerializerConfig
-) -> Any:
+        config: SerializerConfig,
+        compiled: _Compiled
+) -> Serializer:
     literal_values = get_args(type_annotation)
-    literal_types = {type(v) for v in literal_values}
-    for literal_type in literal_types:
+    literal_serializers = {
+        literal_type: _compile_json_value(
+            literal_type,
+            json_annotation,
+            config,
+            compiled
+        )
+        for literal_type in {type(v) for v in literal_values}
+    }
+    # The JSON value of each literal value is found with one lookup. The type
+    # is part of the key as True == 1 == 1.0.
+    json_values: dict[tuple[type, Any], Any] = {}
+    for value in literal_values:
         try:
-            result = from_json_value(
-                python_value,
-                literal_type,
-                json_annotation,
-                config
-            )
-            if result in literal_values:
-                return result
-        except:  # pylint: disable=bare-except
+            json_values[(type(value), value)] = literal_serializers[
+                type(value)
+            ](value)
+        except Exception:  # pylint: disable=broad-exception-caught
             pass
+    strict_literals = config.strict_literals
 
-    raise ValueError(f'Value {python_value} not in Literal{literal_values}')
+    def serialize(python_value: Any) -> Any:
+        json_value = json_values.get(
+            (type(python_value), python_value),
+            Parameter.empty
+        )
+        if json_value is not Parameter.empty:
+            return json_value
 
+        if strict_literals:
+            raise ValueError(
+                f'Value {python_value} not in Literal{literal_values}'
+            )
 
-def from_json_value(
-        python_value: Any,
+        for serialize_literal in literal_serializers.values():
+            try:
+                result = serialize_literal(python_value)
+                if result in literal_values:
+                    return result
+            except:  # pylint: disable=bare-except
+                pass
+
+        raise ValueError(
+            f'Value {python_value} not in Literal{literal_values}'
+        )
+
+    return serialize
+
+
+def _compile_any(config: SerializerConfig) -> Serializer:
+    def serialize(python_value: Any) -> Any:
+        return from_untyped_object(python_value, config)
+    return serialize
+
+
+def _compile_type(
         type_annotation: Annotation,
         json_annotation: JSONAnnotation,
-        config: SerializerConfig
-) -> Any:
+        config: SerializerConfig,
+        compiled: _Compiled
+) -> Serializer:
     type_annotation = resolve_type(type_annotation)
 
-    if is_value_type(type_annotation, config.value_serializers.keys()):
-        return _from_value(
-            python_value,
+    if is_any_discriminator_annotation(type_annotation):
+        return _compile_discriminated(
             type_annotation,
-            config
+            json_annotation,
+            config,
+            compiled
         )
+    elif (
+        is_value_type(type_annotation) or
+        has_value_serializer(type_annotation, config)
+    ):
+        return _compile_value(type_annotation, config)
     elif is_optional(type_annotation):
-        return _from_optional(
-            python_value,
+        return _compile_optional(
             type_annotation,
             json_annotation,
-            config
+            config,
+            compiled
         )
     elif is_list(type_annotation):
-        return _from_list(
-            python_value,
-            type_annotation,
-            config
-        )
+        return _compile_list(type_annotation, config, compiled)
     elif is_typeddict(type_annotation):
-        return _from_typed_dict(
-            python_value,
-            type_annotation,
-            config
-        )
+        serializer = compiled.get(type_annotation)
+        if serializer is not None:
+            return serializer
+        return _compile_typed_dict(type_annotation, config, compiled)
     elif is_union(type_annotation):
-        return _from_union(
-            python_value,
+        return _compile_union(
             type_annotation,
             json_annotation,
-            config
+            config,
+            compiled
         )
     elif is_dict(type_annotation):
-        return _from_dict(
-            python_value,
+        return _compile_dict(
             type_annotation,
             json_annotation,
-            config
+            config,
+            compiled
         )
     elif is_literal(type_annotation):
-        return _from_literal(
-            python_value,
+        return _compile_literal(
             type_annotation,
             json_annotation,
-            config
+            config,
+            compiled
         )
     elif is_any(type_annotation):
-        return from_untyped_object(
-            python_value,
-            config
-        )
+        return _compile_any(config)
     else:
         raise TypeError('Unhandled type')
 
 
+def _compile_json_value(
+        type_annotation: Annotation,
+        json_annotation: JSONAnnotation,
+        config: SerializerConfig,
+        compiled: _Compiled
+) -> Serializer:
+    try:
+        return _compile_type(
+            type_annotation,
+            json_annotation,
+            config,
+            compiled
+        )
+    except Exception as error:  # pylint: disable=broad-exception-caught
+        return _deferred_error(error)
+
+
+def compile_serializer(
+        annotation: Annotation,
+        config: SerializerConfig | None = None
+) -> Serializer:
+    """Compile an annotation to a function which converts a Python object to a
+    JSON value.
+
+    The type introspection is performed once, when the annotation is
+    compiled.
+
+    Args:
+        annotation (Annotation): The type annotation.
+        config (SerializerConfig | None, optional): The serializer
+            configuration. Defaults to None.
+
+    Returns:
+        Serializer: A function taking a Python object and returning a JSON
+            value.
+    """
+    if is_json_annotation(annotation):
+        type_annotation, json_annotation = get_discriminated_json_annotation(
+            annotation
+        )
+    else:
+        type_annotation, json_annotation = annotation, JSONValue()
+
+    return _compile_json_value(
+        type_annotation,
+        json_annotation,
+        (config or DEFAULT_CONFIG).freeze(),
+        {}
+    )
+
+
+_SERIALIZERS = ConfigCache(compile_serializer)
+
+
+def get_serializer(
+        annotation: Annotation,
+        config: SerializerConfig | None = None
+) -> Serializer:
+    """Get the compiled serializer for an annotation from the cache, compiling
+    it if necessary.
+
+    Args:
+        annotation (Annotation): The type annotation.
+        config (SerializerConfig | None, optional): The serializer
+            configuration. Defaults to None.
+
+    Returns:
+        Serializer: A function taking a Python object and returning a JSON
+            value.
+    """
+    return _SERIALIZERS.get(annotation, config or DEFAULT_CONFIG)
+
+
+def _compile_annotated_value(
+        annotations: tuple[Annotation, JSONAnnotation],
+        config: SerializerConfig
+) -> Serializer:
+    type_annotation, json_annotation = annotations
+    return _compile_json_value(type_annotation, json_annotation, config, {})
+
+
+_ANNOTATED_VALUE_SERIALIZERS = ConfigCache(_compile_annotated_value)
+
+
+def from_json_value(
+        python_value: Any,
+        type_annotation: Annotation,
+        json_annotation: JSONAnnotation,
+        config: SerializerConfig
+) -> Any:
+    """Convert a Python value to a JSON value.
+
+    The serializer is compiled once for each annotation and config.
+
+    Args:
+        python_value (Any): The Python value.
+        type_annotation (Annotation): The type annotation.
+        json_annotation (JSONAnnotation): The JSON annotation.
+        config (SerializerConfig): The serializer configuration.
+
+    Raises:
+        TypeError: If the value cannot be serialized.
+
+    Returns:
+        Any: The JSON value.
+    """
+    serialize = _ANNOTATED_VALUE_SERIALIZERS.get(
+        (type_annotation, json_annotation),
+        config
+    )
+    return serialize(python_value)
+
+
 def serialize_typed(
         python_obj: Any,
         annotation: Annotation,
@@ -388,15 +722,27 @@ def serialize_typed(
     Returns:
         str: The JSON string
     """
-    if is_json_annotation(annotation):
-        type_annotation, json_annotation = get_json_annotation(annotation)
-    else:
-        type_annotation, json_annotation = annotation, JSONValue()
-
-    json_obj = from_json_value(
-        python_obj,
-        type_annotation,
-        json_annotation,
-        config or DEFAULT_CONFIG
-    )
+    json_obj = get_serializer(annotation, config)(python_obj)
     return (encode or ENCODE_JSON)(json_obj)
+
+
+def serialize_typed_bytes(
+        python_obj: Any,
+        annotation: Annotation,
+        config: SerializerConfig | None = None,
+        encode: JSONBytesEncoder | None = None
+) -> bytes:
+    """Serialize an object to UTF-8 encoded JSON
+
+    Args:
+        python_obj (Any): The object to serialize
+        annotation (Annotation): The objects type annotation
+
+    Raises:
+        TypeError: If the object cannot be serialized
+
+    Returns:
+        bytes: The JSON bytes
+    """
+    json_obj = get_serializer(annotation, config)(python_obj)
+    return (encode or ENCODE_JSON_BYTES)(json_obj)
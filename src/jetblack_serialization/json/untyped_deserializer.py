@@ -1,7 +1,8 @@
 """Untyped JSON deserialization"""
 
-from typing import Any
+from typing import Any, Callable
 
+from ..cache import ConfigValueCache
 from ..config import SerializerConfig, DEFAULT_CONFIG
 
 from .encoding import JSONDecoder, DECODE_JSON
@@ -10,7 +11,44 @@ from .encoding import JSONDecoder, DECODE_JSON
 def _deserialize_key_if_str(key: Any, config: SerializerConfig) -> Any:
     return config.deserialize_key(
         key
-    ) if config.deserialize_key is not None and isinstance(key, str) else key
+    ) if config.has_key_deserializer and isinstance(key, str) else key
+
+
+# The number of strings known not to be values which are remembered for each
+# config.
+PLAIN_STRINGS_CACHE_SIZE = 4096
+
+
+def _always(_text: str) -> bool:
+    return True
+
+
+def _compile_from_text(config: SerializerConfig) -> Callable[[str], Any]:
+    deserializers = [
+        (config.value_sniffers.get(cls, _always), deserializer)
+        for cls, deserializer in config.value_deserializers.items()
+    ]
+    # Strings which no deserializer could parse.
+    plain_strings: set[str] = set()
+
+    def from_text(text: str) -> Any:
+        if text in plain_strings:
+            return text
+        for sniff, deserializer in deserializers:
+            if sniff(text):
+                try:
+                    return deserializer(text)
+                except:  # pylint: disable=bare-except
+                    pass
+        if len(plain_strings) >= PLAIN_STRINGS_CACHE_SIZE:
+            plain_strings.clear()
+        plain_strings.add(text)
+        return text
+
+    return from_text
+
+
+_FROM_TEXT_CACHE = ConfigValueCache(_compile_from_text)
 
 
 def _from_value(
@@ -18,11 +56,7 @@ def _from_value(
         config: SerializerConfig
 ) -> Any:
     if isinstance(value, str):
-        for deserializer in config.value_deserializers.values():
-            try:
-                return deserializer(value)
-            except:  # pylint: disable=bare-except
-                pass
+        return _FROM_TEXT_CACHE.get(config)(value)
     return value
 
 
@@ -63,4 +97,4 @@ def deserialize_untyped(
         Any: The deserialized JSON object
     """
     json_obj = (decode or DECODE_JSON)(text)
-    return from_untyped_object(json_obj, config or DEFAULT_CONFIG)
+    return from_untyped_object(json_obj, (config or DEFAULT_CONFIG).freeze())
@@ -4,13 +4,18 @@ from typing import Any
 
 from ..config import SerializerConfig, DEFAULT_CONFIG
 
-from .encoding import JSONEncoder, ENCODE_JSON
+from .encoding import (
+    JSONBytesEncoder,
+    JSONEncoder,
+    ENCODE_JSON,
+    ENCODE_JSON_BYTES,
+)
 
 
 def _serialize_key_if_str(key: Any, config: SerializerConfig) -> Any:
     return config.serialize_key(
         key
-    ) if config.serialize_key is not None and isinstance(key, str) else key
+    ) if config.has_key_serializer and isinstance(key, str) else key
 
 
 def _from_value(
@@ -18,7 +23,7 @@ def _from_value(
         type_annotation: type,
         config: SerializerConfig
 ) -> Any:
-    serializer = config.value_serializers.get(type_annotation)
+    serializer = config.get_value_serializer(type_annotation)
     if serializer is not None:
         return serializer(value)
     return value
@@ -52,5 +57,14 @@ def serialize_untyped(
         config: SerializerConfig | None = None,
         encode: JSONEncoder | None = None
 ) -> str:
-    json_obj = from_untyped_object(obj, config or DEFAULT_CONFIG)
+    json_obj = from_untyped_object(obj, (config or DEFAULT_CONFIG).freeze())
     return (encode or ENCODE_JSON)(json_obj)
+
+
+def serialize_untyped_bytes(
+        obj: Any,
+        config: SerializerConfig | None = None,
+        encode: JSONBytesEncoder | None = None
+) -> bytes:
+    json_obj = from_untyped_object(obj, (config or DEFAULT_CONFIG).freeze())
+    return (encode or ENCODE_JSON_BYTES)(json_obj)
@@ -0,0 +1,19 @@
+"""JSON Lines Serialization"""
+
+from .index import INDEX_SUFFIX, IndexedLines, build_index
+from .lines import (
+    get_line_serializer,
+    get_line_deserializer,
+    read_lines,
+    write_lines,
+)
+
+__all__ = [
+    'INDEX_SUFFIX',
+    'IndexedLines',
+    'build_index',
+    'get_line_serializer',
+    'get_line_deserializer',
+    'read_lines',
+    'write_lines',
+]
@@ -0,0 +1,191 @@
+"""An offset index for JSON Lines files
+
+The index is a sidecar file holding the byte offset of the start of each
+record as an `array('Q')`, followed by the size and the modification time of
+the data file. Records are read through a memory map, so only the records
+requested are read.
+"""
+
+from array import array
+import mmap
+import os
+from typing import Any, overload
+
+from ..config import SerializerConfig, DEFAULT_CONFIG
+from ..json.encoding import JSONDecoder, DECODE_JSON
+from ..types import Annotation
+
+from .lines import get_line_deserializer
+
+INDEX_SUFFIX = '.idx'
+"""The suffix added to the path of a data file for its index"""
+
+
+def _map_file(path: str | os.PathLike[str]) -> mmap.mmap | None:
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            # Empty files cannot be mapped.
+            return None
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _modified_time(path: str | os.PathLike[str]) -> int:
+    # The nanoseconds are stored unsigned, so times before 1970 wrap.
+    return os.stat(path).st_mtime_ns % (1 << 64)
+
+
+def build_index(
+        path: str | os.PathLike[str],
+        index_path: str | os.PathLike[str] | None = None
+) -> array:
+    """Build the offset index for a JSON Lines file and write it to the
+    sidecar file. Blank lines are not records.
+
+    Args:
+        path (str | os.PathLike[str]): The path of the JSON Lines file.
+        index_path (str | os.PathLike[str] | None, optional): The path of the
+            index. Defaults to None, which adds `INDEX_SUFFIX` to the path.
+
+    Returns:
+        array: The offsets of the records, followed by the size and the
+            modification time in nanoseconds of the file.
+    """
+    # The time is taken first, so a change made while the index is built
+    # makes it stale.
+    modified_time = _modified_time(path)
+    offsets = array('Q')
+    data = _map_file(path)
+    if data is None:
+        offsets.append(0)
+    else:
+        with data:
+            start = 0
+            for line in iter(data.readline, b''):
+                if line.strip():
+                    offsets.append(start)
+                start += len(line)
+            offsets.append(start)
+    offsets.append(modified_time)
+
+    with open(index_path or f'{os.fspath(path)}{INDEX_SUFFIX}', 'wb') as file:
+        offsets.tofile(file)
+    return offsets
+
+
+class IndexedLines:
+    """Random access to the records of a JSON Lines file.
+
+    The index is built if it is missing or does not match the size and the
+    modification time of the file. The records are deserialized when they are read.
+
+    ```python
+    from jetblack_serialization.jsonl import IndexedLines
+
+    with IndexedLines('events.jsonl', Event, config) as events:
+        print(len(events))
+        last = events[-1]
+        page = events[1000:1100]
+    ```
+    """
+
+    def __init__(
+            self,
+            path: str | os.PathLike[str],
+            annotation: Annotation,
+            config: SerializerConfig | None = None,
+            index_path: str | os.PathLike[str] | None = None,
+            decode: JSONDecoder | None = None
+    ) -> None:
+        """Open a JSON Lines file for random access.
+
+        Args:
+            path (str | os.PathLike[str]): The path of the JSON Lines file.
+            annotation (Annotation): The type annotation of each record.
+            config (SerializerConfig | None, optional): The serializer
+                configuration. Defaults to None.
+            index_path (str | os.PathLike[str] | None, optional): The path of
+                the index. Defaults to None, which adds `INDEX_SUFFIX` to the
+                path.
+            decode (JSONDecoder | None, optional): The JSON decoder. Defaults
+                to None.
+        """
+        index_path = index_path or f'{os.fspath(path)}{INDEX_SUFFIX}'
+
+        modified_time = _modified_time(path)
+        self._data = _map_file(path)
+        size = 0 if self._data is None else len(self._data)
+
+        self._index = _map_file(index_path) if os.path.exists(
+            index_path
+        ) else None
+        self._offsets: memoryview | array = (
+            memoryview(self._index).cast('Q')
+            if (
+                self._index is not None and
+                len(self._index) % array('Q').itemsize == 0
+            ) else
+            array('Q')
+        )
+        if (
+                len(self._offsets) < 2 or
+                self._offsets[-2] != size or
+                self._offsets[-1] != modified_time
+        ):
+            self._release_index()
+            self._offsets = build_index(path, index_path)
+
+        self._deserialize = get_line_deserializer(
+            annotation,
+            config or DEFAULT_CONFIG
+        )
+        self._decode = decode or DECODE_JSON
+
+    def _release_index(self) -> None:
+        if isinstance(self._offsets, memoryview):
+            self._offsets.release()
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+
+    def _read(self, index: int) -> Any:
+        assert self._data is not None
+        start, end = self._offsets[index], self._offsets[index + 1]
+        return self._deserialize(self._decode(self._data[start:end]))
+
+    def __len__(self) -> int:
+        # The offsets end with the size and modification time of the file.
+        return len(self._offsets) - 2
+
+    @overload
+    def __getitem__(self, index: int) -> Any:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Any]:
+        ...
+
+    def __getitem__(self, index: int | slice) -> Any:
+        count = len(self)
+        if isinstance(index, slice):
+            return [self._read(i) for i in range(*index.indices(count))]
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError('record index out of range')
+        return self._read(index)
+
+    def close(self) -> None:
+        """Close the data and index files"""
+        self._release_index()
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+
+    def __enter__(self) -> 'IndexedLines':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f'IndexedLines({len(self)} records)'
@@ -0,0 +1,154 @@
+"""JSON Lines
+
+Each line of the stream holds one JSON value. The annotation is prepared once
+for the whole stream, and lines are written in batches.
+"""
+
+import io
+from itertools import batched
+from typing import IO, Any, Callable, Iterable, Iterator
+
+from ..config import SerializerConfig, DEFAULT_CONFIG
+from ..json.encoding import JSONDecoder, JSONEncoder, DECODE_JSON, ENCODE_JSON
+from ..json.typed_deserializer import get_deserializer
+from ..json.typed_serializer import get_serializer
+from ..json.untyped_deserializer import (
+    from_untyped_object as from_untyped_json_value
+)
+from ..json.untyped_serializer import from_untyped_object
+from ..types import Annotation
+from ..utils import is_typed
+
+
+def _is_binary(fp: IO[Any]) -> bool:
+    return isinstance(fp, (io.RawIOBase, io.BufferedIOBase)) or (
+        not isinstance(fp, io.TextIOBase) and 'b' in getattr(fp, 'mode', '')
+    )
+
+
+def get_line_serializer(
+        annotation: Annotation,
+        config: SerializerConfig
+) -> Callable[[Any], Any]:
+    """Get the function converting a value to the JSON value of a line.
+
+    Args:
+        annotation (Annotation): The type annotation of each line.
+        config (SerializerConfig): The serializer configuration.
+
+    Returns:
+        Callable[[Any], Any]: The converter.
+    """
+    # The frozen config is captured, so a change to the config does not
+    # change the conversion part way through a file.
+    config = config.freeze()
+    if is_typed(annotation):
+        return get_serializer(annotation, config)
+    return lambda obj: from_untyped_object(obj, config)
+
+
+def get_line_deserializer(
+        annotation: Annotation,
+        config: SerializerConfig
+) -> Callable[[Any], Any]:
+    """Get the function converting the JSON value of a line to a value.
+
+    Args:
+        annotation (Annotation): The type annotation of each line.
+        config (SerializerConfig): The serializer configuration.
+
+    Returns:
+        Callable[[Any], Any]: The converter.
+    """
+    config = config.freeze()
+    if is_typed(annotation):
+        return get_deserializer(annotation, config)
+    return lambda json_value: from_untyped_json_value(json_value, config)
+
+
+def write_lines(
+        objs: Iterable[Any],
+        annotation: Annotation,
+        fp: IO[str] | IO[bytes],
+        config: SerializerConfig | None = None,
+        encode: JSONEncoder | None = None,
+        batch_size: int = 1000
+) -> int:
+    """Write values to a file as JSON Lines.
+
+    ```python
+    with open('events.jsonl', 'w', encoding='utf-8') as file:
+        write_lines(events, Event, file, config)
+    ```
+
+    Args:
+        objs (Iterable[Any]): The values to write.
+        annotation (Annotation): The type annotation of each value.
+        fp (IO[str] | IO[bytes]): The file, opened in text or binary mode.
+            Binary files are written as UTF-8.
+        config (SerializerConfig | None, optional): The serializer
+            configuration. Defaults to None.
+        encode (JSONEncoder | None, optional): The JSON encoder, which must
+            not write line breaks. Defaults to None.
+        batch_size (int, optional): The number of lines in each write.
+            Defaults to 1000.
+
+    Returns:
+        int: The number of lines written.
+    """
+    serialize = get_line_serializer(annotation, config or DEFAULT_CONFIG)
+    encode = encode or ENCODE_JSON
+    is_binary = _is_binary(fp)
+
+    count = 0
+    for batch in batched(objs, batch_size):
+        text = ''.join(
+            encode(serialize(obj)) + '\n'
+            for obj in batch
+        )
+        fp.write(text.encode() if is_binary else text)  # type: ignore
+        count += len(batch)
+    return count
+
+
+def read_lines(
+        fp: IO[str] | IO[bytes],
+        annotation: Annotation,
+        config: SerializerConfig | None = None,
+        decode: JSONDecoder | None = None
+) -> Iterator[Any]:
+    """Read values from a file of JSON Lines. Blank lines are skipped.
+
+    ```python
+    with open('events.jsonl', 'rb') as file:
+        for event in read_lines(file, Event, config):
+            print(event)
+    ```
+
+    Args:
+        fp (IO[str] | IO[bytes]): The file, opened in text or binary mode.
+        annotation (Annotation): The type annotation of each value.
+        config (SerializerConfig | None, optional): The serializer
+            configuration. Defaults to None.
+        decode (JSONDecoder | None, optional): The JSON decoder. Defaults to
+            None.
+
+    Raises:
+        ValueError: If a line cannot be decoded. The error has a note with the
+            line number.
+
+    Yields:
+        Any: The values.
+    """
+    deserialize = get_line_deserializer(annotation, config or DEFAULT_CONFIG)
+    decode = decode or DECODE_JSON
+
+    for line_number, line in enumerate(fp, 1):
+        if not line.strip():
+            continue
+        try:
+            json_value = decode(line)
+        except ValueError as error:
+            error.add_note(f'Line {line_number}')
+            raise
+        yield deserialize(json_value)
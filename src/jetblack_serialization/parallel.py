@@ -0,0 +1,201 @@
+"""Parallel serialization
+
+Many independent documents are deserialized by a pool of worker processes.
+The annotation and config are sent to each worker once, when it starts, so
+each worker compiles the annotation a single time. The documents are sent in
+chunks to reduce the cost of communicating with the workers.
+
+Many objects can also be serialized with any executor, such as a thread pool
+on a free-threaded build of Python.
+"""
+
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+import os
+from typing import Any, Callable, Iterable, Sequence
+
+from .config import SerializerConfig, DEFAULT_CONFIG
+from .types import Annotation
+
+type Source = str | bytes | bytearray | os.PathLike[str]
+"""A document, or the path of a file holding one"""
+
+type DocumentSerializer = Callable[
+    [Any, Annotation, SerializerConfig | None],
+    Any
+]
+type DocumentDeserializer = Callable[
+    [str | bytes | bytearray, Annotation, SerializerConfig | None],
+    Any
+]
+
+SEQUENTIAL_THRESHOLD = 4 * 1024 * 1024
+"""The total size in bytes of the documents below which they are
+deserialized in the calling process"""
+
+# The deserializer for the documents in a worker process.
+_worker_deserialize: Callable[[Source], Any] | None = None
+
+
+def _read_source(source: Source) -> str | bytes | bytearray:
+    if isinstance(source, os.PathLike):
+        with open(source, 'rb') as file:
+            return file.read()
+    return source
+
+
+def _source_size(source: Source) -> int:
+    if isinstance(source, os.PathLike):
+        return os.path.getsize(source)
+    if isinstance(source, str) and not source.isascii():
+        # Text is measured by its UTF-8 length, as the threshold is in bytes.
+        return len(source.encode('utf-8', 'surrogatepass'))
+    return len(source)
+
+
+def _make_deserializer(
+        deserialize: DocumentDeserializer,
+        annotation: Annotation,
+        config: SerializerConfig
+) -> Callable[[Source], Any]:
+    def deserialize_source(source: Source) -> Any:
+        return deserialize(_read_source(source), annotation, config)
+    return deserialize_source
+
+
+def _init_worker(
+        deserialize: DocumentDeserializer,
+        annotation: Annotation,
+        config: SerializerConfig
+) -> None:
+    global _worker_deserialize  # pylint: disable=global-statement
+    _worker_deserialize = _make_deserializer(deserialize, annotation, config)
+
+
+def _deserialize_chunk(sources: Sequence[Source]) -> list[Any]:
+    assert _worker_deserialize is not None
+    return [_worker_deserialize(source) for source in sources]
+
+
+def _serialize_chunk(
+        serialize: DocumentSerializer,
+        annotation: Annotation,
+        config: SerializerConfig,
+        objs: Sequence[Any]
+) -> list[Any]:
+    return [serialize(obj, annotation, config) for obj in objs]
+
+
+def serialize_many(
+        objs: Iterable[Any],
+        serialize: DocumentSerializer,
+        annotation: Annotation,
+        config: SerializerConfig | None = None,
+        executor: Executor | None = None,
+        chunk_size: int = 100
+) -> list[Any]:
+    """Serialize many objects, optionally with an executor.
+
+    The serializers and their caches are thread safe, so a
+    `ThreadPoolExecutor` can be used. As serialization holds the GIL this
+    only runs in parallel on a free-threaded build of Python; otherwise a
+    `ProcessPoolExecutor` can be used, with picklable arguments.
+
+    Args:
+        objs (Iterable[Any]): The objects to serialize.
+        serialize (DocumentSerializer): The function serializing an object,
+            for example `jetblack_serialization.json.serialize`.
+        annotation (Annotation): The type annotation of each object.
+        config (SerializerConfig | None, optional): The serializer
+            configuration. Defaults to None.
+        executor (Executor | None, optional): The executor. Defaults to None,
+            which serializes the objects in the calling thread.
+        chunk_size (int, optional): The number of objects in each task given
+            to the executor. Defaults to 100.
+
+    Returns:
+        list[Any]: The serialized documents, in the order of the objects.
+    """
+    serialize_chunk = partial(
+        _serialize_chunk,
+        serialize,
+        annotation,
+        config or DEFAULT_CONFIG
+    )
+    if executor is None:
+        return serialize_chunk(list(objs))
+
+    objs = list(objs)
+    chunks = [
+        objs[start:start + chunk_size]
+        for start in range(0, len(objs), chunk_size)
+    ]
+    return [
+        text
+        for chunk in executor.map(serialize_chunk, chunks)
+        for text in chunk
+    ]
+
+
+def deserialize_many(
+        sources: Iterable[Source],
+        deserialize: DocumentDeserializer,
+        annotation: Annotation,
+        config: SerializerConfig | None = None,
+        workers: int | None = None,
+        chunk_size: int | None = None,
+        sequential_threshold: int = SEQUENTIAL_THRESHOLD
+) -> list[Any]:
+    """Deserialize many documents with a pool of worker processes.
+
+    The deserializer, annotation and config must be picklable, so the
+    annotation should be defined at the top level of a module, and the config
+    should not use lambdas.
+
+    Args:
+        sources (Iterable[Source]): The documents as text or bytes, or the
+            paths of the files holding them as `os.PathLike` objects.
+        deserialize (DocumentDeserializer): The function deserializing a
+            document, for example `jetblack_serialization.json.deserialize`.
+        annotation (Annotation): The type annotation of each document.
+        config (SerializerConfig | None, optional): The serializer
+            configuration. Defaults to None.
+        workers (int | None, optional): The number of worker processes.
+            Defaults to None, which uses the number of processors.
+        chunk_size (int | None, optional): The number of documents sent to a
+            worker at a time. Defaults to None, which gives each worker about
+            four chunks.
+        sequential_threshold (int, optional): The total size in bytes of the
+            documents below which they are deserialized in this process. Text
+            is measured by the length of its UTF-8 encoding. Defaults to
+            `SEQUENTIAL_THRESHOLD`.
+
+    Returns:
+        list[Any]: The deserialized documents, in the order of the sources.
+    """
+    sources = list(sources)
+    config = config or DEFAULT_CONFIG
+    workers = min(workers or os.cpu_count() or 1, len(sources))
+
+    if (
+        workers <= 1 or
+        sum(_source_size(source) for source in sources) < sequential_threshold
+    ):
+        deserialize_source = _make_deserializer(deserialize, annotation, config)
+        return [deserialize_source(source) for source in sources]
+
+    chunk_size = chunk_size or max(1, len(sources) // (workers * 4))
+    chunks = [
+        sources[start:start + chunk_size]
+        for start in range(0, len(sources), chunk_size)
+    ]
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(deserialize, annotation, config)
+    ) as executor:
+        return [
+            obj
+            for chunk in executor.map(_deserialize_chunk, chunks)
+            for obj in chunk
+        ]
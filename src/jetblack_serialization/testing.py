@@ -0,0 +1,306 @@
+"""Testing utilities
+
+Random instances of an annotation can be generated for load and soak tests,
+so the tests can use the production schemas at any scale.
+
+```python
+from jetblack_serialization.testing import generate
+
+orders = generate(list[Order], 100, seed=42, list_length=(10, 1000))
+```
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from enum import Enum
+from inspect import isclass
+from random import Random
+import string
+from types import NoneType
+from typing import Any, Callable, get_args, is_typeddict
+from zoneinfo import ZoneInfo
+
+from .types import Annotation
+from .typing_ex import (
+    get_unannotated,
+    is_any,
+    is_dict,
+    is_list,
+    is_literal,
+    is_optional,
+    is_union,
+    resolve_type,
+    typeddict_keys,
+)
+
+type Size = int | tuple[int, int]
+"""A size, or the inclusive range of a random size"""
+
+type _Generator = Callable[[Random, int], Any]
+
+_ALPHABET = string.ascii_letters + string.digits
+_EPOCH = datetime(2000, 1, 1, tzinfo=timezone.utc)
+_SECONDS_IN_30_YEARS = 30 * 365 * 24 * 60 * 60
+_ZONE_KEYS = ('UTC', 'Europe/London', 'America/New_York', 'Asia/Tokyo')
+
+
+def _random_size(rng: Random, size: Size) -> int:
+    if isinstance(size, int):
+        return size
+    low, high = size
+    return rng.randint(low, high)
+
+
+@dataclass(frozen=True)
+class _Options:
+    list_length: Size
+    string_length: Size
+    max_depth: int
+    none_ratio: float
+
+
+def _generate_str(options: _Options) -> _Generator:
+    def generate(rng: Random, _depth: int) -> str:
+        length = _random_size(rng, options.string_length)
+        return ''.join(rng.choices(_ALPHABET, k=length))
+    return generate
+
+
+def _generate_datetime(rng: Random, _depth: int) -> datetime:
+    return _EPOCH + timedelta(seconds=rng.randrange(_SECONDS_IN_30_YEARS))
+
+
+def _generate_timedelta(rng: Random, _depth: int) -> timedelta:
+    return timedelta(days=rng.randrange(1000), seconds=rng.randrange(86400))
+
+
+def _generate_decimal(rng: Random, _depth: int) -> Decimal:
+    return Decimal(rng.randint(-100_000_000, 100_000_000)).scaleb(-2)
+
+
+_VALUE_GENERATORS: dict[type, _Generator] = {
+    bool: lambda rng, _depth: rng.random() < 0.5,
+    int: lambda rng, _depth: rng.randint(-1_000_000, 1_000_000),
+    float: lambda rng, _depth: round(rng.uniform(-1_000_000, 1_000_000), 6),
+    Decimal: _generate_decimal,
+    datetime: _generate_datetime,
+    date: lambda rng, depth: _generate_datetime(rng, depth).date(),
+    time: lambda rng, depth: _generate_datetime(rng, depth).time(),
+    timedelta: _generate_timedelta,
+    ZoneInfo: lambda rng, _depth: ZoneInfo(rng.choice(_ZONE_KEYS)),
+}
+
+
+def _generate_any(options: _Options) -> _Generator:
+    generators = [
+        _generate_str(options),
+        _VALUE_GENERATORS[int],
+        _VALUE_GENERATORS[float],
+        _VALUE_GENERATORS[bool],
+    ]
+
+    def generate(rng: Random, depth: int) -> Any:
+        return rng.choice(generators)(rng, depth)
+    return generate
+
+
+def _compile_choice(values: list[Any]) -> _Generator:
+    if not values:
+        raise TypeError('Cannot generate a value from an empty choice')
+
+    def generate(rng: Random, _depth: int) -> Any:
+        return rng.choice(values)
+    return generate
+
+
+def _compile_optional(
+        annotation: Annotation,
+        options: _Options,
+        compiled: dict[Annotation, _Generator]
+) -> _Generator:
+    union_types = [t for t in get_args(annotation) if t is not NoneType]
+    generate_value = _compile_union(union_types, options, compiled)
+
+    def generate(rng: Random, depth: int) -> Any:
+        if depth >= options.max_depth or rng.random() < options.none_ratio:
+            return None
+        return generate_value(rng, depth)
+    return generate
+
+
+def _compile_union(
+        union_types: list[Annotation],
+        options: _Options,
+        compiled: dict[Annotation, _Generator]
+) -> _Generator:
+    generators = [
+        _compile(union_type, options, compiled)
+        for union_type in union_types
+    ]
+    if len(generators) == 1:
+        return generators[0]
+
+    def generate(rng: Random, depth: int) -> Any:
+        return rng.choice(generators)(rng, depth)
+    return generate
+
+
+def _compile_list(
+        annotation: Annotation,
+        options: _Options,
+        compiled: dict[Annotation, _Generator]
+) -> _Generator:
+    item_annotation, *_rest = get_args(annotation) or (Any,)
+    generate_item = _compile(item_annotation, options, compiled)
+
+    def generate(rng: Random, depth: int) -> list[Any]:
+        if depth >= options.max_depth:
+            return []
+        length = _random_size(rng, options.list_length)
+        return [generate_item(rng, depth + 1) for _ in range(length)]
+    return generate
+
+
+def _compile_dict(
+        annotation: Annotation,
+        options: _Options,
+        compiled: dict[Annotation, _Generator]
+) -> _Generator:
+    key_annotation, value_annotation = get_args(annotation) or (str, Any)
+    generate_key = _compile(key_annotation, options, compiled)
+    generate_value = _compile(value_annotation, options, compiled)
+
+    def generate(rng: Random, depth: int) -> dict[Any, Any]:
+        if depth >= options.max_depth:
+            return {}
+        # Duplicate keys are generated again, up to a limit, as the keys may
+        # have fewer values than the length. A dict keeps the keys in the
+        # order they were generated, so a seed always gives the same order.
+        length = _random_size(rng, options.list_length)
+        keys: dict[Any, None] = {}
+        for _ in range(length * 3):
+            if len(keys) >= length:
+                break
+            keys[generate_key(rng, depth + 1)] = None
+        return {key: generate_value(rng, depth + 1) for key in keys}
+    return generate
+
+
+def _compile_typed_dict(
+        annotation: Annotation,
+        options: _Options,
+        compiled: dict[Annotation, _Generator]
+) -> _Generator:
+    fields: list[tuple[str, bool, _Generator]] = []
+
+    def generate(rng: Random, depth: int) -> dict[str, Any]:
+        return {
+            key: generate_value(rng, depth + 1)
+            for key, is_required, generate_value in fields
+            if is_required or (
+                depth < options.max_depth and
+                rng.random() >= options.none_ratio
+            )
+        }
+
+    # Register the generator before compiling the fields to support recursive
+    # types.
+    compiled[annotation] = generate
+
+    for key, info in typeddict_keys(annotation).items():
+        fields.append(
+            (
+                key,
+                info.is_required,
+                _compile(info.annotation, options, compiled)
+            )
+        )
+
+    return generate
+
+
+def _compile_value(annotation: Annotation, options: _Options) -> _Generator:
+    if annotation is str:
+        return _generate_str(options)
+    if annotation in _VALUE_GENERATORS:
+        return _VALUE_GENERATORS[annotation]
+    if isclass(annotation) and issubclass(annotation, Enum):
+        return _compile_choice(list(annotation))
+    raise TypeError(f'Cannot generate a value for {annotation}')
+
+
+def _compile(
+        annotation: Annotation,
+        options: _Options,
+        compiled: dict[Annotation, _Generator]
+) -> _Generator:
+    annotation = get_unannotated(resolve_type(annotation))
+    if annotation in compiled:
+        return compiled[annotation]
+
+    if is_any(annotation):
+        generate = _generate_any(options)
+    elif annotation is NoneType or annotation is None:
+        generate = _compile_choice([None])
+    elif is_literal(annotation):
+        generate = _compile_choice(list(get_args(annotation)))
+    elif is_optional(annotation):
+        generate = _compile_optional(annotation, options, compiled)
+    elif is_union(annotation):
+        generate = _compile_union(list(get_args(annotation)), options, compiled)
+    elif is_list(annotation):
+        generate = _compile_list(annotation, options, compiled)
+    elif is_dict(annotation):
+        generate = _compile_dict(annotation, options, compiled)
+    elif is_typeddict(annotation):
+        return _compile_typed_dict(annotation, options, compiled)
+    else:
+        generate = _compile_value(annotation, options)
+
+    compiled[annotation] = generate
+    return generate
+
+
+def generate(
+        annotation: Annotation,
+        n: int = 1,
+        seed: int | None = None,
+        *,
+        list_length: Size = (0, 5),
+        string_length: Size = (1, 12),
+        max_depth: int = 5,
+        none_ratio: float = 0.1
+) -> list[Any]:
+    """Generate random instances of an annotation.
+
+    The annotation may use typed dictionaries, lists, dicts, optional values,
+    unions, literals, enums, and the builtin and date and time value types.
+    Containers deeper than the maximum depth are empty, optional values are
+    None, and fields which are not required are left out, so recursive types
+    end. Datetimes are in UTC with whole seconds.
+
+    Args:
+        annotation (Annotation): The type annotation.
+        n (int, optional): The number of instances. Defaults to 1.
+        seed (int | None, optional): The random seed. Defaults to None.
+        list_length (Size, optional): The length of lists and dicts.
+            Defaults to (0, 5).
+        string_length (Size, optional): The length of strings. Defaults to
+            (1, 12).
+        max_depth (int, optional): The maximum depth of nested containers.
+            Defaults to 5.
+        none_ratio (float, optional): The fraction of optional values which
+            are None, and of fields which are not required which are left
+            out. Defaults to 0.1.
+
+    Raises:
+        TypeError: If a value cannot be generated for a type.
+
+    Returns:
+        list[Any]: The instances.
+    """
+    options = _Options(list_length, string_length, max_depth, none_ratio)
+    generate_instance = _compile(annotation, options, {})
+    rng = Random(seed)
+    return [generate_instance(rng, 0) for _ in range(n)]
@@ -4,6 +4,7 @@ from enum import Enum
 from inspect import isclass
 from typing import Any, Iterable, Sequence, get_args, is_typeddict
 
+from .config import SerializerConfig
 from .types import Annotation
 from .typing_ex import (
     get_annotated_type,
@@ -42,6 +43,42 @@ def is_value_type(
     )
 
 
+def has_value_serializer(
+        annotation: Annotation | type,
+        config: SerializerConfig
+) -> bool:
+    """Return True if the annotation is a class with a value serializer, or a
+    subclass of one.
+
+    Args:
+        annotation (Annotation | type): The annotation.
+        config (SerializerConfig): The serializer configuration.
+
+    Returns:
+        bool: True if there is a value serializer for the annotation.
+    """
+    return (
+        isclass(annotation) and
+        config.get_value_serializer(annotation) is not None
+    )
+
+
+def is_enum_by_value(enum_type: type[Enum], config: SerializerConfig) -> bool:
+    """Return True if the enum is serialized by value rather than by name.
+
+    Only enums with JSON compatible values, like IntEnum and StrEnum, are
+    serialized by value, and only when the configuration asks for it.
+
+    Args:
+        enum_type (type[Enum]): The enum type.
+        config (SerializerConfig): The serializer configuration.
+
+    Returns:
+        bool: True if the enum is serialized by value.
+    """
+    return config.enum_by_value and issubclass(enum_type, (int, str))
+
+
 def is_container_type(annotation: Any) -> bool:
     """Return True if this is a JSON container.
 
@@ -68,6 +105,7 @@ def is_typed(annotation: Annotation) -> bool:
         is_typeddict(annotation) or
         (
             is_list(annotation) and
+            len(get_args(annotation)) == 1 and
             is_typed(get_args(annotation)[0])
         ) or
         (
@@ -4,9 +4,10 @@ from .annotations import (
     XMLAttribute,
     XMLEntity
 )
+from .codec import Codec
 from .serialization import serialize, deserialize
-from .typed_serializer import serialize_typed
-from .typed_deserializer import deserialize_typed
+from .typed_serializer import compile_serializer, serialize_typed
+from .typed_deserializer import compile_deserializer, deserialize_typed
 from .untyped_serializer import serialize_untyped
 from .untyped_deserializer import deserialize_untyped
 
@@ -14,6 +15,10 @@ __all__ = [
     'XMLAttribute',
     'XMLEntity',
 
+    'Codec',
+    'compile_serializer',
+    'compile_deserializer',
+
     'serialize',
     'deserialize',
 
@@ -0,0 +1,121 @@
+"""An XML codec for a type annotation"""
+
+from typing import Any, Callable
+
+from lxml.etree import _Element  # pylint: disable=no-name-in-module
+
+from ..config import SerializerConfig, DEFAULT_CONFIG
+from ..types import Annotation
+
+from .encoding import XMLEncoder, XMLDecoder, ENCODE_XML, DECODE_XML
+from .typed_deserializer import get_deserializer
+from .typed_serializer import get_serializer
+
+
+class Codec:
+    """An XML codec for a type annotation.
+
+    The annotation is compiled once into a plan of converters, which is
+    reused for every value encoded or decoded.
+
+    ```python
+    from typing import Annotated, TypedDict
+
+    from jetblack_serialization.xml import Codec, XMLAttribute, XMLEntity
+
+    class Book(TypedDict):
+        book_id: Annotated[int, XMLAttribute("bookId")]
+        title: Annotated[str, XMLEntity("Title")]
+
+    codec = Codec(Annotated[Book, XMLEntity("Book")])
+    text = codec.encode({'book_id': 42, 'title': 'Little Red Book'})
+    book = codec.decode(text)
+    ```
+    """
+
+    def __init__(
+            self,
+            annotation: Annotation,
+            config: SerializerConfig | None = None,
+            encode: XMLEncoder | None = None,
+            decode: XMLDecoder | None = None
+    ) -> None:
+        """Create an XML codec.
+
+        Args:
+            annotation (Annotation): The type annotation, which must have an
+                XMLEntity annotation.
+            config (SerializerConfig | None, optional): The serializer
+                configuration. Defaults to None.
+            encode (XMLEncoder | None, optional): The XML encoder. Defaults
+                to None.
+            decode (XMLDecoder | None, optional): The XML decoder. Defaults
+                to None.
+        """
+        self.annotation = annotation
+        self.config = (config or DEFAULT_CONFIG).freeze()
+        self.encoder = encode or ENCODE_XML
+        self.decoder = decode or DECODE_XML
+        self._serializer: Callable[[Any], _Element] | None = None
+        self._deserializer: Callable[[_Element], Any] | None = None
+
+    @property
+    def serializer(self) -> Callable[[Any], _Element]:
+        """The compiled function converting a Python object to an element"""
+        if self._serializer is None:
+            self._serializer = get_serializer(self.annotation, self.config)
+        return self._serializer
+
+    @property
+    def deserializer(self) -> Callable[[_Element], Any]:
+        """The compiled function converting an element to a Python object"""
+        if self._deserializer is None:
+            self._deserializer = get_deserializer(self.annotation, self.config)
+        return self._deserializer
+
+    def to_element(self, obj: Any) -> _Element:
+        """Convert a Python object to an XML element.
+
+        Args:
+            obj (Any): The Python object.
+
+        Returns:
+            _Element: The XML element.
+        """
+        return self.serializer(obj)
+
+    def from_element(self, element: _Element) -> Any:
+        """Convert an XML element to a Python object.
+
+        Args:
+            element (_Element): The XML element.
+
+        Returns:
+            Any: The Python object.
+        """
+        return self.deserializer(element)
+
+    def encode(self, obj: Any) -> str:
+        """Serialize an object to XML.
+
+        Args:
+            obj (Any): The object to serialize.
+
+        Returns:
+            str: The XML string.
+        """
+        return self.encoder(self.serializer(obj))
+
+    def decode(self, text: str | bytes | bytearray) -> Any:
+        """Deserialize XML to an object.
+
+        Args:
+            text (str | bytes | bytearray): The XML string.
+
+        Returns:
+            Any: The deserialized object.
+        """
+        return self.deserializer(self.decoder(text))
+
+    def __repr__(self) -> str:
+        return f'Codec({self.annotation!r})'
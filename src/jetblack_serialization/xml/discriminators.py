@@ -0,0 +1,174 @@
+"""Discriminated unions
+
+The member of a union can be selected from the tag of the element, when each
+member has its own `XMLEntity` annotation, or from an attribute which is a
+literal field of every member, such as
+`kind: Annotated[Literal['order'], XMLAttribute('kind')]`. The attribute is
+found by inspecting the members, or given explicitly with a `Discriminator`
+annotation.
+"""
+
+from dataclasses import dataclass
+from typing import Any, get_args, is_typeddict
+
+from ..types import Annotation
+from ..typing_ex import (
+    TypedDictFieldInfo,
+    get_unannotated,
+    is_literal,
+    resolve_type,
+    typeddict_keys,
+)
+
+from .annotations import (
+    XMLAnnotation,
+    XMLAttribute,
+    XMLEntity,
+    is_xml_annotation,
+    get_xml_annotation,
+)
+
+# Only values with an unambiguous text representation can be used, and bool
+# is excluded as it compares equal to 0 and 1.
+_DISCRIMINATOR_TYPES = (str, int)
+
+
+@dataclass
+class DiscriminatedUnion:
+    """The lookup table for a union discriminated by an attribute"""
+
+    python_key: str
+    """The name of the discriminator field in Python"""
+    tag: str
+    """The name of the discriminator attribute"""
+    members: dict[Any, int]
+    """The index of the union member for each discriminator value"""
+
+
+def get_union_members(
+        union_annotation: Annotation,
+        xml_annotation: XMLAnnotation
+) -> list[tuple[Annotation, XMLAnnotation]]:
+    """Get the members of a union with their XML annotations. Members without
+    an annotation take the annotation of the union.
+
+    Args:
+        union_annotation (Annotation): The union.
+        xml_annotation (XMLAnnotation): The annotation of the union.
+
+    Returns:
+        list[tuple[Annotation, XMLAnnotation]]: The type and XML annotation of
+            each member.
+    """
+    return [
+        get_xml_annotation(member)
+        if is_xml_annotation(member) else
+        (member, xml_annotation)
+        for member in get_args(union_annotation)
+    ]
+
+
+def get_member_tags(
+        members: list[tuple[Annotation, XMLAnnotation]]
+) -> list[str] | None:
+    """Get the distinct entity tags of the members of a union.
+
+    Args:
+        members (list[tuple[Annotation, XMLAnnotation]]): The members of the
+            union.
+
+    Returns:
+        list[str] | None: The tag of each member, or None if the members cannot
+            be told apart by their tags.
+    """
+    tags = [
+        xml_annotation.tag
+        for _, xml_annotation in members
+        if isinstance(xml_annotation, XMLEntity)
+    ]
+    if len(tags) != len(members) or len(set(tags)) != len(tags):
+        return None
+    return tags
+
+
+def _make_discriminated_union(
+        python_key: str,
+        members: list[dict[str, TypedDictFieldInfo]]
+) -> DiscriminatedUnion | None:
+    tags: set[str] = set()
+    values: dict[Any, int] = {}
+
+    for index, fields in enumerate(members):
+        info = fields.get(python_key)
+        if (
+            info is None or
+            not info.is_required or
+            not is_xml_annotation(info.annotation)
+        ):
+            return None
+        literal_annotation, xml_annotation = get_xml_annotation(
+            info.annotation
+        )
+        if not isinstance(xml_annotation, XMLAttribute):
+            return None
+        literal_annotation = get_unannotated(literal_annotation)
+        if not is_literal(literal_annotation):
+            return None
+        for value in get_args(literal_annotation):
+            if type(value) not in _DISCRIMINATOR_TYPES or value in values:
+                return None
+            values[value] = index
+        tags.add(xml_annotation.tag)
+
+    if len(tags) != 1:
+        return None
+
+    return DiscriminatedUnion(python_key, tags.pop(), values)
+
+
+def find_discriminated_union(
+        union_types: list[Annotation],
+        python_key: str | None
+) -> DiscriminatedUnion | None:
+    """Find the discriminator attribute of a union of typed dictionaries.
+
+    Without a key the first field of the first member which is a required
+    literal attribute in every member, with values which identify a single
+    member, is used.
+
+    Args:
+        union_types (list[Annotation]): The members of the union.
+        python_key (str | None): The name of the discriminator field, or None
+            to search for one.
+
+    Raises:
+        TypeError: If a key was given but it does not discriminate the union.
+
+    Returns:
+        DiscriminatedUnion | None: The lookup table, or None if no
+            discriminator was found.
+    """
+    union_types = [resolve_type(t) for t in union_types]
+    if not union_types or not all(is_typeddict(t) for t in union_types):
+        if python_key is not None:
+            raise TypeError(
+                f'Expected a union of typed dictionaries to discriminate on "{python_key}"'
+            )
+        return None
+
+    members = [typeddict_keys(t) for t in union_types]
+
+    if python_key is not None:
+        discriminated_union = _make_discriminated_union(python_key, members)
+        if discriminated_union is None:
+            raise TypeError(
+                f'Expected "{python_key}" to be a required literal attribute with distinct values'
+            )
+        return discriminated_union
+
+    for key in members[0]:
+        discriminated_union = _make_discriminated_union(key, members)
+        if discriminated_union is not None:
+            return discriminated_union
+
+    return None
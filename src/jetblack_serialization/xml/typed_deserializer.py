@@ -1,33 +1,65 @@
-"""Typed XML deserialization"""
+"""Typed XML deserialization
+
+The annotation is compiled once into a plan of converter functions which
+take an XML element and return a Python value. The compiled plans are cached
+by annotation and configuration.
+"""
 
 from decimal import Decimal
 from enum import Enum
 from inspect import Parameter, isclass
-from typing import Any, Iterable, Union, get_args, is_typeddict
+from typing import Any, Callable, Iterable, Union, get_args, is_typeddict
 
 from lxml.etree import _Element  # pylint: disable=no-name-in-module
 
+from ..cache import ConfigCache
 from ..config import SerializerConfig, DEFAULT_CONFIG
-from ..custom_annotations import get_typed_dict_key_default
+from ..custom_annotations import (
+    get_default_annotation,
+    get_default_factory_annotation,
+    get_discriminator_annotation,
+    is_any_default_annotation,
+    is_any_default_factory_annotation,
+    is_any_discriminator_annotation,
+    with_discriminator,
+)
 from ..types import Annotation
 from ..typing_ex import (
-    is_annotated,
     is_list,
+    is_literal,
     is_optional,
     is_union,
     get_unannotated,
     typeddict_keys
 )
-from ..utils import is_value_type
+from ..utils import is_enum_by_value, is_value_type
 
 from .annotations import (
     XMLAnnotation,
     XMLAttribute,
     XMLEntity,
+    is_xml_annotation,
     get_xml_annotation
 )
+from .discriminators import (
+    find_discriminated_union,
+    get_member_tags,
+    get_union_members,
+)
 from .encoding import XMLDecoder, DECODE_XML
 
+# deserializer(element, default) -> value
+type Deserializer = Callable[[_Element | None, Any], Any]
+type _TextDeserializer = Callable[[str], Any]
+
+
+def _deferred_error(error: Exception) -> Deserializer:
+    # Errors found while compiling are raised when the value is deserialized,
+    # so unused branches of an annotation behave as they did when interpreted.
+    def deserialize(_element: _Element | None, _default: Any) -> Any:
+        raise error.with_traceback(None)
+    return deserialize
+
 
 def _is_element_empty(element: _Element, xml_annotation: XMLAnnotation) -> bool:
     if isinstance(xml_annotation, XMLAttribute):
@@ -40,159 +72,338 @@ def _is_element_empty(element: _Element, xml_annotation: XMLAnnotation) -> bool:
         )
 
 
-def _to_value(
-        text: str | None,
-        default: Any,
+def _to_bool(text: str) -> bool:
+    return text.lower() == 'true'
+
+
+def _compile_enum(
+        enum_type: type[Enum],
+        config: SerializerConfig
+) -> _TextDeserializer:
+    names: dict[str, Enum] = dict(enum_type.__members__)
+    if not is_enum_by_value(enum_type, config):
+        return names.__getitem__
+
+    # When serialized by value, names are still accepted.
+    values = {str(member.value): member for member in enum_type}
+
+    def deserialize(text: str) -> Enum:
+        member = values.get(text)
+        return member if member is not None else names[text]
+
+    return deserialize
+
+
+def _compile_value(
         type_annotation: type,
         config: SerializerConfig
-) -> Any:
-    if text is None:
-        return default
-    elif type_annotation is str:
-        return text
+) -> _TextDeserializer:
+    if type_annotation is str:
+        return str
     elif type_annotation is int:
-        return int(text)
+        return int
     elif type_annotation is bool:
-        return text.lower() == 'true'
+        return _to_bool
     elif type_annotation is float:
-        return float(text)
+        return float
     elif type_annotation is Decimal:
-        return Decimal(text)
+        return Decimal
     elif isclass(type_annotation) and issubclass(type_annotation, Enum):
-        return type_annotation[text]
+        return _compile_enum(type_annotation, config)
     else:
         deserializer = config.value_deserializers.get(type_annotation)
         if deserializer is not None:
-            return deserializer(text)
+            return deserializer
 
     raise TypeError(f'Unhandled type {type_annotation}')
 
 
-def _to_union(
-        element: _Element | None,
+def _to_text(value: Any, config: SerializerConfig) -> str:
+    # The text of a literal value, as written by the serializer.
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    elif isinstance(value, Enum):
+        return (
+            str(value.value)
+            if is_enum_by_value(type(value), config) else
+            value.name
+        )
+    return str(value)
+
+
+def _compile_literal(
         type_annotation: Annotation,
-        xml_annotation: XMLAnnotation,
         config: SerializerConfig
-) -> Any:
-    for union_type_annotation in get_args(type_annotation):
-        try:
-            return _to_obj(
-                element,
-                Parameter.empty,
-                union_type_annotation,
-                xml_annotation,
-                config
-            )
-        except:  # pylint: disable=bare-except
-            pass
-    raise ValueError('Unable to deserialize a Union')
+) -> _TextDeserializer:
+    literal_values = get_args(type_annotation)
+    literal_deserializers = [
+        _compile_value(literal_type, config)
+        for literal_type in {type(v) for v in literal_values}
+    ]
+    # The literal value for the text is found with one lookup.
+    canonical_values: dict[str, Any] = {}
+    for value in literal_values:
+        canonical_values.setdefault(_to_text(value, config), value)
+    strict_literals = config.strict_literals
+
+    def deserialize(text: str) -> Any:
+        value = canonical_values.get(text, Parameter.empty)
+        if value is not Parameter.empty:
+            return value
+
+        if strict_literals:
+            raise ValueError(f'Value {text} not in Literal{literal_values}')
+
+        for from_text in literal_deserializers:
+            try:
+                value = from_text(text)
+                if value in literal_values:
+                    return value
+            except:  # pylint: disable=bare-except
+                pass
+
+        raise ValueError(f'Value {text} not in Literal{literal_values}')
+
+    return deserialize
 
 
-def _to_optional(
-        element: _Element | None,
+def _compile_union(
         type_annotation: Annotation,
         xml_annotation: XMLAnnotation,
+        config: SerializerConfig,
+        discriminator_key: str | None = None
+) -> Deserializer:
+    members = get_union_members(type_annotation, xml_annotation)
+    union_deserializers = [
+        _compile_obj(
+            union_type_annotation,
+            union_xml_annotation,
+            config
+        )
+        for union_type_annotation, union_xml_annotation in members
+    ]
+
+    # The member is selected by the value of a discriminator attribute, or
+    # else by the tag of the element when the members have their own tags.
+    attribute: str | None = None
+    member_deserializers: dict[str, Deserializer] = {}
+    discriminated_union = find_discriminated_union(
+        [union_type_annotation for union_type_annotation, _ in members],
+        discriminator_key
+    )
+    if discriminated_union is not None:
+        attribute = discriminated_union.tag
+        member_deserializers = {
+            str(value): union_deserializers[index]
+            for value, index in discriminated_union.members.items()
+        }
+    else:
+        member_tags = get_member_tags(members)
+        if member_tags is not None:
+            member_deserializers = dict(zip(member_tags, union_deserializers))
+    # A discriminator given explicitly must select the member.
+    is_exhaustive = discriminator_key is not None
+
+    def deserialize(element: _Element | None, _default: Any) -> Any:
+        if member_deserializers and element is not None:
+            deserialize_member = member_deserializers.get(
+                element.tag if attribute is None else element.get(attribute)
+            )
+            if deserialize_member is not None:
+                return deserialize_member(element, Parameter.empty)
+            if is_exhaustive:
+                raise ValueError(
+                    f'Unable to deserialize a Union with "{attribute}" of {element.get(attribute)!r}'
+                )
+
+        for deserialize_union_type in union_deserializers:
+            try:
+                return deserialize_union_type(element, Parameter.empty)
+            except:  # pylint: disable=bare-except
+                pass
+        raise ValueError('Unable to deserialize a Union')
+
+    return deserialize
+
+
+def _compile_discriminated(
+        annotation: Annotation,
+        xml_annotation: XMLAnnotation,
         config: SerializerConfig
-) -> Any:
-    if element is None or _is_element_empty(element, xml_annotation):
-        return None
+) -> Deserializer:
+    type_annotation, discriminator = get_discriminator_annotation(annotation)
+    if is_optional(type_annotation):
+        return _compile_optional(
+            type_annotation,
+            xml_annotation,
+            config,
+            discriminator.key
+        )
+    elif is_union(type_annotation):
+        return _compile_union(
+            type_annotation,
+            xml_annotation,
+            config,
+            discriminator.key
+        )
+    raise TypeError(f'Expected a union for {discriminator!r}')
+
 
+def _compile_optional(
+        type_annotation: Annotation,
+        xml_annotation: XMLAnnotation,
+        config: SerializerConfig,
+        discriminator_key: str | None = None
+) -> Deserializer:
     # An optional is a union where the last element is the None type.
     # TODO: review this.
     union_types = get_args(type_annotation)[:-1]
     if len(union_types) == 1:
         # This was T | None
-        return _to_obj(
-            element,
-            Parameter.empty,
+        deserialize_value = _compile_obj(
             union_types[0],
             xml_annotation,
             config
         )
     else:
-        return _to_union(
-            element,
+        deserialize_value = _compile_union(
             Union[tuple(union_types)],  # type: ignore
             xml_annotation,
-            config
+            config,
+            discriminator_key
         )
 
+    def deserialize(element: _Element | None, _default: Any) -> Any:
+        if element is None or _is_element_empty(element, xml_annotation):
+            return None
+        return deserialize_value(element, Parameter.empty)
+
+    return deserialize
 
-def _to_simple(
-        element: _Element | None,
-        default: Any,
+
+def _compile_simple(
         type_annotation: Annotation,
         xml_annotation: XMLAnnotation,
         config: SerializerConfig
-) -> Any:
-    if element is None:
-        raise ValueError('Found "None" while deserializing a value')
-    if not isinstance(xml_annotation, XMLAttribute):
-        text = element.text
-    else:
-        attrib = element.attrib[xml_annotation.tag]
-        text = attrib.decode('utf8') if isinstance(attrib, bytes) else attrib
-    if text is None and default is Parameter.empty:
-        raise ValueError(f'Expected "{xml_annotation.tag}" to be non-null')
-    if isinstance(text, bytes):
-        text = text.decode()
-    assert isinstance(text, str)
-    return _to_value(text, default, type_annotation, config)
-
-
-def _to_list(
-        element: _Element | None,
+) -> Deserializer:
+    from_text = (
+        _compile_literal(type_annotation, config)
+        if is_literal(type_annotation) else
+        _compile_value(type_annotation, config)
+    )
+    tag = xml_annotation.tag
+    is_attribute = isinstance(xml_annotation, XMLAttribute)
+
+    def deserialize(element: _Element | None, default: Any) -> Any:
+        if element is None:
+            raise ValueError('Found "None" while deserializing a value')
+        if not is_attribute:
+            text = element.text
+        else:
+            attrib = element.attrib[tag]
+            text = attrib.decode('utf8') if isinstance(attrib, bytes) else attrib
+        if text is None and default is Parameter.empty:
+            raise ValueError(f'Expected "{tag}" to be non-null')
+        if isinstance(text, bytes):
+            text = text.decode()
+        assert isinstance(text, str)
+        return from_text(text)
+
+    return deserialize
+
+
+def _compile_list(
         type_annotation: Annotation,
         xml_annotation: XMLAnnotation,
         config: SerializerConfig
-) -> list[Any]:
-    if element is None:
-        raise ValueError('Received "None" while deserializing a list')
-
+) -> Deserializer:
     item_annotation, *_rest = get_args(type_annotation)
-    if is_annotated(item_annotation):
+    if is_xml_annotation(item_annotation):
         item_type_annotation, item_xml_annotation = get_xml_annotation(
             item_annotation
         )
+        item_type_annotation = with_discriminator(
+            item_type_annotation,
+            item_annotation
+        )
     else:
         item_type_annotation = item_annotation
         item_xml_annotation = xml_annotation
 
-    if xml_annotation.tag == item_xml_annotation.tag:
-        # siblings
-        elements: Iterable[_Element] = element.iterfind(
-            '../' + item_xml_annotation.tag)
-    else:
-        # nested
-        elements = element.iter(item_xml_annotation.tag)
+    deserialize_item = _compile_obj(
+        item_type_annotation,
+        item_xml_annotation,
+        config
+    )
 
-    return [
-        _to_obj(
-            child,
-            Parameter.empty,
-            item_type_annotation,
-            item_xml_annotation,
-            config
+    item_tag = item_xml_annotation.tag
+    # Items with the same tag as the list are siblings, otherwise they are
+    # nested. Items which are a union of members with their own tags are the
+    # children of the list with those tags.
+    is_siblings = xml_annotation.tag == item_tag
+    sibling_path = '../' + item_tag
+    member_tags = (
+        get_member_tags(
+            get_union_members(item_type_annotation, item_xml_annotation)
         )
-        for child in elements
-    ]
+        if is_union(item_type_annotation) else
+        None
+    )
+    item_tags = frozenset(member_tags or ())
+
+    def deserialize(element: _Element | None, _default: Any) -> list[Any]:
+        if element is None:
+            raise ValueError('Received "None" while deserializing a list')
+
+        if item_tags:
+            return [
+                deserialize_item(child, Parameter.empty)
+                for child in element
+                if child.tag in item_tags
+            ]
+
+        # Only the children are searched, as nested lists may use the same
+        # tag.
+        elements: Iterable[_Element] = element.iterfind(
+            sibling_path if is_siblings else item_tag
+        )
+
+        return [
+            deserialize_item(child, Parameter.empty)
+            for child in elements
+        ]
+
+    return deserialize
+
+
+def _get_default_factory(annotation: Annotation) -> Callable[[], Any] | None:
+    # A default value is returned as is, while a default factory is called for
+    # each object deserialized.
+    if is_any_default_annotation(annotation):
+        _, default = get_default_annotation(annotation)
+        value = default.value
+        return lambda: value
+    elif is_any_default_factory_annotation(annotation):
+        _, default_factory = get_default_factory_annotation(annotation)
+        return default_factory.factory
+    return None
 
 
-def _to_typed_dict(
-        element: _Element | None,
+def _compile_typed_dict(
         type_annotation: Annotation,
         config: SerializerConfig
-) -> dict[str, Any] | None:
-    if element is None:
-        raise ValueError('Received "None" while deserializing a TypeDict')
-
-    typed_dict: dict[str, Any] = {}
+) -> Deserializer:
+    # The plan is a list of (key, path, default_factory, deserializer). The
+    # path is None when the value is found on the element itself, as for
+    # attributes.
+    fields: list[
+        tuple[str, str | None, Callable[[], Any] | None, Deserializer]
+    ] = []
 
     typed_dict_keys = typeddict_keys(type_annotation)
     assert typed_dict_keys is not None
     for key, info in typed_dict_keys.items():
-        default = get_typed_dict_key_default(info.annotation)
-        if is_annotated(info.annotation):
+        if is_xml_annotation(info.annotation):
             item_type_annotation, item_xml_annotation = get_xml_annotation(
                 info.annotation
             )
@@ -200,64 +411,95 @@ def _to_typed_dict(
             tag = config.serialize_key(key) if isinstance(key, str) else key
             item_xml_annotation = XMLEntity(tag)
             item_type_annotation = get_unannotated(info.annotation)
+        item_type_annotation = with_discriminator(
+            item_type_annotation,
+            info.annotation
+        )
 
-        if (
+        path = (
+            None
+            if (
                 isinstance(item_xml_annotation, XMLAttribute) or
                 item_xml_annotation.tag == ''
-        ):
-            item_element: _Element | None = element
-        else:
-            item_element = element.find('./' + item_xml_annotation.tag)
+            ) else
+            './' + item_xml_annotation.tag
+        )
 
-        typed_dict[key] = _to_obj(
-            item_element,
-            default,
-            item_type_annotation,
-            item_xml_annotation,
-            config
+        fields.append(
+            (
+                key,
+                path,
+                _get_default_factory(info.annotation),
+                _compile_obj(
+                    item_type_annotation,
+                    item_xml_annotation,
+                    config
+                )
+            )
         )
 
-    return typed_dict
+    def deserialize(
+            element: _Element | None,
+            _default: Any
+    ) -> dict[str, Any] | None:
+        if element is None:
+            raise ValueError('Received "None" while deserializing a TypeDict')
+
+        typed_dict: dict[str, Any] = {}
+
+        for key, path, default_factory, deserialize_value in fields:
+            item_element = element if path is None else element.find(path)
+            default = (
+                Parameter.empty
+                if default_factory is None
+                else default_factory()
+            )
+            typed_dict[key] = deserialize_value(item_element, default)
 
+        return typed_dict
 
-def _to_obj(
-        element: _Element | None,
-        default: Any | None,
+    return deserialize
+
+
+def _compile_type(
         type_annotation: Annotation,
         xml_annotation: XMLAnnotation,
         config: SerializerConfig
-) -> Any:
-
-    if is_value_type(type_annotation, config.value_deserializers.keys()):
-        return _to_simple(
-            element,
-            default,
+) -> Deserializer:
+    if is_any_discriminator_annotation(type_annotation):
+        return _compile_discriminated(
             type_annotation,
             xml_annotation,
             config
         )
-    if is_optional(type_annotation):
-        return _to_optional(
-            element,
+    elif (
+        is_value_type(type_annotation, config.value_deserializers.keys()) or
+        is_literal(type_annotation)
+    ):
+        return _compile_simple(
+            type_annotation,
+            xml_annotation,
+            config
+        )
+    elif is_optional(type_annotation):
+        return _compile_optional(
             type_annotation,
             xml_annotation,
             config
         )
     elif is_list(type_annotation):
-        return _to_list(
-            element,
+        return _compile_list(
             type_annotation,
             xml_annotation,
             config
         )
     elif is_typeddict(type_annotation):
-        return _to_typed_dict(
-            element,
+        return _compile_typed_dict(
             type_annotation,
-            config)
+            config
+        )
     elif is_union(type_annotation):
-        return _to_union(
-            element,
+        return _compile_union(
             type_annotation,
             xml_annotation,
             config
@@ -265,6 +507,77 @@ def _to_obj(
     raise TypeError
 
 
+def _compile_obj(
+        type_annotation: Annotation,
+        xml_annotation: XMLAnnotation,
+        config: SerializerConfig
+) -> Deserializer:
+    try:
+        return _compile_type(type_annotation, xml_annotation, config)
+    except Exception as error:  # pylint: disable=broad-exception-caught
+        return _deferred_error(error)
+
+
+def compile_deserializer(
+        annotation: Annotation,
+        config: SerializerConfig | None = None
+) -> Callable[[_Element], Any]:
+    """Compile an annotation to a function which converts an XML element to a
+    Python object.
+
+    The type introspection is performed once, when the annotation is
+    compiled.
+
+    Args:
+        annotation (Annotation): The type annotation, which must have an
+            XMLEntity annotation.
+        config (SerializerConfig | None, optional): The serializer
+            configuration. Defaults to None.
+
+    Raises:
+        TypeError: If the root annotation is not an XMLEntity.
+
+    Returns:
+        Callable[[_Element], Any]: A function taking an XML element and
+            returning a Python object.
+    """
+    type_annotation, xml_annotation = get_xml_annotation(annotation)
+    if not isinstance(xml_annotation, XMLEntity):
+        raise TypeError(
+            "Expected the root value to have an XMLEntity annotation"
+        )
+    type_annotation = with_discriminator(type_annotation, annotation)
+
+    deserialize = _compile_obj(
+        type_annotation,
+        xml_annotation,
+        (config or DEFAULT_CONFIG).freeze()
+    )
+    return lambda element: deserialize(element, Parameter.empty)
+
+
+_DESERIALIZERS = ConfigCache(compile_deserializer)
+
+
+def get_deserializer(
+        annotation: Annotation,
+        config: SerializerConfig | None = None
+) -> Callable[[_Element], Any]:
+    """Get the compiled deserializer for an annotation from the cache,
+    compiling it if necessary.
+
+    Args:
+        annotation (Annotation): The type annotation.
+        config (SerializerConfig | None, optional): The serializer
+            configuration. Defaults to None.
+
+    Returns:
+        Callable[[_Element], Any]: A function taking an XML element and
+            returning a Python object.
+    """
+    return _DESERIALIZERS.get(annotation, config or DEFAULT_CONFIG)
+
+
 def deserialize_typed(
         text: str | bytes | bytearray,
         annotation: Annotation,
@@ -280,17 +593,6 @@ def deserialize_typed(
     Returns:
         Any: The deserialized object.
     """
-    type_annotation, xml_annotation = get_xml_annotation(annotation)
-    if not isinstance(xml_annotation, XMLEntity):
-        raise TypeError(
-            "Expected the root value to have an XMLEntity annotation"
-        )
-
+    deserialize = get_deserializer(annotation, config)
     element = (decode or DECODE_XML)(text)
-    return _to_obj(
-        element,
-        Parameter.empty,
-        type_annotation,
-        xml_annotation,
-        config or DEFAULT_CONFIG
-    )
+    return deserialize(element)
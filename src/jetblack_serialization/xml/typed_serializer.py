@@ -1,275 +1,501 @@
-"""Typed XML serialization"""
+"""Typed XML serialization
+
+The annotation is compiled once into a plan of converter functions which
+add a Python value to an XML element. The compiled plans are cached by
+annotation and configuration.
+"""
 
 from decimal import Decimal
 from enum import Enum
-from inspect import Parameter
-from typing import Any, Union, get_args, is_typeddict
+from inspect import Parameter, isclass
+from operator import attrgetter
+from typing import Any, Callable, Union, get_args, is_typeddict
 
 from lxml.etree import Element, _Element, SubElement  # pylint: disable=no-name-in-module
 
+from ..cache import ConfigCache
 from ..config import SerializerConfig, DEFAULT_CONFIG
+from ..custom_annotations import (
+    get_discriminator_annotation,
+    is_any_discriminator_annotation,
+    with_discriminator,
+)
 from ..types import Annotation
 from ..typing_ex import (
-    is_annotated,
     is_list,
+    is_literal,
     is_optional,
     is_union,
     typeddict_keys
 )
-from ..utils import is_value_type
+from ..utils import has_value_serializer, is_enum_by_value, is_value_type
 
 from .annotations import (
     XMLAnnotation,
     XMLAttribute,
     XMLEntity,
+    is_xml_annotation,
     get_xml_annotation
 )
+from .discriminators import (
+    find_discriminated_union,
+    get_member_tags,
+    get_union_members,
+)
 from .encoding import XMLEncoder, ENCODE_XML
 
+# serializer(obj, parent) -> element
+type Serializer = Callable[[Any, _Element | None], _Element]
+type _TextSerializer = Callable[[Any], str]
+
 
 def _make_element(parent: _Element | None, tag: str) -> _Element:
     return Element(tag) if parent is None else SubElement(parent, tag)
 
 
-def _from_value(
-        value: Any,
+def _deferred_error(error: Exception) -> Serializer:
+    # Errors found while compiling are raised when the value is serialized, so
+    # unused branches of an annotation behave as they did when interpreted.
+    def serialize(_obj: Any, _element: _Element | None) -> _Element:
+        raise error.with_traceback(None)
+    return serialize
+
+
+def _from_bool(value: Any) -> str:
+    return 'true' if value else 'false'
+
+
+def _from_enum_value(value: Any) -> str:
+    return str(value._value_)  # pylint: disable=protected-access
+
+
+def _compile_value(
         type_annotation: type,
         config: SerializerConfig
-) -> str:
+) -> _TextSerializer:
     if type_annotation is str:
-        return value
+        return lambda value: value
     elif type_annotation is int:
-        return str(value)
+        return str
     elif type_annotation is bool:
-        return 'true' if value else 'false'
+        return _from_bool
     elif type_annotation is float:
-        return str(value)
+        return str
     elif type_annotation is Decimal:
-        return str(value)
-    elif isinstance(value, Enum):
-        return value.name
+        return str
+    elif isclass(type_annotation) and issubclass(type_annotation, Enum):
+        # The member attributes are read directly, as the name and value
+        # properties are much slower.
+        return (
+            _from_enum_value
+            if is_enum_by_value(type_annotation, config) else
+            attrgetter('_name_')
+        )
     else:
-        serializer = config.value_serializers.get(type_annotation)
+        serializer = config.get_value_serializer(type_annotation)
         if serializer is not None:
-            return serializer(value)
+            return serializer
 
     raise TypeError(f'Unhandled type {type_annotation}')
 
 
-def _from_optional(
-        obj: Any,
+def _compile_literal(
         type_annotation: Annotation,
-        xml_annotation: XMLAnnotation,
-        element: _Element | None,
         config: SerializerConfig
-) -> _Element:
-    if obj is None:
-        return _make_element(element, xml_annotation.tag)
+) -> _TextSerializer:
+    literal_values = get_args(type_annotation)
+    # The text of each literal value is found with one lookup. The type is
+    # part of the key as True == 1 == 1.0.
+    literal_texts = {
+        (type(value), value): _compile_value(type(value), config)(value)
+        for value in literal_values
+    }
 
+    def serialize(value: Any) -> str:
+        text = literal_texts.get((type(value), value))
+        if text is None:
+            raise ValueError(f'Value {value} not in Literal{literal_values}')
+        return text
+
+    return serialize
+
+
+def _compile_optional(
+        type_annotation: Annotation,
+        xml_annotation: XMLAnnotation,
+        config: SerializerConfig,
+        discriminator_key: str | None = None
+) -> Serializer:
     # An optional is a union where the last element is the None type.
     union_types = get_args(type_annotation)[:-1]
     if len(union_types) == 1:
         # This was Optional[T]
-        return _from_obj(
-            obj,
+        serialize_value = _compile_obj(
             union_types[0],
             xml_annotation,
-            element,
             config
         )
     else:
-        return _from_union(
-            obj,
+        serialize_value = _compile_union(
             Union[tuple(union_types)],  # type: ignore
             xml_annotation,
-            element,
-            config
+            config,
+            discriminator_key
         )
 
+    tag = xml_annotation.tag
 
-def _from_union(
-        obj: Any,
+    def serialize(obj: Any, element: _Element | None) -> _Element:
+        if obj is None:
+            return _make_element(element, tag)
+        return serialize_value(obj, element)
+
+    return serialize
+
+
+def _compile_union(
         type_annotation: Annotation,
         xml_annotation: XMLAnnotation,
-        element: _Element | None,
-        config: SerializerConfig
-) -> _Element:
-    for union_type_annotation in get_args(type_annotation):
-        try:
-            return _from_obj(
-                obj,
-                union_type_annotation,
-                xml_annotation,
-                element,
-                config
-            )
-        except:  # pylint: disable=bare-except
-            pass
+        config: SerializerConfig,
+        discriminator_key: str | None = None
+) -> Serializer:
+    members = get_union_members(type_annotation, xml_annotation)
+    union_serializers = [
+        _compile_obj(
+            union_type_annotation,
+            union_xml_annotation,
+            config
+        )
+        for union_type_annotation, union_xml_annotation in members
+    ]
+
+    discriminated_union = find_discriminated_union(
+        [union_type_annotation for union_type_annotation, _ in members],
+        discriminator_key
+    )
+    if discriminated_union is not None:
+        python_key = discriminated_union.python_key
+        member_serializers = {
+            value: union_serializers[index]
+            for value, index in discriminated_union.members.items()
+        }
+    else:
+        python_key, member_serializers = None, {}
+    # A discriminator given explicitly must select the member.
+    is_exhaustive = discriminator_key is not None
+
+    def serialize(obj: Any, element: _Element | None) -> _Element:
+        if python_key is not None and isinstance(obj, dict):
+            serialize_member = member_serializers.get(obj.get(python_key))
+            if serialize_member is not None:
+                return serialize_member(obj, element)
+            if is_exhaustive:
+                raise ValueError(
+                    f'Unable to serialize union with "{python_key}" of {obj.get(python_key)!r}'
+                )
+
+        for serialize_union_type in union_serializers:
+            try:
+                return serialize_union_type(obj, element)
+            except:  # pylint: disable=bare-except
+                pass
+
+        raise ValueError('unable to find type that satisfies union')
 
-    raise ValueError('unable to find type that satisfies union')
+    return serialize
 
 
-def _from_list(
-        obj: list,
+def _compile_discriminated(
+        annotation: Annotation,
+        xml_annotation: XMLAnnotation,
+        config: SerializerConfig
+) -> Serializer:
+    type_annotation, discriminator = get_discriminator_annotation(annotation)
+    if is_optional(type_annotation):
+        return _compile_optional(
+            type_annotation,
+            xml_annotation,
+            config,
+            discriminator.key
+        )
+    elif is_union(type_annotation):
+        return _compile_union(
+            type_annotation,
+            xml_annotation,
+            config,
+            discriminator.key
+        )
+    raise TypeError(f'Expected a union for {discriminator!r}')
+
+
+def _compile_list(
         type_annotation: Annotation,
         xml_annotation: XMLAnnotation,
-        element: _Element | None,
         config: SerializerConfig
-) -> _Element:
+) -> Serializer:
     item_annotation, *_rest = get_args(type_annotation)
-    if is_annotated(item_annotation):
+    if is_xml_annotation(item_annotation):
         item_type_annotation, item_xml_annotation = get_xml_annotation(
             item_annotation
         )
+        item_type_annotation = with_discriminator(
+            item_type_annotation,
+            item_annotation
+        )
     else:
         item_type_annotation = item_annotation
         item_xml_annotation = xml_annotation
 
-    if element is None:
-        element = Element(xml_annotation.tag)
+    serialize_item = _compile_obj(
+        item_type_annotation,
+        item_xml_annotation,
+        config
+    )
 
-    if xml_annotation.tag == item_xml_annotation.tag:
-        # siblings
-        parent = element
-    else:
-        parent = _make_element(element, xml_annotation.tag)
+    tag = xml_annotation.tag
+    # Items with the same tag as the list are siblings, otherwise they are
+    # nested. Items which are a union of members with their own tags are
+    # always nested.
+    is_siblings = (
+        tag == item_xml_annotation.tag and
+        not _is_tagged_union(item_type_annotation, item_xml_annotation)
+    )
+
+    def serialize(obj: list, element: _Element | None) -> _Element:
+        if element is None:
+            element = Element(tag)
+
+        parent = element if is_siblings else _make_element(element, tag)
+
+        for item in obj:
+            serialize_item(item, parent)
+
+        return parent
+
+    return serialize
 
-    for item in obj:
-        _from_obj(
-            item,
-            item_type_annotation,
-            item_xml_annotation,
-            parent,
-            config
-        )
 
-    return parent
+def _is_tagged_union(
+        type_annotation: Annotation,
+        xml_annotation: XMLAnnotation
+) -> bool:
+    return (
+        is_union(type_annotation) and
+        get_member_tags(
+            get_union_members(type_annotation, xml_annotation)
+        ) is not None
+    )
 
 
-def _from_typed_dict(
-        obj: dict,
+def _compile_typed_dict(
         type_annotation: Annotation,
         xml_annotation: XMLAnnotation,
-        element: _Element | None,
         config: SerializerConfig
-) -> _Element:
-    dict_element = _make_element(element, xml_annotation.tag)
+) -> Serializer:
+    # The plan is a list of (key, default, serializer), where the serializer
+    # knows the tag and whether the field is an attribute or an entity.
+    fields: list[tuple[str, Any, Serializer]] = []
 
     typed_dict_keys = typeddict_keys(type_annotation)
     assert typed_dict_keys is not None
     for key, info in typed_dict_keys.items():
         default = getattr(type_annotation, key, Parameter.empty)
-        if is_annotated(info.annotation):
+        if is_xml_annotation(info.annotation):
             item_type_annotation, item_xml_annotation = get_xml_annotation(
                 info.annotation
             )
+            item_type_annotation = with_discriminator(
+                item_type_annotation,
+                info.annotation
+            )
         else:
             tag = config.serialize_key(key) if isinstance(key, str) else key
             item_type_annotation = info.annotation
             item_xml_annotation = XMLEntity(tag)
 
-        value = obj.get(key, default)
-        if value is not Parameter.empty:
-            _from_obj(
-                value,
-                item_type_annotation,
-                item_xml_annotation,
-                dict_element,
-                config
+        fields.append(
+            (
+                key,
+                default,
+                _compile_obj(
+                    item_type_annotation,
+                    item_xml_annotation,
+                    config
+                )
             )
-        else:
-            # TODO: Should we throw?
-            pass
+        )
 
-    return dict_element
+    dict_tag = xml_annotation.tag
 
+    def serialize(obj: dict, element: _Element | None) -> _Element:
+        dict_element = _make_element(element, dict_tag)
 
-def _from_simple(
-        obj: Any,
+        for key, default, serialize_value in fields:
+            value = obj.get(key, default)
+            if value is not Parameter.empty:
+                serialize_value(value, dict_element)
+            else:
+                # TODO: Should we throw?
+                pass
+
+        return dict_element
+
+    return serialize
+
+
+def _compile_simple(
         type_annotation: Annotation,
         xml_annotation: XMLAnnotation,
-        element: _Element | None,
         config: SerializerConfig
-) -> _Element:
-    text = _from_value(obj, type_annotation, config)
+) -> Serializer:
+    to_text = (
+        _compile_literal(type_annotation, config)
+        if is_literal(type_annotation) else
+        _compile_value(type_annotation, config)
+    )
+    tag = xml_annotation.tag
+
     if isinstance(xml_annotation, XMLAttribute):
-        if element is None:
-            raise ValueError("No element for attribute")
-        element.set(xml_annotation.tag, text)
-        return element
-    else:
-        child = _make_element(element, xml_annotation.tag)
+        def serialize_attribute(obj: Any, element: _Element | None) -> _Element:
+            text = to_text(obj)
+            if element is None:
+                raise ValueError("No element for attribute")
+            element.set(tag, text)
+            return element
+        return serialize_attribute
+
+    def serialize_entity(obj: Any, element: _Element | None) -> _Element:
+        text = to_text(obj)
+        child = _make_element(element, tag)
         child.text = text
         return child
+    return serialize_entity
 
 
-def _from_obj(
-        obj: Any,
+def _compile_type(
         type_annotation: Annotation,
         xml_annotation: XMLAnnotation,
-        element: _Element | None,
         config: SerializerConfig
-) -> _Element:
-    if is_value_type(type_annotation, config.value_serializers.keys()):
-        return _from_simple(
-            obj,
+) -> Serializer:
+    if is_any_discriminator_annotation(type_annotation):
+        return _compile_discriminated(
+            type_annotation,
+            xml_annotation,
+            config
+        )
+    elif (
+        is_value_type(type_annotation) or
+        has_value_serializer(type_annotation, config) or
+        is_literal(type_annotation)
+    ):
+        return _compile_simple(
             type_annotation,
             xml_annotation,
-            element,
             config
         )
     elif is_optional(type_annotation):
-        return _from_optional(
-            obj,
+        return _compile_optional(
             type_annotation,
             xml_annotation,
-            element,
             config
         )
     elif is_list(type_annotation):
-        return _from_list(
-            obj,
+        return _compile_list(
             type_annotation,
             xml_annotation,
-            element,
             config
         )
     elif is_typeddict(type_annotation):
-        return _from_typed_dict(
-            obj,
+        return _compile_typed_dict(
             type_annotation,
             xml_annotation,
-            element,
             config
         )
     elif is_union(type_annotation):
-        return _from_union(
-            obj,
+        return _compile_union(
             type_annotation,
             xml_annotation,
-            element,
             config
         )
     else:
         raise TypeError
 
 
-def serialize_typed(
-        obj: Any,
+def _compile_obj(
+        type_annotation: Annotation,
+        xml_annotation: XMLAnnotation,
+        config: SerializerConfig
+) -> Serializer:
+    try:
+        return _compile_type(type_annotation, xml_annotation, config)
+    except Exception as error:  # pylint: disable=broad-exception-caught
+        return _deferred_error(error)
+
+
+def compile_serializer(
         annotation: Annotation,
-        config: SerializerConfig | None = None,
-        encode: XMLEncoder | None = None
-) -> str:
+        config: SerializerConfig | None = None
+) -> Callable[[Any], _Element]:
+    """Compile an annotation to a function which converts a Python object to
+    an XML element.
+
+    The type introspection is performed once, when the annotation is
+    compiled.
+
+    Args:
+        annotation (Annotation): The type annotation, which must have an
+            XMLEntity annotation.
+        config (SerializerConfig | None, optional): The serializer
+            configuration. Defaults to None.
+
+    Raises:
+        TypeError: If the root annotation is not an XMLEntity.
+
+    Returns:
+        Callable[[Any], _Element]: A function taking a Python object and
+            returning an XML element.
+    """
     type_annotation, xml_annotation = get_xml_annotation(annotation)
     if not isinstance(xml_annotation, XMLEntity):
         raise TypeError(
             "Expected the root value to have an XMLEntity annotation")
+    type_annotation = with_discriminator(type_annotation, annotation)
 
-    element = _from_obj(
-        obj,
+    serialize = _compile_obj(
         type_annotation,
         xml_annotation,
-        None,
-        config or DEFAULT_CONFIG
+        (config or DEFAULT_CONFIG).freeze()
     )
+    return lambda obj: serialize(obj, None)
+
+
+_SERIALIZERS = ConfigCache(compile_serializer)
+
+
+def get_serializer(
+        annotation: Annotation,
+        config: SerializerConfig | None = None
+) -> Callable[[Any], _Element]:
+    """Get the compiled serializer for an annotation from the cache, compiling
+    it if necessary.
+
+    Args:
+        annotation (Annotation): The type annotation.
+        config (SerializerConfig | None, optional): The serializer
+            configuration. Defaults to None.
+
+    Returns:
+        Callable[[Any], _Element]: A function taking a Python object and
+            returning an XML element.
+    """
+    return _SERIALIZERS.get(annotation, config or DEFAULT_CONFIG)
+
+
+def serialize_typed(
+        obj: Any,
+        annotation: Annotation,
+        config: SerializerConfig | None = None,
+        encode: XMLEncoder | None = None
+) -> str:
+    element = get_serializer(annotation, config)(obj)
     return (encode or ENCODE_XML)(element)
@@ -1,10 +1,11 @@
 """Untyped XML deserialization"""
 
 from decimal import Decimal
-from typing import Any
+from typing import Any, Callable
 
 from lxml.etree import _Element  # pylint: disable=no-name-in-module
 
+from ..cache import ConfigValueCache
 from ..config import SerializerConfig, DEFAULT_CONFIG
 
 from .encoding import XMLDecoder, DECODE_XML
@@ -18,6 +19,28 @@ def _is_element_empty(element: _Element) -> bool:  # TODO: Remove this?
     )
 
 
+def _to_bool(text: str) -> bool:
+    return text.lower() == 'true'
+
+
+def _compile_converters(
+        config: SerializerConfig
+) -> dict[str, Callable[[str], Any]]:
+    converters: dict[str, Callable[[str], Any]] = {
+        str.__name__: str,
+        int.__name__: int,
+        bool.__name__: _to_bool,
+        float.__name__: float,
+        Decimal.__name__: Decimal,
+    }
+    for cls, deserializer in config.value_deserializers.items():
+        converters.setdefault(cls.__name__, deserializer)
+    return converters
+
+
+_CONVERTERS_CACHE = ConfigValueCache(_compile_converters)
+
+
 def _to_value(
         text: str | None,
         type_name: str,
@@ -25,22 +48,12 @@ def _to_value(
 ) -> Any:
     if text is None:
         return None
-    elif type_name == str.__name__:
-        return text
-    elif type_name == int.__name__:
-        return int(text)
-    elif type_name == bool.__name__:
-        return text.lower() == 'true'
-    elif type_name == float.__name__:
-        return float(text)
-    elif type_name == Decimal.__name__:
-        return Decimal(text)
-    else:
-        for cls, deserializer in config.value_deserializers.items():
-            if type_name == cls.__name__:
-                return deserializer(text)
 
-    raise TypeError(f'Unhandled type {type_name}')
+    converter = _CONVERTERS_CACHE.get(config).get(type_name)
+    if converter is None:
+        raise TypeError(f'Unhandled type {type_name}')
+
+    return converter(text)
 
 
 def _to_simple(
@@ -129,4 +142,4 @@ def deserialize_untyped(
         Any: The deserialized object.
     """
     element = (decode or DECODE_XML)(text)
-    return _to_obj(element, config or DEFAULT_CONFIG)
+    return _to_obj(element, (config or DEFAULT_CONFIG).freeze())
@@ -32,7 +32,7 @@ def _from_value(
     elif isinstance(value, Decimal):
         return str(value)
     else:
-        serializer = config.value_serializers.get(type(value))
+        serializer = config.get_value_serializer(type(value))
         if serializer is not None:
             return serializer(value)
 
@@ -108,5 +108,5 @@ def serialize_untyped(
         config: SerializerConfig | None = None,
         encode: XMLEncoder | None = None
 ) -> str:
-    element = _from_obj(obj, None, config or DEFAULT_CONFIG)
+    element = _from_obj(obj, None, (config or DEFAULT_CONFIG).freeze())
     return (encode or ENCODE_XML)(element)
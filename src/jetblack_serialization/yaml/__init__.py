@@ -5,7 +5,12 @@ from ..json import (
     JSONValue as YAMLValue,
     JSONObject as YAMLObject,
 )
-from .serialization import serialize, deserialize
+from .serialization import (
+    serialize,
+    serialize_many,
+    deserialize,
+    deserialize_many
+)
 from .typed_serializer import serialize_typed
 from .typed_deserializer import deserialize_typed
 from .untyped_serializer import serialize_untyped
@@ -17,7 +22,9 @@ __all__ = [
     'YAMLObject',
 
     'serialize',
+    'serialize_many',
     'deserialize',
+    'deserialize_many',
 
     'serialize_typed',
     'deserialize_typed',
@@ -1,8 +1,12 @@
 """YAML serialization"""
 
-from typing import Any
+from concurrent.futures import Executor
+from typing import Any, Iterable
 
 from ..config import SerializerConfig
+from ..parallel import SEQUENTIAL_THRESHOLD, Source
+from ..parallel import deserialize_many as _deserialize_many
+from ..parallel import serialize_many as _serialize_many
 from ..types import Annotation
 from ..utils import is_typed
 
@@ -55,3 +59,73 @@ def deserialize(
         return deserialize_typed(text, annotation, config, decode)
     else:
         return deserialize_untyped(text, config, decode)
+
+
+def serialize_many(
+        objs: Iterable[Any],
+        annotation: Annotation,
+        config: SerializerConfig | None = None,
+        executor: Executor | None = None,
+        chunk_size: int = 100
+) -> list[str]:
+    """Convert many objects to YAML, optionally with an executor such as a
+    `ThreadPoolExecutor`.
+
+    Args:
+        objs (Iterable[Any]): The objects to convert
+        annotation (Annotation): The type annotation
+        config (SerializerConfig): The serializer configuration
+        executor (Executor | None, optional): The executor. Defaults to None,
+            which converts the objects in the calling thread.
+        chunk_size (int, optional): The number of objects in each task given
+            to the executor. Defaults to 100.
+
+    Returns:
+        list[str]: The serialized objects
+    """
+    return _serialize_many(
+        objs,
+        serialize,
+        annotation,
+        config,
+        executor,
+        chunk_size
+    )
+
+
+def deserialize_many(
+        sources: Iterable[Source],
+        annotation: Annotation,
+        config: SerializerConfig | None = None,
+        workers: int | None = None,
+        chunk_size: int | None = None,
+        sequential_threshold: int = SEQUENTIAL_THRESHOLD
+) -> list[Any]:
+    """Convert many YAML documents to objects with a pool of worker
+    processes. Small batches are converted in this process.
+
+    Args:
+        sources (Iterable[Source]): The YAML documents, or the paths of the
+            files holding them as `os.PathLike` objects.
+        annotation (Annotation): The type annotation
+        config (SerializerConfig): The serializer configuration
+        workers (int | None, optional): The number of worker processes.
+            Defaults to None, which uses the number of processors.
+        chunk_size (int | None, optional): The number of documents sent to a
+            worker at a time. Defaults to None.
+        sequential_threshold (int, optional): The total size in bytes of the
+            documents below which they are converted in this process. Text is
+            measured by the length of its UTF-8 encoding.
+
+    Returns:
+        list[Any]: The deserialized objects.
+    """
+    return _deserialize_many(
+        sources,
+        deserialize,
+        annotation,
+        config,
+        workers,
+        chunk_size,
+        sequential_threshold
+    )
@@ -3,9 +3,7 @@
 from typing import Any
 
 from ..config import SerializerConfig, DEFAULT_CONFIG
-from ..json import JSONValue
-from ..json.annotations import is_json_annotation, get_json_annotation
-from ..json.typed_serializer import from_json_value
+from ..json.typed_serializer import get_serializer
 from ..types import Annotation
 
 from .encoding import YAMLEncoder, ENCODE_YAML
@@ -30,15 +28,5 @@ def serialize_typed(
     Returns:
         str: The YAML string.
     """
-    if is_json_annotation(annotation):
-        type_annotation, json_annotation = get_json_annotation(annotation)
-    else:
-        type_annotation, json_annotation = annotation, JSONValue()
-
-    json_obj = from_json_value(
-        obj,
-        type_annotation,
-        json_annotation,
-        config or DEFAULT_CONFIG
-    )
+    json_obj = get_serializer(annotation, config or DEFAULT_CONFIG)(obj)
     return (encode or ENCODE_YAML)(json_obj)
@@ -14,4 +14,4 @@ def deserialize_untyped(
         decode: YAMLDecoder | None = None
 ) -> Any:
     json_value = (decode or DECODE_YAML)(text)
-    return from_untyped_object(json_value, config or DEFAULT_CONFIG)
+    return from_untyped_object(json_value, (config or DEFAULT_CONFIG).freeze())
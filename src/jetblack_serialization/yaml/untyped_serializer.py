@@ -13,5 +13,5 @@ def serialize_untyped(
         config: SerializerConfig | None = None,
         encode: YAMLEncoder | None = None
 ) -> str:
-    json_obj = from_untyped_object(obj, config or DEFAULT_CONFIG)
+    json_obj = from_untyped_object(obj, (config or DEFAULT_CONFIG).freeze())
     return (encode or ENCODE_YAML)(json_obj)
@@ -0,0 +1,155 @@
+"""Tests for the JSON codec"""
+
+from __future__ import annotations
+
+from datetime import datetime, UTC
+import gc
+from typing import NotRequired, Optional, TypedDict
+import weakref
+
+from jetblack_serialization import FrozenSerializerConfig, SerializerConfig
+from jetblack_serialization.cache import DEFAULT_MAX_CONFIGS
+
+from jetblack_serialization.json import (
+    Codec,
+    compile_deserializer,
+    compile_serializer,
+    serialize_bytes,
+    serialize_typed,
+    serialize_typed_bytes,
+    deserialize_typed,
+    JSONValue,
+)
+from jetblack_serialization.json.typed_serializer import (
+    _ANNOTATED_VALUE_SERIALIZERS,
+    _SERIALIZERS,
+    from_json_value,
+    get_serializer,
+)
+from jetblack_serialization.json.typed_deserializer import (
+    _DESERIALIZERS,
+    get_deserializer,
+)
+
+from .config import CONFIG, Genre
+
+
+class Book(TypedDict):
+    book_id: int
+    title: str
+    publication_date: datetime
+    genre: Genre
+    pages: Optional[int]
+
+
+class Node(TypedDict):
+    name: str
+    children: NotRequired[list[Node]]
+
+
+def test_codec_roundtrip() -> None:
+    codec = Codec(list[Book], CONFIG)
+    books: list[Book] = [
+        {
+            'book_id': i,
+            'title': f'Book {i}',
+            'publication_date': datetime(2000, 1, 1, tzinfo=UTC),
+            'genre': Genre.POLITICAL,
+            'pages': None if i % 2 else i * 100,
+        }
+        for i in range(5)
+    ]
+    text = codec.encode(books)
+    assert text == serialize_typed(books, list[Book], CONFIG)
+    assert codec.decode(text) == books
+    assert deserialize_typed(text, list[Book], CONFIG) == books
+
+
+def test_compiled_functions() -> None:
+    serialize = compile_serializer(Book, CONFIG)
+    deserialize = compile_deserializer(Book, CONFIG)
+    book: Book = {
+        'book_id': 42,
+        'title': 'Little Red Book',
+        'publication_date': datetime(1973, 1, 1, 21, 52, 13, tzinfo=UTC),
+        'genre': Genre.POLITICAL,
+        'pages': 100,
+    }
+    json_value = serialize(book)
+    assert json_value == {
+        'bookId': 42,
+        'title': 'Little Red Book',
+        'publicationDate': '1973-01-01T21:52:13.00Z',
+        'genre': 'POLITICAL',
+        'pages': 100,
+    }
+    assert deserialize(json_value) == book
+
+
+def test_recursive_type() -> None:
+    tree: Node = {
+        'name': 'root',
+        'children': [
+            {'name': 'leaf1'},
+            {'name': 'branch', 'children': [{'name': 'leaf2'}]},
+        ]
+    }
+    codec = Codec(Node)
+    assert codec.decode(codec.encode(tree)) == tree
+
+
+def test_cached() -> None:
+    assert get_serializer(Book, CONFIG) is get_serializer(Book, CONFIG)
+    assert get_deserializer(Book, CONFIG) is get_deserializer(Book, CONFIG)
+    assert get_serializer(Book, CONFIG) is not get_serializer(Book)
+
+
+def test_from_json_value_cached() -> None:
+    _ANNOTATED_VALUE_SERIALIZERS.clear()
+    for _ in range(3):
+        assert from_json_value(
+            [1, 2],
+            list[int],
+            JSONValue(),
+            CONFIG
+        ) == [1, 2]
+    assert len(_ANNOTATED_VALUE_SERIALIZERS._caches.get(CONFIG)) == 1
+
+
+def test_configs_collected() -> None:
+    refs: list[weakref.ref[FrozenSerializerConfig]] = []
+    for _ in range(DEFAULT_MAX_CONFIGS * 2):
+        # A lambda makes a config which is not equal to the others.
+        config = SerializerConfig(key_serializer=lambda key: key.upper())
+        text = serialize_typed({'name': 'leaf'}, Node, config)
+        assert deserialize_typed(text, Node, config) == {'name': 'leaf'}
+        refs.append(weakref.ref(config.freeze()))
+    del config
+    gc.collect()
+
+    assert len(_SERIALIZERS._caches) <= DEFAULT_MAX_CONFIGS
+    assert len(_DESERIALIZERS._caches) <= DEFAULT_MAX_CONFIGS
+    # The least recently used configs have been discarded and collected.
+    assert refs[0]() is None
+    assert refs[-1]() is not None
+
+
+def test_bytes() -> None:
+    book: Book = {
+        'book_id': 42,
+        'title': 'Le Petit Prince — première édition',
+        'publication_date': datetime(1943, 4, 6, tzinfo=UTC),
+        'genre': Genre.ROMANTIC,
+        'pages': None,
+    }
+    text = serialize_typed(book, Book, CONFIG)
+    assert serialize_typed_bytes(book, Book, CONFIG) == text.encode()
+    assert serialize_bytes(book, Book, CONFIG) == text.encode()
+    assert serialize_bytes({'a': 1}, dict) == b'{"a": 1}'
+
+    codec = Codec(Book, CONFIG, compact=True, ensure_ascii=False)
+    data = codec.encode_bytes(book)
+    assert data.startswith(b'{"bookId":42,"title":"Le Petit Prince')
+    assert 'première'.encode() in data
+    assert data == codec.encode(book).encode()
+    assert codec.decode(data) == book
@@ -16,6 +16,7 @@ from jetblack_serialization import (
 from jetblack_serialization.json import (
     serialize_typed,
     deserialize_typed,
+    serialize_untyped,
 )
 
 
@@ -107,3 +108,48 @@ def test_custom_value_serialization() -> None:
 
     roundtrip1 = deserialize_typed(text, CustomValueExample, config)
     assert orig == roundtrip1
+
+
+def test_key_cache() -> None:
+
+    calls: list[str] = []
+
+    def upper(key: str) -> str:
+        calls.append(key)
+        return key.upper()
+
+    config = SerializerConfig(key_serializer=upper, key_cache_size=2)
+    text = serialize_untyped(
+        [{'a': 1, 'b': 2}, {'a': 3, 'b': 4}, {'c': 5}, {'a': 6}],
+        config
+    )
+    assert text == '[{"A": 1, "B": 2}, {"A": 3, "B": 4}, {"C": 5}, {"A": 6}]'
+    # The least recently used key is discarded.
+    assert calls == ['a', 'b', 'c', 'a']
+
+    assert SerializerConfig(key_serializer=upper).has_key_serializer
+    assert not SerializerConfig().has_key_serializer
+
+
+def test_key_cache_typed() -> None:
+
+    calls: list[str] = []
+
+    def upper(key: str) -> str:
+        calls.append(key)
+        return key.upper()
+
+    def lower(key: str) -> str:
+        calls.append(key)
+        return key.lower()
+
+    config = SerializerConfig(key_serializer=upper, key_deserializer=lower)
+    for _ in range(100):
+        text = serialize_typed({'a': 1, 'b': 2}, dict[str, int], config)
+        assert text == '{"A": 1, "B": 2}'
+        assert deserialize_typed(text, dict[str, int], config) == {
+            'a': 1,
+            'b': 2
+        }
+    # Each key is transformed once in each direction.
+    assert calls == ['a', 'b', 'A', 'B']
@@ -0,0 +1,106 @@
+"""Tests for discriminated unions"""
+
+from typing import Annotated, Literal, Optional, TypedDict
+
+import pytest
+from stringcase import snakecase, camelcase
+
+from jetblack_serialization import Discriminator, SerializerConfig
+from jetblack_serialization.json import (
+    JSONProperty,
+    serialize_typed,
+    deserialize_typed,
+)
+from jetblack_serialization.json.discriminators import find_discriminated_union
+
+CONFIG = SerializerConfig(
+    key_serializer=camelcase,
+    key_deserializer=snakecase,
+)
+
+
+class Trade(TypedDict):
+    event_kind: Literal['trade']
+    price: float
+    size: int
+
+
+class Quote(TypedDict):
+    event_kind: Literal['quote']
+    bid: float
+    ask: float
+
+
+class Cancel(TypedDict):
+    event_kind: Annotated[Literal['cancel', 'reject'], JSONProperty('eventKind')]
+    order_id: int
+
+
+class Correction(TypedDict):
+    event_kind: Literal['trade']
+    trade_id: int
+
+
+type Event = Trade | Quote | Cancel
+
+
+class Feed(TypedDict):
+    events: list[Annotated[Trade | Quote, Discriminator('event_kind')]]
+    last: Annotated[Optional[Trade | Quote], Discriminator('event_kind')]
+
+
+def test_find_discriminated_union() -> None:
+    discriminated_union = find_discriminated_union(
+        Trade | Quote | Cancel,
+        None,
+        CONFIG
+    )
+    assert discriminated_union is not None
+    assert discriminated_union.python_key == 'event_kind'
+    assert discriminated_union.tag == 'eventKind'
+    assert discriminated_union.members == {
+        'trade': Trade,
+        'quote': Quote,
+        'cancel': Cancel,
+        'reject': Cancel,
+    }
+
+    # Without distinct values the members are tried in turn.
+    assert find_discriminated_union(Trade | Correction, None, CONFIG) is None
+
+    with pytest.raises(TypeError):
+        find_discriminated_union(Trade | Quote, 'price', CONFIG)
+
+
+def test_discovered_discriminator() -> None:
+    events: list[Event] = [
+        {'event_kind': 'trade', 'price': 1.5, 'size': 100},
+        {'event_kind': 'quote', 'bid': 1.25, 'ask': 1.75},
+        {'event_kind': 'reject', 'order_id': 7},
+    ]
+    text = serialize_typed(events, list[Event], CONFIG)
+    assert text.startswith('[{"eventKind": "trade", "price": 1.5')
+    roundtrip = deserialize_typed(text, list[Event], CONFIG)
+    assert roundtrip == events
+
+    with pytest.raises(TypeError):
+        deserialize_typed('{"eventKind": "other"}', Event, CONFIG)
+
+
+def test_explicit_discriminator() -> None:
+    feed: Feed = {
+        'events': [
+            {'event_kind': 'quote', 'bid': 1.25, 'ask': 1.75},
+            {'event_kind': 'trade', 'price': 1.5, 'size': 100},
+        ],
+        'last': None,
+    }
+    text = serialize_typed(feed, Feed, CONFIG)
+    roundtrip = deserialize_typed(text, Feed, CONFIG)
+    assert roundtrip == feed
+
+    annotation = Annotated[Trade | Quote, Discriminator('event_kind')]
+    with pytest.raises(TypeError, match='eventKind'):
+        deserialize_typed('{"eventKind": "cancel"}', annotation, CONFIG)
+    with pytest.raises(TypeError, match='event_kind'):
+        serialize_typed({'event_kind': 'cancel'}, annotation, CONFIG)
@@ -0,0 +1,67 @@
+"""Tests for enums"""
+
+from enum import Enum, IntEnum, StrEnum, auto
+from typing import Literal, TypedDict
+
+import pytest
+
+from jetblack_serialization import SerializerConfig
+from jetblack_serialization.json import serialize_typed, deserialize_typed
+
+
+class Genre(Enum):
+    POLITICAL = auto()
+    HORROR = auto()
+
+
+class Status(IntEnum):
+    OK = 200
+    NOT_FOUND = 404
+
+
+class Side(StrEnum):
+    BUY = 'buy'
+    SELL = 'sell'
+
+
+class Response(TypedDict):
+    genre: Genre
+    status: Status
+    side: Side
+    final: Literal[Status.OK]
+
+
+RESPONSE: Response = {
+    'genre': Genre.HORROR,
+    'status': Status.NOT_FOUND,
+    'side': Side.SELL,
+    'final': Status.OK,
+}
+
+
+def test_enum_by_name() -> None:
+    text = serialize_typed(RESPONSE, Response)
+    assert text == (
+        '{"genre": "HORROR", "status": "NOT_FOUND", "side": "SELL", '
+        '"final": "OK"}'
+    )
+    assert deserialize_typed(text, Response) == RESPONSE
+
+    with pytest.raises(KeyError):
+        deserialize_typed('"ROMANTIC"', Genre)
+
+
+def test_enum_by_value() -> None:
+    config = SerializerConfig(enum_by_value=True)
+    text = serialize_typed(RESPONSE, Response, config)
+    # Enums without int or str values are still serialized by name.
+    assert text == (
+        '{"genre": "HORROR", "status": 404, "side": "sell", "final": 200}'
+    )
+    roundtrip = deserialize_typed(text, Response, config)
+    assert roundtrip == RESPONSE
+    assert type(roundtrip['status']) is Status
+
+    # Names are still accepted.
+    assert deserialize_typed('"NOT_FOUND"', Status, config) is Status.NOT_FOUND
+    assert deserialize_typed('404', Status | str, config) is Status.NOT_FOUND
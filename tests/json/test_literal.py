@@ -1,5 +1,9 @@
+from enum import Enum, auto
 from typing import Literal, TypedDict
 
+import pytest
+
+from jetblack_serialization import SerializerConfig
 from jetblack_serialization.json import serialize_typed, deserialize_typed
 
 
@@ -12,3 +16,32 @@ def test_literal() -> None:
     text = serialize_typed(original, Example)
     roundtrip = deserialize_typed(text, Example)
     assert original == roundtrip
+
+
+class Color(Enum):
+    RED = auto()
+    GREEN = auto()
+
+
+class Pixel(TypedDict):
+    color: Literal[Color.RED, Color.GREEN]
+    depth: Literal[8, 16]
+    alpha: Literal[True]
+
+
+def test_literal_values() -> None:
+    original: Pixel = {'color': Color.GREEN, 'depth': 16, 'alpha': True}
+    text = serialize_typed(original, Pixel)
+    assert text == '{"color": "GREEN", "depth": 16, "alpha": true}'
+    assert deserialize_typed(text, Pixel) == original
+
+    # Values are converted to the literal, unless the literals are strict.
+    text = '{"color": "RED", "depth": "8", "alpha": true}'
+    assert deserialize_typed(text, Pixel)['depth'] == 8
+    with pytest.raises(ValueError):
+        deserialize_typed(text, Pixel, SerializerConfig(strict_literals=True))
+
+    with pytest.raises(ValueError):
+        deserialize_typed('{"color": "RED", "depth": 1, "alpha": true}', Pixel)
+    with pytest.raises(ValueError):
+        serialize_typed({'color': Color.RED, 'depth': 1, 'alpha': True}, Pixel)
@@ -0,0 +1,51 @@
+"""Tests for parallel deserialization"""
+
+from pathlib import Path
+from typing import TypedDict
+
+from jetblack_serialization.json import deserialize_many, serialize
+from jetblack_serialization.parallel import _source_size
+
+from .config import CONFIG
+
+
+class Document(TypedDict):
+    document_id: int
+    title: str
+
+
+DOCUMENTS: list[Document] = [
+    {'document_id': i, 'title': f'Document {i}'}
+    for i in range(20)
+]
+
+
+def test_deserialize_many(tmp_path: Path) -> None:
+    texts = [serialize(document, Document, CONFIG) for document in DOCUMENTS]
+    paths = []
+    for i, text in enumerate(texts[:5]):
+        path = tmp_path / f'{i}.json'
+        path.write_text(text)
+        paths.append(path)
+    sources = [*paths, *texts[5:]]
+
+    # Small batches are deserialized in this process.
+    assert deserialize_many(sources, Document, CONFIG) == DOCUMENTS
+
+    assert deserialize_many(
+        sources,
+        Document,
+        CONFIG,
+        workers=2,
+        chunk_size=3,
+        sequential_threshold=0
+    ) == DOCUMENTS
+
+
+def test_source_size(tmp_path: Path) -> None:
+    path = tmp_path / 'document.json'
+    path.write_text('"é"', encoding='utf-8')
+    # Text is measured in UTF-8 bytes, like files and bytes.
+    assert _source_size('"é"') == _source_size('"é"'.encode()) == 4
+    assert _source_size(path) == 4
+    assert _source_size('"e"') == 3
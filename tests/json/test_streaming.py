@@ -0,0 +1,125 @@
+"""Tests for streaming JSON serialization"""
+
+from datetime import datetime, UTC
+import io
+import json
+from typing import Iterator, TypedDict
+
+import pytest
+from stringcase import camelcase
+
+from jetblack_serialization import SerializerConfig
+from jetblack_serialization.json import (
+    serialize,
+    serialize_iter,
+    deserialize_iter,
+)
+
+from .config import CONFIG
+
+
+class Row(TypedDict):
+    row_id: int
+    created: datetime
+
+
+def _rows(count: int) -> Iterator[Row]:
+    for row_id in range(count):
+        yield {
+            'row_id': row_id,
+            'created': datetime(2024, 1, 1, tzinfo=UTC),
+        }
+
+
+def test_serialize_iter() -> None:
+    rows = list(_rows(5))
+    chunks = list(serialize_iter(rows, list[Row], CONFIG, chunk_size=2))
+    assert len(chunks) == 4
+    assert chunks[0].startswith('[{"rowId": 0, ')
+    assert chunks[1].startswith(', {"rowId": 2, ')
+    assert chunks[-1] == ']'
+    assert ''.join(chunks) == serialize(rows, list[Row], CONFIG)
+
+    # The elements can be generated as they are serialized.
+    text = ''.join(serialize_iter(_rows(5), list[Row], CONFIG))
+    assert text == serialize(rows, list[Row], CONFIG)
+
+
+def test_serialize_iter_other() -> None:
+    assert list(serialize_iter([], list[Row], CONFIG)) == ['[]']
+    assert ''.join(serialize_iter([1, 2, 3], list[int], chunk_size=2)) == (
+        '[1, 2, 3]'
+    )
+
+    row: Row = {'row_id': 1, 'created': datetime(2024, 1, 1, tzinfo=UTC)}
+    assert list(serialize_iter(row, Row, CONFIG)) == [
+        serialize(row, Row, CONFIG)
+    ]
+
+    with pytest.raises(ValueError):
+        list(serialize_iter([], list[Row], CONFIG, chunk_size=0))
+
+
+def test_serialize_iter_config_changed() -> None:
+    config = SerializerConfig(key_serializer=camelcase)
+
+    def objs() -> Iterator[dict]:
+        yield {'row_id': 1}
+        # The elements are converted with the config as it was at the start.
+        config.serialize_key = str.upper
+        yield {'row_id': 2}
+
+    text = ''.join(serialize_iter(objs(), list, config, chunk_size=1))
+    assert text == '[{"rowId": 1}, {"rowId": 2}]'
+
+
+def test_deserialize_iter() -> None:
+    rows = list(_rows(20))
+    text = serialize(rows, list[Row], CONFIG)
+    for block_size in (1, 7, 1024):
+        items = deserialize_iter(
+            io.BytesIO(text.encode()),
+            list[Row],
+            CONFIG,
+            block_size=block_size
+        )
+        assert list(items) == rows
+
+    # Numbers and multi-byte characters can be split between blocks.
+    text = ' [ 12345 , "naïve", [1.5e10] , {"a": null} ]\n'
+    for block_size in (1, 2, 3, 64):
+        assert list(
+            deserialize_iter(io.BytesIO(text.encode()), list, block_size=block_size)
+        ) == [12345, 'naïve', [1.5e10], {'a': None}]
+    assert list(deserialize_iter(io.StringIO('[]'), list[Row], CONFIG)) == []
+
+
+@pytest.mark.parametrize('block_size', [1, 2, 3, 4, 5, 6, 7, 8])
+@pytest.mark.parametrize(
+    'text, expected',
+    [
+        ('[1.5, 2]', [1.5, 2]),
+        ('[1e5, 2]', [1e5, 2]),
+        ('[1.25e-3]', [1.25e-3]),
+        ('[-0.5,-12.75E+2]', [-0.5, -12.75e2]),
+        ('[10,\n2.5\t]', [10, 2.5]),
+    ]
+)
+def test_deserialize_iter_numbers(
+        text: str,
+        expected: list[float],
+        block_size: int
+) -> None:
+    # A number split after ".", "e" or "-" has a prefix which is a number.
+    assert list(
+        deserialize_iter(io.StringIO(text), list, block_size=block_size)
+    ) == expected
+
+
+def test_deserialize_iter_invalid() -> None:
+    for text in ('{}', '[1, 2', '[1 2]', '[1, 2] 3', '[1, tru]'):
+        with pytest.raises(json.JSONDecodeError):
+            list(deserialize_iter(io.StringIO(text), list, block_size=2))
+
+    with pytest.raises(TypeError):
+        deserialize_iter(io.StringIO('{}'), Row, CONFIG)
@@ -1,5 +1,7 @@
+from decimal import Decimal
 from typing import Annotated, Any, Literal, TypedDict
 
+import pytest
 from stringcase import snakecase, camelcase
 
 from jetblack_serialization import Annotation, SerializerConfig
@@ -92,3 +94,22 @@ def test_nested_union() -> None:
     text = serialize_typed(actual, Button, CONFIG)
     roundtrip = deserialize_typed(text, Button, CONFIG)
     assert actual == roundtrip
+
+
+def test_scalar_union() -> None:
+    annotation = int | str | float
+    assert deserialize_typed('1', annotation, CONFIG) == 1
+    assert deserialize_typed('1.5', annotation, CONFIG) == 1.5
+    assert deserialize_typed('"1"', annotation, CONFIG) == 1
+    assert deserialize_typed('"one"', annotation, CONFIG) == 'one'
+    assert deserialize_typed('true', annotation, CONFIG) is True
+
+    assert deserialize_typed('1.5', Decimal | str, CONFIG) == Decimal('1.5')
+    assert deserialize_typed('"abc"', Decimal | str, CONFIG) == 'abc'
+
+    # Only arrays are deserialized as lists.
+    assert deserialize_typed('"ab"', list[str] | str, CONFIG) == 'ab'
+    assert deserialize_typed('["ab"]', list[str] | str, CONFIG) == ['ab']
+
+    with pytest.raises(TypeError):
+        deserialize_typed('{}', int | str, CONFIG)
@@ -1,11 +1,14 @@
 """Tests for the untyped deserializer"""
 
-from datetime import timedelta, datetime, UTC
+from datetime import datetime, time, timedelta, UTC
+from decimal import Decimal
+from zoneinfo import ZoneInfo
 
 from stringcase import snakecase, camelcase
 
 from jetblack_serialization import SerializerConfig
 from jetblack_serialization.json import deserialize_untyped
+from jetblack_serialization.json.untyped_deserializer import _FROM_TEXT_CACHE
 
 CONFIG = SerializerConfig(
     key_serializer=camelcase,
@@ -24,3 +27,45 @@ def test_json_untyped_deserialize() -> None:
         'date_arg': datetime(2019, 12, 31, 23, 59, 59, tzinfo=UTC),
         'duration_arg': timedelta(hours=1, minutes=7)
     }
+
+
+def test_json_untyped_sniffing() -> None:
+    """Test strings are only deserialized by likely deserializers"""
+    text = '["plain", "Europe/London", "2019-12-31", "12:30", "1.5", "plain"]'
+    obj = deserialize_untyped(text, CONFIG)
+    assert obj == [
+        'plain',
+        ZoneInfo('Europe/London'),
+        datetime(2019, 12, 31),
+        time(12, 30),
+        Decimal('1.5'),
+        'plain',
+    ]
+
+    calls: list[str] = []
+
+    def to_upper(value: str) -> str:
+        calls.append(value)
+        if not value.startswith('upper:'):
+            raise ValueError('not upper')
+        return value[6:].upper()
+
+    config = SerializerConfig(
+        value_deserializers=((str, to_upper),),
+        value_sniffers=((str, lambda value: value.startswith('u')),),
+    )
+    obj = deserialize_untyped('["upper:text", "plain", "undo", "undo"]', config)
+    assert obj == ['TEXT', 'plain', 'undo', 'undo']
+    # Unlikely strings are not tried, and failures are remembered.
+    assert calls == ['upper:text', 'undo']
+
+
+def test_json_untyped_from_text_per_config() -> None:
+    # Equal configs share the string converter.
+    assert _FROM_TEXT_CACHE.get(SerializerConfig()) is _FROM_TEXT_CACHE.get(
+        SerializerConfig()
+    )
+    config = SerializerConfig(key_deserializer=snakecase)
+    assert _FROM_TEXT_CACHE.get(config) is not _FROM_TEXT_CACHE.get(
+        SerializerConfig()
+    )
@@ -1,11 +1,12 @@
 """Tests for the untyped serializer"""
 
 from datetime import timedelta, datetime
+from decimal import Decimal
 
 from stringcase import snakecase, camelcase
 
 from jetblack_serialization import SerializerConfig
-from jetblack_serialization.json import serialize_untyped
+from jetblack_serialization.json import serialize_typed, serialize_untyped
 
 CONFIG = SerializerConfig(
     key_serializer=camelcase,
@@ -24,3 +25,36 @@ def test_json_untyped_serialize() -> None:
     }
     text = serialize_untyped(dct, CONFIG)
     assert text == '{"strArg": "text", "intArg": 42, "floatArg": 3.14, "dateArg": "2019-12-31T23:59:59.00Z", "durationArg": "PT1H7M"}'
+
+
+class Price(Decimal):
+    """A decimal subclass"""
+
+
+class Timestamp(datetime):
+    """A datetime subclass"""
+
+
+def test_json_untyped_serialize_subclass() -> None:
+    """Test subclasses use the serializer of their base class"""
+    dct = {
+        'price': Price('1.5'),
+        'timestamp': Timestamp(2019, 12, 31, 23, 59, 59),
+    }
+    text = serialize_untyped(dct, CONFIG)
+    assert text == '{"price": 1.5, "timestamp": "2019-12-31T23:59:59.00Z"}'
+
+    assert CONFIG.get_value_serializer(Timestamp) is (
+        CONFIG.value_serializers[datetime]
+    )
+    assert CONFIG.get_value_serializer(str) is None
+
+
+def test_json_typed_serialize_subclass() -> None:
+    """Test subclass annotations use the serializer of their base class"""
+    text = serialize_typed(
+        {'price': Price('1.5')},
+        dict[str, Price],
+        CONFIG
+    )
+    assert text == '{"price": 1.5}'
@@ -0,0 +1,89 @@
+"""Tests for the JSON Lines offset index"""
+
+import os
+from pathlib import Path
+from typing import TypedDict
+
+import pytest
+
+from jetblack_serialization.jsonl import (
+    INDEX_SUFFIX,
+    IndexedLines,
+    build_index,
+    write_lines,
+)
+
+
+class Record(TypedDict):
+    record_id: int
+    name: str
+
+
+RECORDS: list[Record] = [
+    {'record_id': i, 'name': f'name {i} ü'}
+    for i in range(10)
+]
+
+
+def test_indexed_lines(tmp_path: Path) -> None:
+    path = tmp_path / 'records.jsonl'
+    with open(path, 'w', encoding='utf-8') as file:
+        write_lines(RECORDS[:5], Record, file)
+        file.write('\n')
+        write_lines(RECORDS[5:], Record, file)
+
+    with IndexedLines(path, Record) as records:
+        assert len(records) == 10
+        assert records[0] == RECORDS[0]
+        assert records[7] == RECORDS[7]
+        assert records[-1] == RECORDS[-1]
+        assert records[3:6] == RECORDS[3:6]
+        assert records[::4] == RECORDS[::4]
+        with pytest.raises(IndexError):
+            records[10]  # pylint: disable=pointless-statement
+
+    offsets = build_index(path)
+    assert len(offsets) == 12
+    assert offsets[-2] == path.stat().st_size
+    assert offsets[-1] == path.stat().st_mtime_ns
+    assert (tmp_path / f'records.jsonl{INDEX_SUFFIX}').read_bytes() == (
+        offsets.tobytes()
+    )
+
+    # The index is rebuilt when the file changes.
+    with open(path, 'a', encoding='utf-8') as file:
+        write_lines(RECORDS[:1], Record, file)
+    with IndexedLines(path, Record) as records:
+        assert len(records) == 11
+        assert records[10] == RECORDS[0]
+
+
+def test_rewritten(tmp_path: Path) -> None:
+    path = tmp_path / 'records.jsonl'
+    with open(path, 'w', encoding='utf-8') as file:
+        write_lines(RECORDS[:5], Record, file)
+        file.write('\n')
+        write_lines(RECORDS[5:], Record, file)
+    size = path.stat().st_size
+    build_index(path)
+
+    # The file is rewritten in place with the same size and different
+    # offsets.
+    with open(path, 'r+', encoding='utf-8') as file:
+        write_lines(RECORDS, Record, file)
+        file.write('\n')
+    stat = path.stat()
+    assert stat.st_size == size
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    with IndexedLines(path, Record) as records:
+        assert len(records) == 10
+        assert records[:] == RECORDS
+
+
+def test_empty(tmp_path: Path) -> None:
+    path = tmp_path / 'empty.jsonl'
+    path.write_bytes(b'')
+    with IndexedLines(path, Record) as records:
+        assert len(records) == 0
+        assert records[:] == []
@@ -0,0 +1,81 @@
+"""Tests for JSON Lines"""
+
+from datetime import datetime, UTC
+import io
+from typing import Iterator, Literal, TypedDict
+
+import pytest
+from stringcase import camelcase, snakecase
+
+from jetblack_serialization import SerializerConfig
+from jetblack_serialization.jsonl import read_lines, write_lines
+
+CONFIG = SerializerConfig(
+    key_serializer=camelcase,
+    key_deserializer=snakecase,
+)
+
+
+class Event(TypedDict):
+    event_kind: Literal['login', 'logout']
+    user_name: str
+    timestamp: datetime
+
+
+EVENTS: list[Event] = [
+    {
+        'event_kind': 'login' if i % 2 == 0 else 'logout',
+        'user_name': f'user\n{i}',
+        'timestamp': datetime(2024, 1, 1, 12, i, tzinfo=UTC),
+    }
+    for i in range(5)
+]
+
+
+def test_text_roundtrip() -> None:
+    fp = io.StringIO()
+    assert write_lines(EVENTS, Event, fp, CONFIG, batch_size=2) == 5
+    text = fp.getvalue()
+    assert text.count('\n') == 5
+    assert text.startswith('{"eventKind": "login", "userName": "user\\n0", ')
+
+    fp.seek(0)
+    assert list(read_lines(fp, Event, CONFIG)) == EVENTS
+
+
+def test_binary_roundtrip() -> None:
+    fp = io.BytesIO()
+    write_lines(iter(EVENTS), Event, fp, CONFIG)
+    fp.seek(0)
+    assert list(read_lines(fp, Event, CONFIG)) == EVENTS
+
+
+def test_untyped() -> None:
+    fp = io.StringIO('{"a": 1}\n\n[1, "2019-12-31T23:59:59Z"]\n')
+    assert list(read_lines(fp, dict)) == [
+        {'a': 1},
+        [1, datetime(2019, 12, 31, 23, 59, 59, tzinfo=UTC)],
+    ]
+
+
+def test_invalid_line() -> None:
+    fp = io.StringIO('{"a": 1}\n{"a": \n')
+    with pytest.raises(ValueError) as exc_info:
+        list(read_lines(fp, dict))
+    assert exc_info.value.__notes__ == ['Line 2']
+
+
+def test_config_changed() -> None:
+    config = SerializerConfig(key_serializer=camelcase)
+
+    def objs() -> Iterator[dict]:
+        yield {'user_name': 'first'}
+        # The lines are converted with the config as it was at the start.
+        config.serialize_key = str.upper
+        yield {'user_name': 'second'}
+
+    fp = io.StringIO()
+    write_lines(objs(), dict, fp, config, batch_size=1)
+    assert fp.getvalue() == (
+        '{"userName": "first"}\n{"userName": "second"}\n'
+    )
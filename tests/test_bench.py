@@ -0,0 +1,181 @@
+"""Tests for the benchmarks"""
+
+from pathlib import Path
+from random import Random
+
+import pytest
+
+from jetblack_serialization.bench import (
+    SCHEMAS,
+    compare,
+    get_cases,
+    load_results,
+    measure_case,
+    measure_latency,
+    percentile,
+    save_results,
+    time_case,
+)
+from jetblack_serialization import xml
+from jetblack_serialization.bench.__main__ import main
+from jetblack_serialization.bench.xml_schemas import XML_ANNOTATIONS
+from jetblack_serialization.json import serialize_typed, deserialize_typed
+
+
+def test_schemas_round_trip() -> None:
+    for schema in SCHEMAS:
+        obj = schema.build(Random(0), 3)
+        text = serialize_typed(obj, schema.annotation)
+        # Decimals are serialized as floats, so the text is compared.
+        roundtrip = deserialize_typed(text, schema.annotation)
+        assert serialize_typed(roundtrip, schema.annotation) == text
+
+
+def test_xml_schemas_round_trip() -> None:
+    for schema in SCHEMAS:
+        annotation = XML_ANNOTATIONS[schema.name]
+        obj = schema.build(Random(0), 7)
+        text = xml.serialize_typed(obj, annotation)
+        roundtrip = xml.deserialize_typed(text, annotation)
+        assert xml.serialize_typed(roundtrip, annotation) == text
+
+
+def test_cases() -> None:
+    cases = get_cases(['json'], ['json.*.flat.*', '*.union.deserialize'])
+    assert [case.name for case in cases] == [
+        'json.typed.flat.serialize',
+        'json.typed.flat.deserialize',
+        'json.untyped.flat.serialize',
+        'json.untyped.flat.deserialize',
+        'json.typed.union.deserialize',
+        'json.untyped.union.deserialize',
+    ]
+    for case in cases:
+        assert case.size > 0
+        case.run()
+
+    timing = time_case(cases[0], repeat=2, min_time=0.001)
+    assert timing.number >= 1
+    assert timing.us_per_op > 0
+    assert timing.ops_per_sec == pytest.approx(1_000_000 / timing.us_per_op)
+
+
+def test_sizes() -> None:
+    small, large = (
+        get_cases(['json'], ['json.typed.flat.deserialize*'], size=size)
+        for size in (10, 1000)
+    )
+    assert [case.name for case in small] == [
+        'json.typed.flat.deserialize[10]'
+    ]
+    assert large[0].size > small[0].size * 50
+
+
+def test_measure_case() -> None:
+    case, = get_cases(['json'], ['json.typed.flat.deserialize*'], size=100)
+    usage = measure_case(case)
+    assert usage.name == case.name
+    # The result is held, and the decoded values are also held at the peak.
+    assert usage.peak >= usage.retained > 0
+    assert usage.retained_blocks > 100
+    assert usage.peak_per_byte == usage.peak / case.size
+
+
+def test_percentile() -> None:
+    values = [float(i) for i in range(1, 1001)]
+    assert percentile(values, 0.5) == 500
+    assert percentile(values, 0.99) == 990
+    assert percentile(values, 0.999) == 999
+    assert percentile(values, 1.0) == 1000
+    assert percentile([3.0], 0.999) == 3
+    assert percentile([], 0.5) == 0
+
+
+def test_measure_latency() -> None:
+    small = get_cases(['json'], ['json.typed.flat.*'], size=5)
+    large = get_cases(['json'], ['json.typed.flat.*'], size=500)
+    latency = measure_latency('flat', small, large, requests=50, load=0.2)
+    assert latency.requests == 50
+    assert len(latency.latencies) == 50
+    assert list(latency.latencies) == sorted(latency.latencies)
+    assert latency.latency_us(0.999) >= latency.latency_us(0.5) > 0
+    assert latency.lags
+
+    with pytest.raises(ValueError):
+        measure_latency('flat', small, [])
+
+
+def test_compare() -> None:
+    baseline = {
+        'benchmarks': {
+            'faster': {'us_per_op': 10.0},
+            'slower': {'us_per_op': 10.0},
+            'removed': {'us_per_op': 10.0},
+        }
+    }
+    results = {
+        'benchmarks': {
+            'faster': {'us_per_op': 9.0},
+            'slower': {'us_per_op': 12.0},
+            'added': {'us_per_op': 10.0},
+        }
+    }
+    assert compare(results, baseline, 0.1, 'peak') == []
+    comparisons = compare(results, baseline, 0.1)
+    assert [
+        (comparison.name, comparison.is_regression)
+        for comparison in comparisons
+    ] == [
+        ('faster', False),
+        ('slower', True),
+    ]
+
+
+def test_main(tmp_path: Path) -> None:
+    output = tmp_path / 'results.json'
+    args = ['-k', 'json.typed.flat.*', '-r', '1', '-t', '0.001']
+    assert main([*args, '-o', str(output)]) == 0
+
+    results = load_results(output)
+    assert list(results['benchmarks']) == [
+        'json.typed.flat.serialize',
+        'json.typed.flat.deserialize',
+    ]
+
+    # Every case regresses against a baseline which is ten times faster.
+    for benchmark in results['benchmarks'].values():
+        benchmark['us_per_op'] /= 10
+    baseline = tmp_path / 'baseline.json'
+    save_results(results, baseline)
+    assert main([*args, '-b', str(baseline)]) == 1
+    assert main([*args, '-b', str(baseline), '--threshold', '100']) == 0
+
+
+def test_main_memory(tmp_path: Path) -> None:
+    output = tmp_path / 'results.json'
+    args = ['-m', '-k', 'json.typed.flat.*', '-n', '10', '-n', '20']
+    assert main([*args, '-o', str(output)]) == 0
+
+    results = load_results(output)
+    assert list(results['benchmarks']) == [
+        'json.typed.flat.serialize[10]',
+        'json.typed.flat.deserialize[10]',
+        'json.typed.flat.serialize[20]',
+        'json.typed.flat.deserialize[20]',
+    ]
+    assert main([*args, '-b', str(output), '--threshold', '1']) == 0
+
+
+def test_main_latency(tmp_path: Path) -> None:
+    output = tmp_path / 'results.json'
+    args = [
+        '-l', '-k', 'json.typed.flat.*', '-n', '5', '-n', '50',
+        '--requests', '20', '--offload'
+    ]
+    assert main([*args, '-o', str(output)]) == 0
+
+    results = load_results(output)
+    benchmark, = results['benchmarks'].values()
+    assert list(results['benchmarks']) == ['json.typed.flat[5/50]']
+    assert benchmark['requests'] == 20
+    assert benchmark['p999_us'] >= benchmark['p99_us'] >= benchmark['p50_us']
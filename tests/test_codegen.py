@@ -0,0 +1,288 @@
+"""Tests for code generation"""
+
+from __future__ import annotations
+
+from datetime import datetime, UTC
+from decimal import Decimal
+from enum import StrEnum
+import json
+import re
+from types import ModuleType
+from typing import Annotated, Any, Literal, NotRequired, Optional, TypedDict
+
+import pytest
+
+from jetblack_serialization import (
+    DefaultFactory,
+    DefaultValue,
+    Discriminator,
+    SerializerConfig,
+)
+from jetblack_serialization.codegen import generate_source
+from jetblack_serialization.json import (
+    JSONObject,
+    JSONProperty,
+    serialize_typed,
+    deserialize_typed,
+)
+
+from .json.config import (
+    CONFIG,
+    Genre,
+    Image,
+    value_deserializers,
+    value_serializers,
+)
+
+
+class Line(TypedDict):
+    line_id: int
+    amount: Decimal
+    tags: Annotated[dict[str, int], JSONObject(is_serializable_keys=False)]
+
+
+class Order(TypedDict):
+    order_id: Annotated[int, JSONProperty('id')]
+    created: datetime
+    genre: Genre
+    cover: Image
+    status: Literal['open', 'closed']
+    lines: list[Line]
+    notes: Optional[str]
+    extra: NotRequired[dict[str, Any]]
+    priority: NotRequired[Annotated[int, DefaultValue(1)]]
+    parent: NotRequired[Order]
+    age: Optional[datetime | int]
+
+
+class Color(StrEnum):
+    RED = 'red'
+    BLUE = 'blue'
+
+
+class Circle(TypedDict):
+    kind: Literal['circle']
+    radius: float
+
+
+class Square(TypedDict):
+    kind: Literal['square']
+    side_length: float
+
+
+class Shapes(TypedDict):
+    shape: Circle | Square
+    tagged: Annotated[Circle | Square, Discriminator('kind')]
+    maybe_shape: Optional[Circle | Square]
+    value: datetime | Decimal | str
+
+
+class Flags(TypedDict):
+    status: Literal['open', 'closed']
+    level: Literal[1, 2, 'high']
+    genre: Literal[Genre.HORROR]
+    color: Color
+    maybe_genre: Optional[Genre]
+
+
+class Tree(TypedDict):
+    tree_name: str
+    children: list[Tree]
+    parent_tree: NotRequired[Optional[Tree]]
+
+
+class Settings(TypedDict):
+    setting_name: str
+    retries: NotRequired[Annotated[int, DefaultValue(3)]]
+    colors: NotRequired[Annotated[list[Color], DefaultValue([Color.RED])]]
+    started: NotRequired[
+        Annotated[datetime, DefaultValue(datetime(2000, 1, 1, tzinfo=UTC))]
+    ]
+    tags: NotRequired[Annotated[list[str], DefaultFactory(list)]]
+    limits: NotRequired[
+        Annotated[dict[str, int], DefaultFactory(lambda: {'max_size': 1})]
+    ]
+    extra_values: dict[str, Any]
+
+
+STRICT_CONFIG = SerializerConfig(
+    value_serializers=value_serializers,
+    value_deserializers=value_deserializers,
+    enum_by_value=True,
+    strict_literals=True
+)
+
+SHAPES: Shapes = {
+    'shape': {'kind': 'square', 'side_length': 2.0},
+    'tagged': {'kind': 'circle', 'radius': 1.5},
+    'maybe_shape': None,
+    'value': Decimal('1.25'),
+}
+FLAGS: Flags = {
+    'status': 'closed',
+    'level': 'high',
+    'genre': Genre.HORROR,
+    'color': Color.BLUE,
+    'maybe_genre': None,
+}
+TREE: Tree = {
+    'tree_name': 'root',
+    'children': [
+        {'tree_name': 'leaf', 'children': [], 'parent_tree': None},
+        {
+            'tree_name': 'branch',
+            'children': [{'tree_name': 'twig', 'children': []}],
+        },
+    ],
+}
+SETTINGS: Settings = {
+    'setting_name': 'main',
+    'retries': 5,
+    'extra_values': {'first_value': [1, {'inner_key': 'text'}]},
+}
+
+
+def _load(source: str) -> ModuleType:
+    module = ModuleType('generated')
+    exec(compile(source, 'generated.py', 'exec'), module.__dict__)  # pylint: disable=exec-used
+    return module
+
+
+def test_generated_module() -> None:
+    source = generate_source(['tests.test_codegen'], 'tests.json.config:CONFIG')
+    generated = _load(source)
+
+    assert generated.SERIALIZERS[Order] is generated.serialize_order
+    assert generated.DESERIALIZERS[Line] is generated.deserialize_line
+    assert "'id'" in source and "'createdDate'" not in source
+
+    order: Order = {
+        'order_id': 1,
+        'created': datetime(2024, 1, 1, 12, 0, tzinfo=UTC),
+        'genre': Genre.HORROR,
+        'cover': Image('cover.png'),
+        'status': 'open',
+        'lines': [
+            {
+                'line_id': 1,
+                'amount': Decimal('1.5'),
+                'tags': {'first_tag': 1},
+            }
+        ],
+        'notes': None,
+        'extra': {'some_key': [1, 2]},
+        'parent': {
+            'order_id': 0,
+            'created': datetime(2023, 1, 1, tzinfo=UTC),
+            'genre': Genre.POLITICAL,
+            'cover': Image('parent.png'),
+            'status': 'closed',
+            'lines': [],
+            'notes': 'first',
+            'age': 12,
+        },
+        'age': None,
+    }
+
+    text = serialize_typed(order, Order, CONFIG)
+    assert json.dumps(generated.serialize_order(order)) == text
+
+    expected = deserialize_typed(text, Order, CONFIG)
+    assert generated.deserialize_order(json.loads(text)) == expected
+
+    # The default and optional values are filled in.
+    json_obj = json.loads(text)
+    del json_obj['notes']
+    roundtrip = generated.deserialize_order(json_obj)
+    assert roundtrip['priority'] == 1 and roundtrip['notes'] is None
+
+
+def _assert_same(
+        generated: ModuleType,
+        typed_dict: type,
+        obj: Any,
+        config: SerializerConfig
+) -> None:
+    text = serialize_typed(obj, typed_dict, config)
+    assert json.dumps(generated.SERIALIZERS[typed_dict](obj)) == text
+    assert generated.DESERIALIZERS[typed_dict](json.loads(text)) == (
+        deserialize_typed(text, typed_dict, config)
+    )
+
+
+@pytest.mark.parametrize(
+    'config_reference, config',
+    [
+        ('tests.json.config:CONFIG', CONFIG),
+        ('tests.test_codegen:STRICT_CONFIG', STRICT_CONFIG),
+    ]
+)
+def test_generated_matches_compiled(
+        config_reference: str,
+        config: SerializerConfig
+) -> None:
+    source = generate_source(['tests.test_codegen'], config_reference)
+    generated = _load(source)
+
+    # The annotations are not compiled when the module is imported.
+    assert re.search(r'_runtime\.(type|field)_(de)?serializer', source) is None
+    assert 'except:' not in source
+
+    _assert_same(generated, Shapes, SHAPES, config)
+    _assert_same(
+        generated,
+        Shapes,
+        SHAPES | {
+            'maybe_shape': {'kind': 'circle', 'radius': 3.0},
+            'value': datetime(2024, 1, 1, tzinfo=UTC),
+        },
+        config
+    )
+    _assert_same(generated, Shapes, SHAPES | {'value': 'text'}, config)
+    _assert_same(generated, Flags, FLAGS, config)
+    _assert_same(
+        generated,
+        Flags,
+        FLAGS | {'level': 1, 'maybe_genre': Genre.ROMANTIC},
+        config
+    )
+    _assert_same(generated, Tree, TREE, config)
+    _assert_same(generated, Settings, SETTINGS, config)
+
+
+def test_generated_defaults() -> None:
+    generated = _load(
+        generate_source(['tests.test_codegen'], 'tests.json.config:CONFIG')
+    )
+    json_obj = {'settingName': 'main', 'extraValues': {}}
+    settings = generated.deserialize_settings(json_obj)
+    assert settings == deserialize_typed(
+        json.dumps(json_obj),
+        Settings,
+        CONFIG
+    )
+    assert settings['retries'] == 3 and settings['colors'] == [Color.RED]
+    assert settings['limits'] == {'max_size': 1}
+    # Mutable defaults are not shared.
+    settings['tags'].append('changed')
+    assert generated.deserialize_settings(json_obj)['tags'] == []
+
+
+def test_generated_errors() -> None:
+    generated = _load(
+        generate_source(
+            ['tests.test_codegen'],
+            'tests.test_codegen:STRICT_CONFIG'
+        )
+    )
+    with pytest.raises(ValueError):
+        generated.serialize_flags(FLAGS | {'status': 'pending'})
+    with pytest.raises(ValueError):
+        generated.deserialize_flags(
+            json.loads(serialize_typed(FLAGS, Flags, STRICT_CONFIG)) |
+            {'level': '1'}
+        )
+    with pytest.raises(TypeError):
+        generated.serialize_shapes(
+            SHAPES | {'tagged': {'kind': 'triangle'}}
+        )
@@ -0,0 +1,114 @@
+"""Tests for the serializer config"""
+
+from datetime import date
+from decimal import Decimal
+import pickle
+from typing import Any, TypedDict
+
+import pytest
+from stringcase import camelcase, snakecase
+
+from jetblack_serialization import FrozenSerializerConfig, SerializerConfig
+from jetblack_serialization.json.typed_deserializer import deserialize_typed
+from jetblack_serialization.json.typed_serializer import (
+    get_serializer,
+    serialize_typed,
+)
+
+
+class Example(TypedDict):
+    short_name: str
+
+
+class Event(TypedDict):
+    day: date
+
+
+def test_config_equality() -> None:
+    config1 = FrozenSerializerConfig(key_serializer=camelcase)
+    config2 = FrozenSerializerConfig(key_serializer=camelcase)
+    assert config1 == config2 and hash(config1) == hash(config2)
+    assert config1 != FrozenSerializerConfig(key_serializer=snakecase)
+    assert SerializerConfig(key_serializer=camelcase).freeze() == config1
+
+    # Equal configs share the compiled serializers.
+    assert get_serializer(Example, config1) is get_serializer(Example, config2)
+    assert get_serializer(
+        Example,
+        SerializerConfig(key_serializer=camelcase)
+    ) is get_serializer(Example, config1)
+
+
+def test_config_immutable() -> None:
+    config = SerializerConfig().freeze()
+    assert config.freeze() is config
+    with pytest.raises(AttributeError):
+        config.strict_literals = True  # type: ignore
+    with pytest.raises(TypeError):
+        config.value_serializers[int] = str  # type: ignore
+
+
+def test_config_mutable() -> None:
+    config = SerializerConfig()
+    obj: Example = {'short_name': 'a'}
+    assert serialize_typed(obj, Example, config) == '{"short_name": "a"}'
+
+    config.serialize_key = camelcase
+    assert config.has_key_serializer
+    assert serialize_typed(obj, Example, config) == '{"shortName": "a"}'
+
+    event: Event = {'day': date(2024, 3, 1)}
+    assert serialize_typed(event, Event, config) == '{"day": "2024-03-01"}'
+
+    frozen = config.freeze()
+    config.value_serializers[date] = lambda d: d.strftime('%d/%m/%Y')
+    assert config.freeze() is not frozen
+    assert serialize_typed(event, Event, config) == '{"day": "01/03/2024"}'
+
+
+def test_config_mutable_shared() -> None:
+    config1 = SerializerConfig()
+    config2 = SerializerConfig()
+    text = '{"price": "1.5"}'
+    assert deserialize_typed(text, dict[str, Any], config1) == {
+        'price': Decimal('1.5')
+    }
+
+    # Changing a config does not change the serializers of equal configs.
+    del config1.value_deserializers[Decimal]
+    assert deserialize_typed(text, dict[str, Any], config1) == {'price': '1.5'}
+    assert deserialize_typed(text, dict[str, Any], config2) == {
+        'price': Decimal('1.5')
+    }
+
+    # An empty mapping is kept when frozen.
+    config2.value_deserializers.clear()
+    assert not config2.freeze().value_deserializers
+    assert deserialize_typed(text, dict[str, Any], config2) == {'price': '1.5'}
+
+
+def test_config_derivation() -> None:
+    config = FrozenSerializerConfig(key_serializer=camelcase).intern()
+    assert FrozenSerializerConfig(key_serializer=camelcase).intern() is config
+    assert SerializerConfig(key_serializer=camelcase).intern() is config
+
+    derived = config.with_key_deserializer(snakecase)
+    assert derived.has_key_deserializer and not config.has_key_deserializer
+    assert derived.with_key_deserializer(None) is config
+    assert derived == FrozenSerializerConfig(
+        key_serializer=camelcase,
+        key_deserializer=snakecase
+    )
+
+    assert config.with_strict_literals(True).strict_literals
+    assert config.with_enum_by_value(True).enum_by_value
+
+
+def test_config_pickle() -> None:
+    config = SerializerConfig(key_serializer=camelcase, enum_by_value=True)
+    roundtrip = pickle.loads(pickle.dumps(config))
+    assert roundtrip.freeze() == config.freeze()
+    assert roundtrip.serialize_key('short_name') == 'shortName'
+
+    frozen = pickle.loads(pickle.dumps(config.freeze()))
+    assert frozen == config.freeze()
@@ -0,0 +1,234 @@
+"""Tests that the work done grows linearly with the size of the payload
+
+Each operation is measured at N, 2N, 4N and 8N elements, and at increasing
+depths of nesting. The growth is the slope of the log of the measure against
+the log of the size, which is 1 for linear and 2 for quadratic growth.
+
+The work is measured by counting the function calls made, including calls to
+builtins and C extensions, which is the same on every run. Timing the
+operations also catches work done within a single C call, but depends on
+the load on the machine, so those tests are marked as slow and only run when
+selected with `pytest -m slow`.
+"""
+
+from __future__ import annotations
+
+import math
+import sys
+from time import perf_counter
+from typing import Annotated, Any, Callable, TypedDict
+
+import pytest
+
+import jetblack_serialization.json as json_serialization
+import jetblack_serialization.xml as xml_serialization
+import jetblack_serialization.yaml as yaml_serialization
+from jetblack_serialization.bench import SCHEMAS, get_cases
+from jetblack_serialization.xml import XMLEntity
+
+MAX_GROWTH = 1.5
+MAX_CALL_GROWTH = 1.2
+SCALES = (1, 2, 4, 8)
+MIN_TIME = 0.001
+REPEAT = 3
+
+# The smallest size for each format, chosen so the slower formats run
+# quickly. The elements of the wide schema are ten times larger.
+BASE_SIZES = {
+    'json': 40,
+    'yaml': 4,
+    'xml': 20,
+}
+WIDE_DIVISOR = 10
+BASE_DEPTH = 10
+
+
+class Node(TypedDict):
+    name: str
+    children: list[Node]
+
+
+class XMLNode(TypedDict):
+    name: str
+    children: Annotated[
+        list[Annotated[XMLNode, XMLEntity('Node')]],
+        XMLEntity('Children')
+    ]
+
+
+ANNOTATIONS = {
+    'json': Node,
+    'yaml': Node,
+    'xml': Annotated[XMLNode, XMLEntity('Node')],
+}
+MODULES = {
+    'json': json_serialization,
+    'yaml': yaml_serialization,
+    'xml': xml_serialization,
+}
+
+
+def _time(func: Callable[[], Any]) -> float:
+    number = 1
+    while True:
+        start = perf_counter()
+        for _ in range(number):
+            func()
+        if perf_counter() - start >= MIN_TIME:
+            break
+        number *= 2
+
+    timings = []
+    for _ in range(REPEAT):
+        start = perf_counter()
+        for _ in range(number):
+            func()
+        timings.append(perf_counter() - start)
+    return min(timings) / number
+
+
+def _count_calls(func: Callable[[], Any]) -> float:
+    # The first call fills the caches.
+    func()
+
+    calls = 0
+
+    def profile(_frame: Any, event: str, _arg: Any) -> None:
+        nonlocal calls
+        if event in ('call', 'c_call'):
+            calls += 1
+
+    sys.setprofile(profile)
+    try:
+        func()
+    finally:
+        sys.setprofile(None)
+    return calls
+
+
+def _format_time(time: float) -> str:
+    return f'{time * 1_000_000:,.0f}µs'
+
+
+def _format_calls(calls: float) -> str:
+    return f'{calls:,.0f} calls'
+
+
+# The measure, the growth allowed and the format of the measurements.
+MEASURES: dict[
+    str,
+    tuple[Callable[[Callable[[], Any]], float], float, Callable[[float], str]]
+] = {
+    'calls': (_count_calls, MAX_CALL_GROWTH, _format_calls),
+    'time': (_time, MAX_GROWTH, _format_time),
+}
+MEASURE_PARAMS = [
+    pytest.param('calls'),
+    pytest.param('time', marks=pytest.mark.slow),
+]
+
+
+def _growth(sizes: list[int], times: list[float]) -> float:
+    # The least squares slope of log(time) against log(size).
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(time) for time in times]
+    x_mean, y_mean = sum(xs) / len(xs), sum(ys) / len(ys)
+    return sum(
+        (x - x_mean) * (y - y_mean)
+        for x, y in zip(xs, ys)
+    ) / sum((x - x_mean) ** 2 for x in xs)
+
+
+def _assert_linear(
+        name: str,
+        sizes: list[int],
+        funcs: list[Callable[[], Any]],
+        measure_name: str
+) -> None:
+    measure, max_growth, format_measurement = MEASURES[measure_name]
+    # A slow measurement is repeated once, in case the machine was busy.
+    for _ in range(2):
+        measurements = [measure(func) for func in funcs]
+        growth = _growth(sizes, measurements)
+        if growth <= max_growth:
+            return
+    details = ', '.join(
+        f'{size}: {format_measurement(measurement)}'
+        for size, measurement in zip(sizes, measurements)
+    )
+    pytest.fail(f'{name} grows as size^{growth:.2f} ({details})')
+
+
+@pytest.mark.parametrize('measure', MEASURE_PARAMS)
+@pytest.mark.parametrize('format_', list(BASE_SIZES))
+@pytest.mark.parametrize('schema', [schema.name for schema in SCHEMAS])
+def test_elements(format_: str, schema: str, measure: str) -> None:
+    base_size = BASE_SIZES[format_]
+    if schema == 'wide':
+        base_size = max(base_size // WIDE_DIVISOR, 1)
+    sizes = [base_size * scale for scale in SCALES]
+    cases_by_size = [
+        get_cases([format_], [f'{format_}.*.{schema}.*'], size=size)
+        for size in sizes
+    ]
+    for cases in zip(*cases_by_size):
+        _assert_linear(
+            cases[0].name.split('[')[0],
+            sizes,
+            [case.run for case in cases],
+            measure
+        )
+
+
+def _chain(depth: int) -> Node:
+    node: Node = {'name': 'leaf', 'children': []}
+    for level in range(depth):
+        node = {'name': f'node-{level}', 'children': [node]}
+    return node
+
+
+@pytest.mark.parametrize('measure', MEASURE_PARAMS)
+@pytest.mark.parametrize('format_', list(MODULES))
+def test_depth(format_: str, measure: str) -> None:
+    module = MODULES[format_]
+    annotation = ANNOTATIONS[format_]
+    depths = [BASE_DEPTH * scale for scale in SCALES]
+    objs = [_chain(depth) for depth in depths]
+    typed_texts = [module.serialize_typed(obj, annotation) for obj in objs]
+    untyped_texts = [module.serialize_untyped(obj) for obj in objs]
+
+    assert module.deserialize_typed(typed_texts[-1], annotation) == objs[-1]
+
+    _assert_linear(
+        f'{format_}.typed.serialize',
+        depths,
+        [
+            lambda obj=obj: module.serialize_typed(obj, annotation)
+            for obj in objs
+        ],
+        measure
+    )
+    _assert_linear(
+        f'{format_}.typed.deserialize',
+        depths,
+        [
+            lambda text=text: module.deserialize_typed(text, annotation)
+            for text in typed_texts
+        ],
+        measure
+    )
+    _assert_linear(
+        f'{format_}.untyped.serialize',
+        depths,
+        [lambda obj=obj: module.serialize_untyped(obj) for obj in objs],
+        measure
+    )
+    _assert_linear(
+        f'{format_}.untyped.deserialize',
+        depths,
+        [
+            lambda text=text: module.deserialize_untyped(text)
+            for text in untyped_texts
+        ],
+        measure
+    )
@@ -0,0 +1,120 @@
+"""Tests for generating random instances of annotations"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from enum import Enum, auto
+from random import Random
+from typing import Annotated, Literal, NotRequired, Optional, TypedDict
+
+import pytest
+
+from jetblack_serialization.bench import Schema, get_cases
+from jetblack_serialization.json import serialize, deserialize
+from jetblack_serialization.testing import generate
+
+
+class Side(Enum):
+    BUY = auto()
+    SELL = auto()
+
+
+class Trade(TypedDict):
+    kind: Literal['trade']
+    price: Decimal
+    side: Side
+
+
+class Quote(TypedDict):
+    kind: Literal['quote']
+    bid: float
+    ask: float
+
+
+class Order(TypedDict):
+    order_id: int
+    created: datetime
+    settles: date
+    tenor: timedelta
+    note: Optional[str]
+    tags: dict[str, int]
+    events: list[Trade | Quote]
+    parent: NotRequired[Order]
+
+
+class Node(TypedDict):
+    name: Annotated[str, 'metadata']
+    children: list[Node]
+
+
+def _depth(node: Node) -> int:
+    return 1 + max((_depth(child) for child in node['children']), default=0)
+
+
+def test_generate_round_trip() -> None:
+    orders = generate(Order, 20, seed=1)
+    assert len(orders) == 20
+    for order in orders:
+        assert isinstance(order['order_id'], int)
+        assert isinstance(order['created'], datetime)
+        assert isinstance(order['tenor'], timedelta)
+        for event in order['events']:
+            assert event['kind'] in ('trade', 'quote')
+            if event['kind'] == 'trade':
+                assert isinstance(event['price'], Decimal)
+                assert isinstance(event['side'], Side)
+
+        text = serialize(order, Order)
+        assert serialize(deserialize(text, Order), Order) == text
+
+
+def test_generate_seed() -> None:
+    assert generate(Order, 5, seed=42) == generate(Order, 5, seed=42)
+    assert generate(Order, 5, seed=42) != generate(Order, 5, seed=43)
+
+
+def test_generate_sizes() -> None:
+    values = generate(
+        list[str],
+        10,
+        seed=0,
+        list_length=(3, 4),
+        string_length=7
+    )
+    for value in values:
+        assert 3 <= len(value) <= 4
+        assert all(len(item) == 7 for item in value)
+
+    tree, = generate(Node, seed=0, list_length=2, max_depth=6)
+    # Each level of the tree is a typed dict and a list.
+    assert _depth(tree) == 4
+
+
+def test_generate_optional() -> None:
+    values = generate(Optional[int], 100, seed=0, none_ratio=0.5)
+    assert None in values
+    assert any(isinstance(value, int) for value in values)
+    assert None not in generate(Optional[int], 100, seed=0, none_ratio=0)
+
+
+def test_generate_unsupported() -> None:
+    with pytest.raises(TypeError):
+        generate(set[int])
+
+
+def test_generate_bench_schema() -> None:
+    schema = Schema(
+        'orders',
+        lambda rng, size: generate(list[Order], seed=rng.getrandbits(32))[0],
+        list[Order],
+        10
+    )
+    cases = get_cases(['json'], ['*.typed.*'], schemas=[schema])
+    assert [case.name for case in cases] == [
+        'json.typed.orders.serialize',
+        'json.typed.orders.deserialize',
+    ]
+    for case in cases:
+        case.run()
+    assert schema.build(Random(0), 10) == schema.build(Random(0), 10)
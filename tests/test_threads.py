@@ -0,0 +1,134 @@
+"""Stress tests running serialization from many threads"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, UTC
+from decimal import Decimal
+import sys
+from threading import Barrier
+from typing import Literal, NotRequired, TypedDict
+
+from stringcase import camelcase, snakecase
+
+from jetblack_serialization import SerializerConfig
+from jetblack_serialization.json import (
+    serialize,
+    serialize_many,
+    serialize_untyped,
+    deserialize,
+    deserialize_untyped,
+)
+from jetblack_serialization.json.typed_serializer import get_serializer
+from jetblack_serialization.xml import (
+    serialize as serialize_xml,
+    deserialize as deserialize_xml,
+)
+
+THREADS = 16
+ITERATIONS = 50
+
+
+class Line(TypedDict):
+    amount: Decimal
+    side: Literal['buy', 'sell']
+
+
+class Order(TypedDict):
+    order_id: int
+    created: datetime
+    lines: list[Line]
+    parent: NotRequired[Order]
+
+
+ORDER: Order = {
+    'order_id': 1,
+    'created': datetime(2024, 1, 1, tzinfo=UTC),
+    'lines': [
+        {'amount': Decimal('1.5'), 'side': 'buy'},
+        {'amount': Decimal('2.5'), 'side': 'sell'},
+    ],
+    'parent': {
+        'order_id': 0,
+        'created': datetime(2023, 1, 1, tzinfo=UTC),
+        'lines': [],
+    },
+}
+
+
+def _run_concurrently(task, threads: int = THREADS) -> list:
+    # The barrier releases the threads together, so they race on first use,
+    # and a short switch interval makes the threads interleave more often.
+    barrier = Barrier(threads)
+
+    def run(_index: int):
+        barrier.wait()
+        return [task() for _ in range(ITERATIONS)]
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(threads) as executor:
+            return list(executor.map(run, range(threads)))
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+
+def test_concurrent_compilation() -> None:
+    # A new config starts with empty caches.
+    config = SerializerConfig(
+        key_serializer=camelcase,
+        key_deserializer=snakecase,
+        key_cache_size=4,
+    )
+
+    results = _run_concurrently(lambda: get_serializer(Order, config))
+    assert len({id(serializer) for run in results for serializer in run}) == 1
+
+
+def test_concurrent_roundtrip() -> None:
+    config = SerializerConfig(
+        key_serializer=camelcase,
+        key_deserializer=snakecase,
+        key_cache_size=2,
+    )
+    expected = serialize(ORDER, Order, config)
+
+    def roundtrip() -> bool:
+        text = serialize(ORDER, Order, config)
+        return text == expected and deserialize(text, Order, config) == ORDER
+
+    results = _run_concurrently(roundtrip)
+    assert all(all(run) for run in results)
+
+
+def test_concurrent_untyped() -> None:
+    config = SerializerConfig(key_serializer=camelcase)
+    obj = {'user_name': 'text', 'created_at': '2024-01-01', 'zone': 'UTC'}
+
+    def roundtrip() -> object:
+        return deserialize_untyped(serialize_untyped(obj, config), config)
+
+    results = _run_concurrently(roundtrip)
+    first = results[0][0]
+    assert all(result == first for run in results for result in run)
+
+
+def test_concurrent_xml() -> None:
+    annotation = list[int]
+    config = SerializerConfig()
+
+    def roundtrip() -> bool:
+        text = serialize_xml([1, 2, 3], annotation, config)
+        return deserialize_xml(text, annotation, config) == [1, 2, 3]
+
+    results = _run_concurrently(roundtrip)
+    assert all(all(run) for run in results)
+
+
+def test_serialize_many() -> None:
+    orders = [ORDER] * 250
+    with ThreadPoolExecutor(4) as executor:
+        texts = serialize_many(orders, Order, executor=executor, chunk_size=7)
+    assert texts == [serialize(ORDER, Order)] * 250
+    assert serialize_many(orders[:3], Order) == texts[:3]
@@ -0,0 +1,54 @@
+"""Tests for the XML codec"""
+
+from datetime import datetime, UTC
+from typing import Annotated, TypedDict
+
+from jetblack_serialization.xml import (
+    Codec,
+    XMLAttribute,
+    XMLEntity,
+    serialize_typed,
+    deserialize_typed,
+)
+from jetblack_serialization.xml.typed_serializer import get_serializer
+from jetblack_serialization.xml.typed_deserializer import get_deserializer
+
+from .config import CONFIG, Genre
+
+
+class Trade(TypedDict):
+    trade_id: Annotated[int, XMLAttribute("id")]
+    ticker: str
+    timestamp: datetime
+    genre: Genre
+
+
+TRADES = Annotated[
+    list[Annotated[Trade, XMLEntity("Trade")]],
+    XMLEntity("Trades")
+]
+
+
+def test_codec_roundtrip() -> None:
+    codec = Codec(TRADES, CONFIG)
+    trades: list[Trade] = [
+        {
+            'trade_id': i,
+            'ticker': 'AAPL',
+            'timestamp': datetime(2000, 1, 1, tzinfo=UTC),
+            'genre': Genre.HORROR,
+        }
+        for i in range(3)
+    ]
+    text = codec.encode(trades)
+    assert text == serialize_typed(trades, TRADES, CONFIG)
+    assert text.startswith(
+        '<Trades><Trade id="0"><Ticker>AAPL</Ticker>'
+    )
+    assert codec.decode(text) == trades
+    assert deserialize_typed(text, TRADES, CONFIG) == trades
+
+
+def test_cached() -> None:
+    assert get_serializer(TRADES, CONFIG) is get_serializer(TRADES, CONFIG)
+    assert get_deserializer(TRADES, CONFIG) is get_deserializer(TRADES, CONFIG)
@@ -1,6 +1,9 @@
 """Tests for serialization"""
 
+from __future__ import annotations
+
 from datetime import datetime, UTC
+from typing import TypedDict
 
 from typing_extensions import Annotated
 
@@ -87,3 +90,41 @@ def test_xml_deserialize_annotated_with_encoding() -> None:
         'pages': None,
         'genre': Genre.POLITICAL
     }
+
+
+class Category(TypedDict):
+    name: Annotated[str, XMLEntity('Name')]
+    children: Annotated[
+        list[Annotated[Category, XMLEntity('Category')]],
+        XMLEntity('Children')
+    ]
+
+
+def test_xml_deserialize_nested_lists() -> None:
+    """Only the children of a list are its items"""
+
+    text = """
+<Category>
+  <Name>root</Name>
+  <Children>
+    <Category>
+      <Name>branch</Name>
+      <Children>
+        <Category><Name>leaf</Name><Children/></Category>
+      </Children>
+    </Category>
+  </Children>
+</Category>
+"""
+    dct = deserialize(text, Annotated[Category, XMLEntity('Category')])
+    assert dct == {
+        'name': 'root',
+        'children': [
+            {
+                'name': 'branch',
+                'children': [
+                    {'name': 'leaf', 'children': []}
+                ]
+            }
+        ]
+    }
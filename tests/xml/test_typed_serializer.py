@@ -1,10 +1,18 @@
 """Test for the XML serializer"""
 
 from datetime import datetime
+from enum import IntEnum
+from typing import Literal, TypedDict
 
 from typing_extensions import Annotated
 
-from jetblack_serialization.xml import XMLEntity, serialize_typed
+from jetblack_serialization import SerializerConfig
+from jetblack_serialization.xml import (
+    XMLAttribute,
+    XMLEntity,
+    serialize_typed,
+    deserialize_typed,
+)
 
 from .config import CONFIG, Genre, Book
 
@@ -26,3 +34,23 @@ def test_xml_serialize_typed() -> None:
     }
     text = serialize_typed(book, Annotated[Book, XMLEntity("Book")], CONFIG)
     assert text == '<Book bookId="42"><Title>Little Red Book</Title><Author>Chairman Mao</Author><PublicationDate>1973-01-01T21:52:13.00Z</PublicationDate><Keywords><Keyword>Revolution</Keyword><Keyword>Communism</Keyword></Keywords><Phrase>Revolutionary wars are inevitable in class society</Phrase><Phrase>War is the continuation of politics</Phrase><Age>24</Age><pages/><Genre>POLITICAL</Genre></Book>'
+
+
+class Status(IntEnum):
+    OK = 200
+    NOT_FOUND = 404
+
+
+class Response(TypedDict):
+    status: Annotated[Status, XMLAttribute('status')]
+    final: Annotated[Literal[Status.OK], XMLEntity('Final')]
+
+
+def test_enum_by_value() -> None:
+    """Test enums with int values serialized by value"""
+    annotation = Annotated[Response, XMLEntity('Response')]
+    config = SerializerConfig(enum_by_value=True)
+    response: Response = {'status': Status.NOT_FOUND, 'final': Status.OK}
+    text = serialize_typed(response, annotation, config)
+    assert text == '<Response status="404"><Final>200</Final></Response>'
+    assert deserialize_typed(text, annotation, config) == response
@@ -0,0 +1,101 @@
+"""Tests for XML unions"""
+
+from typing import Annotated, Literal, TypedDict
+
+import pytest
+
+from jetblack_serialization import Discriminator
+from jetblack_serialization.xml import (
+    XMLEntity,
+    XMLAttribute,
+    serialize_typed,
+    deserialize_typed,
+)
+
+from .config import CONFIG
+
+
+class Order(TypedDict):
+    kind: Annotated[Literal['order'], XMLAttribute('kind')]
+    order_id: Annotated[int, XMLAttribute('id')]
+    quantity: int
+
+
+class Cancel(TypedDict):
+    kind: Annotated[Literal['cancel'], XMLAttribute('kind')]
+    order_id: Annotated[int, XMLAttribute('id')]
+
+
+class Amend(TypedDict):
+    kind: Annotated[Literal['amend'], XMLAttribute('kind')]
+    order_id: Annotated[int, XMLAttribute('id')]
+    quantity: int
+
+
+EVENTS = Annotated[
+    list[Annotated[Order | Cancel | Amend, XMLEntity('Event')]],
+    XMLEntity('Events')
+]
+
+MESSAGES = Annotated[
+    list[
+        Annotated[Order, XMLEntity('Order')] |
+        Annotated[Cancel, XMLEntity('Cancel')] |
+        Annotated[Amend, XMLEntity('Amend')]
+    ],
+    XMLEntity('Messages')
+]
+
+
+def test_attribute_discriminator() -> None:
+    events = [
+        {'kind': 'cancel', 'order_id': 1},
+        {'kind': 'amend', 'order_id': 2, 'quantity': 5},
+        {'kind': 'order', 'order_id': 3, 'quantity': 10},
+    ]
+    text = serialize_typed(events, EVENTS, CONFIG)
+    assert text == (
+        '<Events>'
+        '<Event kind="cancel" id="1"/>'
+        '<Event kind="amend" id="2"><Quantity>5</Quantity></Event>'
+        '<Event kind="order" id="3"><Quantity>10</Quantity></Event>'
+        '</Events>'
+    )
+    roundtrip = deserialize_typed(text, EVENTS, CONFIG)
+    assert roundtrip == events
+
+
+def test_tag_discriminator() -> None:
+    text = (
+        '<Messages>'
+        '<Amend kind="amend" id="2"><Quantity>5</Quantity></Amend>'
+        '<Cancel kind="cancel" id="1"/>'
+        '<Order kind="order" id="3"><Quantity>10</Quantity></Order>'
+        '</Messages>'
+    )
+    messages = deserialize_typed(text, MESSAGES, CONFIG)
+    assert messages == [
+        {'kind': 'amend', 'order_id': 2, 'quantity': 5},
+        {'kind': 'cancel', 'order_id': 1},
+        {'kind': 'order', 'order_id': 3, 'quantity': 10},
+    ]
+    assert serialize_typed(messages, MESSAGES, CONFIG) == text
+
+
+def test_explicit_discriminator() -> None:
+    annotation = Annotated[
+        Order | Cancel,
+        XMLEntity('Event'),
+        Discriminator('kind')
+    ]
+    text = serialize_typed({'kind': 'cancel', 'order_id': 1}, annotation, CONFIG)
+    assert text == '<Event kind="cancel" id="1"/>'
+    assert deserialize_typed(text, annotation, CONFIG) == {
+        'kind': 'cancel',
+        'order_id': 1
+    }
+
+    with pytest.raises(ValueError):
+        deserialize_typed('<Event kind="amend" id="1"/>', annotation, CONFIG)
+    with pytest.raises(ValueError):
+        serialize_typed({'kind': 'amend', 'order_id': 1}, annotation, CONFIG)
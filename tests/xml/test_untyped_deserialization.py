@@ -2,7 +2,11 @@
 
 from datetime import datetime, timedelta, UTC
 from decimal import Decimal
+from urllib.parse import ParseResult, urlparse
 
+import pytest
+
+from jetblack_serialization import SerializerConfig, VALUE_DESERIALIZERS
 from jetblack_serialization.xml import deserialize_untyped
 
 from .config import CONFIG
@@ -86,3 +90,18 @@ def test_untyped_xml_serialization_dict() -> None:
             'two': 2
         }
     }
+
+
+def test_untyped_xml_custom_value() -> None:
+    config = SerializerConfig(
+        value_deserializers=(
+            *VALUE_DESERIALIZERS,
+            (ParseResult, urlparse),
+        )
+    )
+    url_text = '<object type="ParseResult">https://example.com/path</object>'
+    url_obj = deserialize_untyped(url_text, config)
+    assert url_obj == urlparse('https://example.com/path')
+
+    with pytest.raises(TypeError):
+        deserialize_untyped(url_text, CONFIG)